@@ -1,39 +1,68 @@
 import requests
 import logging
 import time
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import metrics
+from http_cache import mount_cache
+from company_normalizer import get_company_index
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ApolloEnricher:
-    def __init__(self):
-        self.config = Config()
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
         self.api_key = self.config.APOLLO_API_KEY
-        self.base_url = "https://api.apollo.io/v1"
+        self.base_url = self.config.APOLLO_BASE_URL.rstrip("/")
+        self.company_index = get_company_index()
         self.session = requests.Session()
         self.session.headers.update({
             'Cache-Control': 'no-cache',
             'Content-Type': 'application/json',
             'X-Api-Key': self.api_key
         })
+        if self.config.HTTP_CACHE_APOLLO:
+            mount_cache(self.session, self.config)
         
+    def _get(self, endpoint: str, params: Dict) -> Dict:
+        """GET an Apollo endpoint, recording latency and outcome per endpoint"""
+        url = f"{self.base_url}/{endpoint}"
+        for attempt in range(self.config.APOLLO_MAX_RETRIES + 1):
+            status = "error"
+            try:
+                with metrics.timer("apollo_request", endpoint=endpoint):
+                    response = self.session.get(url, params=params)
+                status = str(response.status_code)
+                if response.status_code == 429 and attempt < self.config.APOLLO_MAX_RETRIES:
+                    delay = self._retry_delay(response, attempt)
+                    logger.warning(f"Apollo rate limit on {endpoint}, retrying in {delay:.1f}s")
+                    time.sleep(delay)
+                    continue
+                response.raise_for_status()
+                return response.json()
+            finally:
+                metrics.increment("apollo_requests", endpoint=endpoint, status=status)
+    
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait after a 429: Retry-After if given, else exponential backoff"""
+        retry_after = response.headers.get('Retry-After')
+        try:
+            return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            return float(2 ** attempt)
+    
     def search_company(self, company_name: str) -> Optional[Dict]:
         """Search for company information in Apollo"""
         try:
             # Try organization search first (more reliable)
-            url = f"{self.base_url}/organizations/search"
             params = {
                 'q_organization_name': company_name,
                 'page': 1,
                 'per_page': 1
             }
             
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get("organizations/search", params)
             companies = data.get('organizations', [])
             
             if companies:
@@ -50,17 +79,13 @@ class ApolloEnricher:
         """Alternative company search method"""
         try:
             # Try mixed companies search as alternative
-            url = f"{self.base_url}/mixed_companies/search"
             params = {
                 'q_organization_domains': company_name,
                 'page': 1,
                 'per_page': 1
             }
             
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get("mixed_companies/search", params)
             companies = data.get('organizations', [])
             
             return companies[0] if companies else None
@@ -76,7 +101,6 @@ class ApolloEnricher:
         try:
             # Search for contacts with HR-related titles
             for role in self.config.APOLLO_CONTACT_ROLES:
-                url = f"{self.base_url}/mixed_people/search"
                 params = {
                     'q_organization_ids': company_id,
                     'person_titles': role,
@@ -84,10 +108,7 @@ class ApolloEnricher:
                     'per_page': self.config.APOLLO_SEARCH_LIMIT
                 }
                 
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
+                data = self._get("mixed_people/search", params)
                 people = data.get('people', [])
                 
                 for person in people:
@@ -96,7 +117,7 @@ class ApolloEnricher:
                         contacts.append(contact_info)
                 
                 # Add delay to respect rate limits
-                time.sleep(0.5)
+                time.sleep(self.config.APOLLO_REQUEST_DELAY)
                 
         except Exception as e:
             logger.error(f"Error searching contacts for company '{company_name}': {str(e)}")
@@ -139,59 +160,92 @@ class ApolloEnricher:
         
         return None
     
-    def enrich_job_with_contacts(self, job: Dict) -> Dict:
-        """Enrich a job posting with HR contact information"""
+    def enrich_job_with_contacts(self, job: Dict, lookups: Optional[Dict] = None) -> Dict:
+        """Enrich a job posting with HR contact information; returns an enriched copy of the job
+        
+        lookups memoizes Apollo results by canonical company id across a
+        batch, so name variants of one company are looked up once.
+        """
         company_name = job.get('company', '')
         if not company_name:
             return job
         
-        logger.info(f"Enriching job at {company_name} with HR contacts")
+        lookups = {} if lookups is None else lookups
+        key = self.company_index.canonical_id(company_name)
+        if key not in lookups:
+            logger.info(f"Enriching job at {company_name} with HR contacts")
+            enrichment = self._lookup_company(company_name)
+            lookups[key] = enrichment
+            if enrichment:
+                # Later variants that now resolve to the organization reuse it
+                lookups[self.company_index.canonical_id(company_name)] = enrichment
+        enrichment = lookups[key]
+        if not enrichment:
+            return job
         
+        # Add enrichment data to job
+        company_info, contacts = enrichment
+        enriched_job = job.copy()
+        enriched_job['company_info'] = dict(company_info)
+        enriched_job['hr_contacts'] = list(contacts)
+        return enriched_job
+    
+    def _lookup_company(self, company_name: str) -> Optional[Tuple[Dict, List[Dict]]]:
+        """Apollo company info and HR contacts for a company name, or None"""
         # Search for company
         company_info = self.search_company(company_name)
         if not company_info:
             logger.warning(f"Company '{company_name}' not found in Apollo")
-            return job
+            return None
         
         company_id = company_info.get('id')
         if not company_id:
             logger.warning(f"No company ID found for '{company_name}'")
-            return job
+            return None
+        self.company_index.learn(company_name, company_id, company_info.get('name'))
         
         # Search for HR contacts
         contacts = self.search_contacts(company_id, company_name)
+        logger.info(f"Found {len(contacts)} HR contacts for {company_name}")
         
-        # Add enrichment data to job
-        enriched_job = job.copy()
-        enriched_job['company_info'] = {
+        return {
             'apollo_id': company_id,
             'website': company_info.get('website_url', ''),
             'industry': company_info.get('industry', ''),
             'employee_count': company_info.get('estimated_num_employees', ''),
             'description': company_info.get('short_description', '')
-        }
-        enriched_job['hr_contacts'] = contacts
-        
-        logger.info(f"Found {len(contacts)} HR contacts for {company_name}")
-        return enriched_job
+        }, contacts
     
-    def enrich_jobs_batch(self, jobs: List[Dict]) -> List[Dict]:
-        """Enrich multiple jobs with HR contact information"""
+    def enrich_jobs_batch(self, jobs: List[Dict], lookups: Optional[Dict] = None) -> List[Dict]:
+        """Enrich multiple jobs with HR contact information, looking up each company once
+        
+        Pass the same lookups dict to several batches to share lookups between them.
+        """
         enriched_jobs = []
+        lookups = {} if lookups is None else lookups
+        companies_looked_up = 0
         
         for i, job in enumerate(jobs):
             try:
-                enriched_job = self.enrich_job_with_contacts(job)
+                known = len(lookups)
+                enriched_job = self.enrich_job_with_contacts(job, lookups)
                 enriched_jobs.append(enriched_job)
                 
                 # Add delay between requests to respect rate limits
-                if i < len(jobs) - 1:
-                    time.sleep(1)
+                if len(lookups) > known:
+                    companies_looked_up += 1
+                    if i < len(jobs) - 1:
+                        time.sleep(self.config.APOLLO_JOB_DELAY)
                     
             except Exception as e:
                 logger.error(f"Failed to enrich job {i+1}: {str(e)}")
                 enriched_jobs.append(job)  # Add original job if enrichment fails
         
+        logger.info(f"Looked up {companies_looked_up} companies for {len(jobs)} jobs")
+        try:
+            self.company_index.save()
+        except OSError as e:
+            logger.warning(f"Failed to save company index: {str(e)}")
         return enriched_jobs
     
     def get_company_contacts_summary(self, enriched_jobs: List[Dict]) -> Dict:
@@ -200,7 +254,7 @@ class ApolloEnricher:
             'total_jobs': len(enriched_jobs),
             'jobs_with_contacts': 0,
             'total_contacts': 0,
-            'companies_with_contacts': set(),
+            'companies_with_contacts': {},
             'contact_details': []
         }
         
@@ -209,7 +263,10 @@ class ApolloEnricher:
             if contacts:
                 summary['jobs_with_contacts'] += 1
                 summary['total_contacts'] += len(contacts)
-                summary['companies_with_contacts'].add(job.get('company', ''))
+                # One entry per canonical company, however its name was written
+                summary['companies_with_contacts'].setdefault(
+                    self.company_index.canonical_id(job.get('company', '')), job.get('company', '')
+                )
                 
                 for contact in contacts:
                     summary['contact_details'].append({
@@ -222,7 +279,7 @@ class ApolloEnricher:
                         'linkedin': contact.get('linkedin_url', '')
                     })
         
-        summary['companies_with_contacts'] = list(summary['companies_with_contacts'])
+        summary['companies_with_contacts'] = list(summary['companies_with_contacts'].values())
         return summary
 
 if __name__ == "__main__":
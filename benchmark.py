@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the job processing pipeline, scraper parsers, full runs and startup time
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+from synthetic_jobs import SyntheticJobGenerator
+
+# Keep per-job INFO logs from dominating timings
+logging.disable(logging.INFO)
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+CUSTOM_FILTER_CONFIG = {
+    'salary_range': (300000, 800000),
+    'company_sizes': ['100-500', '500-1000', '1000+'],
+    'required_skills': ['Python', 'Java', 'SQL'],
+    'education_levels': ['B.Tech', 'B.E', 'MCA'],
+    'work_modes': ['hybrid', 'remote'],
+    'company_types': ['Product', 'Startup']
+}
+
+CRITERIA = {
+    'min_relevance_score': 3,
+    'only_with_contacts': True,
+    'job_titles': ['developer', 'engineer'],
+    'date_from': '2024-01-01'
+}
+
+def measure(func: Callable[[], object], repeat: int = 1) -> Dict:
+    """Best wall time over `repeat` runs, then one traced run for peak memory"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'seconds': min(timings),
+        'peak_mb': peak / (1024 * 1024),
+        'output_size': len(result) if hasattr(result, '__len__') else None
+    }
+
+# Multi-city target for the location_mask case
+LOCATIONS = "Bangalore, Mumbai, Delhi NCR, Remote"
+
+def processing_cases(jobs: List[Dict], report_dir: str, report_max: int) -> Dict[str, Callable[[], object]]:
+    """Benchmarked calls over one corpus"""
+    from data_processor import JobDataProcessor
+    from custom_filters import apply_custom_filters
+    from near_duplicates import NearDuplicateDetector
+    from salary_parser import SalaryParser, SalaryIndex
+    from location_matcher import LocationMatcher
+    from report_generator import ReportGenerator
+    import pandas as pd
+
+    processor = JobDataProcessor()
+    detector = NearDuplicateDetector()
+    # Scraped-style jobs need scores before criteria filtering means anything
+    scored_jobs = [dict(job, relevance_score=index % 10) for index, job in enumerate(jobs)]
+    salaried_jobs = [dict(job) for job in jobs]
+    SalaryParser().annotate(salaried_jobs)
+    salary_index = SalaryIndex(salaried_jobs)
+    locations = pd.Series([job.get('location') for job in jobs], dtype=object)
+
+    cases = {
+        'process_jobs': lambda: processor.process_jobs(jobs),
+        'process_jobs_full_rank': lambda: processor.process_jobs(jobs, top_k=0),
+        'process_jobs_python': lambda: processor.process_jobs(jobs, engine="python"),
+        'process_jobs_pandas': lambda: processor.process_jobs(jobs, engine="pandas"),
+        'merge_duplicates': lambda: detector.merge(jobs),
+        'filter_by_criteria': lambda: processor.filter_by_criteria(scored_jobs, CRITERIA),
+        'apply_custom_filters': lambda: apply_custom_filters(jobs, CUSTOM_FILTER_CONFIG),
+        'parse_salaries': lambda: SalaryParser().parse_columns(
+            [job.get('salary') for job in jobs], [job.get('description') for job in jobs]
+        ),
+        'salary_index_build': lambda: SalaryIndex(salaried_jobs),
+        'salary_range_query': lambda: salary_index.between(*CUSTOM_FILTER_CONFIG['salary_range']),
+        # A fresh matcher each call, so the per-location memo starts cold
+        'location_mask': lambda: (lambda matcher: matcher.mask(locations, matcher.targets(LOCATIONS)))(LocationMatcher())
+    }
+
+    if len(jobs) <= report_max:
+        generator = ReportGenerator()
+        generator.output_dir = report_dir
+        generator.config.COLUMNAR_DIR = os.path.join(report_dir, "columnar")
+        summary = {'total_jobs': len(jobs)}
+        cases['report_json'] = lambda: generator._generate_json_report(scored_jobs, summary, "bench")
+        cases['report_excel'] = lambda: generator._generate_excel_report(scored_jobs, summary, "bench")
+        cases['report_html'] = lambda: generator._generate_html_report(scored_jobs, summary, "bench")
+        cases['report_columnar'] = lambda: generator._generate_columnar_export(scored_jobs, "bench")
+
+    return cases
+
+def run_processing_suite(args: argparse.Namespace) -> List[Dict]:
+    """Time and peak memory of processing, filtering and reporting per corpus size"""
+    results = []
+    for size in args.sizes:
+        jobs = SyntheticJobGenerator(seed=args.seed).generate_list(size)
+        with tempfile.TemporaryDirectory() as report_dir:
+            for name, func in processing_cases(jobs, report_dir, args.report_max).items():
+                result = measure(func, args.repeat)
+                result.update({'suite': 'processing', 'case': name, 'size': size})
+                results.append(result)
+                print_result(result)
+    return results
+
+PARSER_BACKENDS = ['html.parser', 'lxml', 'html5lib']
+
+def available_parser_backends() -> List[str]:
+    """BeautifulSoup backends installed here"""
+    from bs4 import BeautifulSoup, FeatureNotFound
+    backends = []
+    for backend in PARSER_BACKENDS:
+        try:
+            BeautifulSoup("<p></p>", backend)
+            backends.append(backend)
+        except FeatureNotFound:
+            pass
+    return backends
+
+def parser_cases() -> Dict[str, tuple]:
+    """(scraper, site, page kind, parse call) per benchmarked parser"""
+    from indeed_scraper import IndeedScraper
+    from glassdoor_scraper_fixed import GlassdoorScraperFixed
+    from linkedin_scraper import LinkedInJobScraper
+
+    indeed = IndeedScraper()
+    glassdoor = GlassdoorScraperFixed()
+    linkedin = LinkedInJobScraper()
+    return {
+        'indeed_search': (indeed, 'indeed', 'search', lambda html: indeed._parse_jobs_from_html(html, 'bench')),
+        'indeed_detail': (indeed, 'indeed', 'detail', lambda html: [indeed._parse_job_description_from_html(html)]),
+        'glassdoor_search': (glassdoor, 'glassdoor', 'search', lambda html: glassdoor._parse_jobs_from_html(html, 'bench')),
+        'glassdoor_detail': (glassdoor, 'glassdoor', 'detail', lambda html: [glassdoor._parse_job_description_from_html(html)]),
+        'linkedin_search': (linkedin, 'linkedin', 'search', lambda html: linkedin._parse_jobs_from_html(html, 'bench')),
+        'linkedin_detail': (linkedin, 'linkedin', 'detail', lambda html: [linkedin._parse_job_description_from_html(html)])
+    }
+
+def run_parser_suite(args: argparse.Namespace) -> List[Dict]:
+    """Pages/second, jobs/second and peak allocation of every parser per backend"""
+    from html_fixtures import load_fixture_pages
+
+    results = []
+    for backend in available_parser_backends():
+        for name, (scraper, site, kind, parse) in parser_cases().items():
+            pages = load_fixture_pages(site, kind)
+            if not pages:
+                continue
+            scraper.config.HTML_PARSER = backend
+
+            def parse_all():
+                parsed = []
+                for html in pages:
+                    parsed.extend(parse(html))
+                return parsed
+
+            result = measure(parse_all, args.repeat)
+            seconds = result['seconds'] or float('inf')
+            result.update({
+                'suite': 'parsers',
+                'case': name,
+                'backend': backend,
+                'pages': len(pages),
+                'jobs': result['output_size'],
+                'pages_per_second': len(pages) / seconds,
+                'jobs_per_second': result['output_size'] / seconds,
+                'peak_mb_per_page': result['peak_mb'] / len(pages)
+            })
+            results.append(result)
+            print(f"{'parsers':<12} {name:<20} {backend:<12} {len(pages)} pages {result['jobs']:>4} items "
+                  f"{result['pages_per_second']:>9.1f} pages/s {result['jobs_per_second']:>10.1f} jobs/s "
+                  f"{result['peak_mb']:>7.2f} MB peak")
+    return results
+
+@contextmanager
+def config_overrides(**values):
+    """Temporarily set Config attributes for every component built inside the block"""
+    from config import Config
+    previous = {name: getattr(Config, name) for name in values}
+    for name, value in values.items():
+        setattr(Config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in previous.items():
+            setattr(Config, name, value)
+
+def run_e2e_suite(args: argparse.Namespace) -> List[Dict]:
+    """Full JobSearchAgent runs, scrape to report, against the local mock job board and Apollo API"""
+    from config import Config
+    from mock_job_board import MockJobBoardServer
+    from mock_apollo_server import MockApolloServer
+
+    board = MockJobBoardServer(port=0, latency_ms=args.latency_ms, pages=args.e2e_pages, seed=args.seed).start()
+    apollo = MockApolloServer(port=0, latency_ms=args.latency_ms, seed=args.seed).start()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as output_dir, config_overrides(
+            JOB_SOURCES=["indeed", "glassdoor_http"],
+            JOB_KEYWORDS=Config.JOB_KEYWORDS[:args.e2e_keywords],
+            INDEED_BASE_URL=board.base_url,
+            GLASSDOOR_BASE_URL=board.base_url,
+            APOLLO_BASE_URL=apollo.base_url,
+            MAX_PAGES_PER_SEARCH=args.e2e_pages,
+            SCRAPE_DELAY_SCALE=0,
+            APOLLO_REQUEST_DELAY=0,
+            APOLLO_JOB_DELAY=0,
+            # Checkpoints, metrics, indexes and caches all resolve under it
+            OUTPUT_DIR=output_dir
+        ):
+            from job_search_agent import JobSearchAgent
+            agent = JobSearchAgent()
+            runs = iter(range(args.repeat + 1))
+            recorders = []
+
+            def run():
+                import metrics
+                agent.run_job_search(run_id=f"bench_{next(runs)}")
+                recorders.append(metrics.get_recorder())
+                return []
+
+            result = measure(run, args.repeat)
+            agent.close()
+
+        stages = {s['labels']['stage']: s['total'] for s in recorders[0].snapshot()['timers'] if s['name'] == 'stage'}
+        result.update({
+            'suite': 'e2e',
+            'case': 'run_job_search',
+            'keywords': args.e2e_keywords,
+            'pages': args.e2e_pages,
+            'latency_ms': args.latency_ms,
+            'stage_seconds': stages,
+            'board_requests': board.stats['requests'],
+            'apollo_requests': apollo.stats['requests']
+        })
+        results.append(result)
+        print(f"{'e2e':<12} {'run_job_search':<24} {args.e2e_keywords} keywords x {args.e2e_pages} pages "
+              f"{result['seconds']:>9.4f}s {result['peak_mb']:>9.1f} MB peak")
+        for stage, seconds in stages.items():
+            print(f"{'':<12} {'stage ' + stage:<24} {seconds:>9.4f}s")
+    finally:
+        board.stop()
+        apollo.stop()
+    return results
+
+# Entry points whose import time is tracked; none should execute a heavy dependency
+STARTUP_MODULES = ['job_search_agent', 'job_index', 'search_profiles', 'cron_scheduler']
+
+def import_time(module: str) -> Dict:
+    """Import of a module in a fresh interpreter: wall time, -X importtime cumulative time and heavy modules executed"""
+    code = f"import {module}; from lazy_imports import loaded_modules; print(','.join(loaded_modules()))"
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True,
+                               check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    seconds = time.perf_counter() - start
+    # stderr lines read "import time: self [us] | cumulative | imported package"
+    import_us = 0
+    for line in completed.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            import_us = int(fields[1])
+    heavy = completed.stdout.strip()
+    return {'seconds': seconds, 'import_seconds': import_us / 1e6, 'heavy_modules': heavy.split(",") if heavy else []}
+
+def run_startup_suite(args: argparse.Namespace) -> List[Dict]:
+    """Import time of the CLI entry points, best of --repeat fresh interpreters, against --import-budget-ms"""
+    results = []
+    for module in STARTUP_MODULES:
+        runs = [import_time(module) for _ in range(args.repeat)]
+        result = min(runs, key=lambda run: run['import_seconds'])
+        result.update({
+            'suite': 'startup',
+            'case': module,
+            'over_budget': result['import_seconds'] * 1000 > args.import_budget_ms or bool(result['heavy_modules'])
+        })
+        results.append(result)
+        flag = "  OVER BUDGET" if result['over_budget'] else ""
+        print(f"{'startup':<12} {module:<24} {result['import_seconds'] * 1000:>9.1f} ms import "
+              f"{result['seconds'] * 1000:>9.1f} ms process  heavy: {', '.join(result['heavy_modules']) or 'none'}{flag}")
+    return results
+
+SUITES = {
+    'processing': run_processing_suite,
+    'parsers': run_parser_suite,
+    'e2e': run_e2e_suite,
+    'startup': run_startup_suite
+}
+
+def print_result(result: Dict):
+    """One aligned line per benchmark case"""
+    throughput = result['size'] / result['seconds'] if result['seconds'] else float('inf')
+    print(f"{result['suite']:<12} {result['case']:<24} n={result['size']:<9} "
+          f"{result['seconds']:>9.4f}s {throughput:>12.0f}/s {result['peak_mb']:>9.1f} MB peak")
+
+def main():
+    """Run the selected benchmark suites"""
+    parser = argparse.ArgumentParser(description="Job Search Agent benchmarks")
+    parser.add_argument("--suite", choices=sorted(SUITES), action="append",
+                        help="Suite to run (repeatable, default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Synthetic corpus sizes, e.g. 1000 10000 1000000")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per case (best is reported)")
+    parser.add_argument("--report-max", type=int, default=10000,
+                        help="Largest corpus the report formats are benchmarked on")
+    parser.add_argument("--e2e-keywords", type=int, default=3, help="Search keywords per end-to-end run")
+    parser.add_argument("--e2e-pages", type=int, default=3, help="Result pages per keyword in end-to-end runs")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Mock server latency per request in end-to-end runs")
+    parser.add_argument("--import-budget-ms", type=float, default=150,
+                        help="Startup suite fails if an entry point takes longer to import (or imports a heavy dependency)")
+    parser.add_argument("--output", help="Also write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = []
+    for suite in args.suite or sorted(SUITES):
+        results.extend(SUITES[suite](args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({'python': sys.version, 'seed': args.seed, 'results': results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if any(result.get('over_budget') for result in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import os
+import json
+import shutil
+import logging
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
+from config import Config, output_path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class IncompleteResult(list):
+    """Stage output the run carries on with but never checkpoints (a failed job board search), so resuming retries it"""
+
+class CheckpointStore:
+    """Persists each pipeline stage's output under <CHECKPOINT_DIR>/<run_id>/"""
+
+    def __init__(self, run_id: str, config: Optional[Config] = None):
+        self.config = config or Config()
+        self.run_id = run_id
+        self.run_dir = os.path.join(output_path(self.config, 'CHECKPOINT_DIR'), run_id)
+        self.state_path = os.path.join(self.run_dir, "state.json")
+        # Job boards whose search failed this run; stages built on their
+        # partial results are not checkpointed either
+        self.failed_sources: List[str] = []
+
+    def exists(self) -> bool:
+        """Whether any checkpoint was written for this run"""
+        return os.path.exists(self.state_path)
+
+    def _read_state(self) -> dict:
+        """Load the run manifest"""
+        if not self.exists():
+            return {'run_id': self.run_id, 'completed_stages': [], 'status': 'running'}
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_json(self, path: str, data: Any):
+        """Write JSON atomically so a crash never leaves a half-written checkpoint"""
+        os.makedirs(self.run_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, path)
+
+    def completed_stages(self) -> List[str]:
+        """Stages whose output has been persisted, in completion order"""
+        return self._read_state()['completed_stages']
+
+    def has(self, stage: str) -> bool:
+        """Whether a stage already completed in this run"""
+        return stage in self.completed_stages()
+
+    def save(self, stage: str, data: Any):
+        """Persist a stage's output and mark it completed"""
+        self._write_json(os.path.join(self.run_dir, f"{stage}.json"), data)
+
+        state = self._read_state()
+        if stage not in state['completed_stages']:
+            state['completed_stages'].append(stage)
+        state['updated_at'] = datetime.now().isoformat()
+        self._write_json(self.state_path, state)
+
+    def load(self, stage: str) -> Any:
+        """Load a completed stage's output"""
+        with open(os.path.join(self.run_dir, f"{stage}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def mark_status(self, status: str, error: Optional[str] = None):
+        """Record whether the run completed or failed"""
+        state = self._read_state()
+        state['status'] = status
+        state['error'] = error
+        state['updated_at'] = datetime.now().isoformat()
+        self._write_json(self.state_path, state)
+
+    def prune(self):
+        """Delete checkpoint directories older than CHECKPOINT_RETENTION_DAYS"""
+        base_dir = output_path(self.config, 'CHECKPOINT_DIR')
+        if not os.path.isdir(base_dir):
+            return
+
+        cutoff = datetime.now() - timedelta(days=self.config.CHECKPOINT_RETENTION_DAYS)
+        for name in os.listdir(base_dir):
+            path = os.path.join(base_dir, name)
+            if name != self.run_id and os.path.isdir(path) and datetime.fromtimestamp(os.path.getmtime(path)) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+                logger.info(f"Removed old checkpoint: {name}")
@@ -0,0 +1,202 @@
+import os
+import logging
+from datetime import datetime
+from typing import List, Dict, Optional
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+from config import Config, output_path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Partition columns shared by both tables (hive-style: run_date=YYYY-MM-DD/source=X)
+PARTITION_SCHEMA = pa.schema([
+    ('run_date', pa.string()),
+    ('source', pa.string())
+])
+
+JOBS_SCHEMA = pa.schema([
+    ('run_id', pa.string()),
+    ('run_date', pa.string()),
+    ('source', pa.string()),
+    ('title', pa.string()),
+    ('company', pa.string()),
+    ('location', pa.string()),
+    ('salary', pa.string()),
+    ('salary_min', pa.float64()),
+    ('salary_max', pa.float64()),
+    ('salary_currency', pa.string()),
+    ('salary_period', pa.string()),
+    ('url', pa.string()),
+    ('posted_date', pa.string()),
+    ('description', pa.string()),
+    ('experience_level', pa.string()),
+    ('search_keyword', pa.string()),
+    ('job_id', pa.string()),
+    ('relevance_score', pa.int64()),
+    ('hr_contacts_count', pa.int64()),
+    ('company_apollo_id', pa.string()),
+    ('company_website', pa.string()),
+    ('company_industry', pa.string()),
+    ('company_employee_count', pa.string()),
+    ('company_description', pa.string())
+])
+
+CONTACTS_SCHEMA = pa.schema([
+    ('run_id', pa.string()),
+    ('run_date', pa.string()),
+    ('source', pa.string()),
+    ('company', pa.string()),
+    ('job_title', pa.string()),
+    ('job_url', pa.string()),
+    ('contact_name', pa.string()),
+    ('contact_title', pa.string()),
+    ('email', pa.string()),
+    ('phone', pa.string()),
+    ('linkedin_url', pa.string()),
+    ('contact_type', pa.string())
+])
+
+FILE_EXTENSIONS = {
+    'parquet': 'parquet',
+    'arrow': 'arrow'
+}
+
+class ColumnarExporter:
+    def __init__(self, config: Optional[Config] = None, base_dir: Optional[str] = None):
+        self.config = config or Config()
+        self.base_dir = base_dir or output_path(self.config, 'COLUMNAR_DIR')
+        self.format = self.config.COLUMNAR_FORMAT.lower()
+        if self.format not in FILE_EXTENSIONS:
+            raise ValueError(f"Unsupported columnar format: {self.config.COLUMNAR_FORMAT}")
+
+    def export(self, jobs: List[Dict], run_id: str, run_date: Optional[str] = None) -> Dict[str, str]:
+        """Export the job and contact tables, partitioned by run date and source"""
+        if run_date is None:
+            run_date = datetime.now().strftime('%Y-%m-%d')
+
+        jobs_table = self._build_jobs_table(jobs, run_id, run_date)
+        contacts_table = self._build_contacts_table(jobs, run_id, run_date)
+
+        jobs_dir = os.path.join(self.base_dir, 'jobs')
+        contacts_dir = os.path.join(self.base_dir, 'contacts')
+
+        self._write_table(jobs_table, jobs_dir, run_id)
+        self._write_table(contacts_table, contacts_dir, run_id)
+
+        logger.info(f"Exported {jobs_table.num_rows} jobs and {contacts_table.num_rows} contacts to {self.base_dir}")
+        return {'jobs': jobs_dir, 'contacts': contacts_dir}
+
+    def _build_jobs_table(self, jobs: List[Dict], run_id: str, run_date: str) -> pa.Table:
+        """Flatten jobs into a table matching JOBS_SCHEMA"""
+        columns = {field.name: [] for field in JOBS_SCHEMA}
+
+        for job in jobs:
+            company_info = job.get('company_info') or {}
+            columns['run_id'].append(run_id)
+            columns['run_date'].append(run_date)
+            columns['source'].append(job.get('source') or 'Unknown')
+            for field in ['title', 'company', 'location', 'salary', 'url', 'posted_date',
+                          'description', 'experience_level', 'search_keyword', 'job_id']:
+                columns[field].append(self._to_str(job.get(field)))
+            # Parsed per-annum salary range (see salary_parser.py); null when none was found
+            for field in ['salary_min', 'salary_max']:
+                columns[field].append(job.get(field))
+            for field in ['salary_currency', 'salary_period']:
+                columns[field].append(self._to_str(job.get(field)))
+            columns['relevance_score'].append(int(job.get('relevance_score', 0) or 0))
+            columns['hr_contacts_count'].append(len(job.get('hr_contacts') or []))
+            columns['company_apollo_id'].append(self._to_str(company_info.get('apollo_id')))
+            columns['company_website'].append(self._to_str(company_info.get('website')))
+            columns['company_industry'].append(self._to_str(company_info.get('industry')))
+            columns['company_employee_count'].append(self._to_str(company_info.get('employee_count')))
+            columns['company_description'].append(self._to_str(company_info.get('description')))
+
+        return pa.table(columns, schema=JOBS_SCHEMA)
+
+    def _build_contacts_table(self, jobs: List[Dict], run_id: str, run_date: str) -> pa.Table:
+        """Flatten HR contacts into one row per (job, contact)"""
+        columns = {field.name: [] for field in CONTACTS_SCHEMA}
+
+        for job in jobs:
+            for contact in job.get('hr_contacts') or []:
+                columns['run_id'].append(run_id)
+                columns['run_date'].append(run_date)
+                columns['source'].append(job.get('source') or 'Unknown')
+                columns['company'].append(self._to_str(job.get('company')))
+                columns['job_title'].append(self._to_str(job.get('title')))
+                columns['job_url'].append(self._to_str(job.get('url')))
+                columns['contact_name'].append(self._to_str(contact.get('name')))
+                columns['contact_title'].append(self._to_str(contact.get('title')))
+                columns['email'].append(self._to_str(contact.get('email')))
+                columns['phone'].append(self._to_str(contact.get('phone')))
+                columns['linkedin_url'].append(self._to_str(contact.get('linkedin_url')))
+                columns['contact_type'].append(self._to_str(contact.get('contact_type')))
+
+        return pa.table(columns, schema=CONTACTS_SCHEMA)
+
+    def _write_table(self, table: pa.Table, base_dir: str, run_id: str):
+        """Write a table as a hive-partitioned dataset"""
+        if table.num_rows == 0:
+            return
+
+        extension = FILE_EXTENSIONS[self.format]
+        ds.write_dataset(
+            table,
+            base_dir,
+            format='parquet' if self.format == 'parquet' else 'ipc',
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+            basename_template=f"part-{run_id}-{{i}}.{extension}",
+            existing_data_behavior='overwrite_or_ignore'
+        )
+
+    def _to_str(self, value) -> Optional[str]:
+        """Coerce a scalar to a string column value"""
+        if value is None or value == '':
+            return None
+        return str(value)
+
+    def open_dataset(self, table_name: str = 'jobs') -> ds.Dataset:
+        """Open the exported history of a table as a lazily-scanned dataset"""
+        schema = JOBS_SCHEMA if table_name == 'jobs' else CONTACTS_SCHEMA
+        # Memory-map local files so Arrow IPC partitions are read without copying
+        filesystem = pafs.LocalFileSystem(use_mmap=True)
+        return ds.dataset(
+            os.path.join(self.base_dir, table_name),
+            schema=schema,
+            format='parquet' if self.format == 'parquet' else 'ipc',
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+            filesystem=filesystem
+        )
+
+    def load_history(self, table_name: str = 'jobs', date_from: Optional[str] = None,
+                     date_to: Optional[str] = None, sources: Optional[List[str]] = None,
+                     columns: Optional[List[str]] = None) -> pa.Table:
+        """Load exported rows, pruning partitions by run date and source"""
+        dataset = self.open_dataset(table_name)
+
+        expression = None
+        if date_from:
+            expression = self._and(expression, ds.field('run_date') >= date_from)
+        if date_to:
+            expression = self._and(expression, ds.field('run_date') <= date_to)
+        if sources:
+            expression = self._and(expression, ds.field('source').isin(sources))
+
+        return dataset.to_table(columns=columns, filter=expression)
+
+    def _and(self, left, right):
+        """Combine two filter expressions"""
+        return right if left is None else left & right
+
+if __name__ == "__main__":
+    # Show what has been exported so far
+    exporter = ColumnarExporter()
+
+    if os.path.exists(os.path.join(exporter.base_dir, 'jobs')):
+        history = exporter.load_history(columns=['run_date', 'source', 'title', 'company'])
+        print(f"Exported jobs: {history.num_rows}")
+        print(history.group_by(['run_date', 'source']).aggregate([('title', 'count')]).to_pandas())
+    else:
+        print(f"No columnar exports found in {exporter.base_dir}")
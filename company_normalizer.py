@@ -0,0 +1,137 @@
+import os
+import re
+import json
+import logging
+import threading
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional
+from config import Config, output_path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Legal-form words dropped from the end of a name ("Infosys Pvt. Ltd." -> "infosys")
+LEGAL_SUFFIXES = {
+    'ltd', 'limited', 'pvt', 'private', 'llp', 'llc', 'inc', 'incorporated',
+    'corp', 'corporation', 'co', 'company', 'plc', 'gmbh', 'ag', 'sa', 'bv', 'pte', 'pty'
+}
+PUNCTUATION_PATTERN = re.compile(r"[^\w\s]")
+# Web domain endings dropped from a word ("Amazon.com" -> "amazon", "Naukri.co.in" -> "naukri")
+DOMAIN_SUFFIX_PATTERN = re.compile(r"\.(?:com|co|net|org|in|io|ai)(?:\.[a-z]{2})?(?!\w|\.\w)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+@lru_cache(maxsize=65536)
+def normalize_company_name(name: Optional[str]) -> str:
+    """Lowercase name without accents, web domain endings, punctuation, extra whitespace or trailing legal suffixes"""
+    if not isinstance(name, str):
+        return ''
+    text = unicodedata.normalize('NFKD', name)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = DOMAIN_SUFFIX_PATTERN.sub('', text)
+    # "S.A." and "BYJU'S" lose their punctuation without splitting into words
+    text = text.replace('&', ' and ').replace("'", '').replace('.', '')
+    text = WHITESPACE_PATTERN.sub(' ', PUNCTUATION_PATTERN.sub(' ', text)).strip()
+    words = text.split(' ')
+    # A name made only of suffix words keeps its first one ("Co" stays "co")
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+def names_agree(name: Optional[str], other: Optional[str]) -> bool:
+    """Whether two company names normalize to the same words, or one's words contain the other's"""
+    first, second = normalize_company_name(name), normalize_company_name(other)
+    if not first or not second:
+        return False
+    return f" {first} " in f" {second} " or f" {second} " in f" {first} "
+
+class CompanyIndex:
+    """Persistent map from normalized company names to a canonical company id
+
+    A name's canonical id is its normalized form until Apollo resolves it to
+    an organization whose name agrees with it; from then on every such alias
+    maps to "apollo:<org id>", across runs.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.config = Config()
+        self.path = path if path is not None else output_path(self.config, 'COMPANY_INDEX_FILE')
+        self.aliases: Dict[str, str] = {}
+        self.names: Dict[str, str] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Read the index file, if there is one"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.aliases = data.get('aliases', {})
+            self.names = data.get('names', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable company index {self.path}: {str(e)}")
+
+    def canonical_id(self, name: Optional[str]) -> str:
+        """Canonical id for a company name as scraped"""
+        key = normalize_company_name(name)
+        return self.aliases.get(key, key)
+
+    def display_name(self, canonical_id: str, default: str = '') -> str:
+        """Name to show for a canonical id (Apollo's name once learned)"""
+        return self.names.get(canonical_id, default)
+
+    def learn(self, name: str, apollo_id: str, apollo_name: Optional[str] = None) -> str:
+        """Record that Apollo resolved a scraped name to an organization; returns its canonical id
+
+        Apollo's search is fuzzy, so the scraped name only becomes an alias
+        when it and Apollo's name agree (one normalized name contains the
+        other as whole words); otherwise the scraped name keeps its own key.
+        """
+        canonical_id = f"apollo:{apollo_id}"
+        aliases = [apollo_name]
+        if apollo_name is None or names_agree(name, apollo_name):
+            aliases.append(name)
+        else:
+            logger.info(f"Not aliasing '{name}' to Apollo organization '{apollo_name}'")
+        with self._lock:
+            for alias in aliases:
+                key = normalize_company_name(alias)
+                if key and self.aliases.get(key) != canonical_id:
+                    self.aliases[key] = canonical_id
+                    self._dirty = True
+            if apollo_name and self.names.get(canonical_id) != apollo_name:
+                self.names[canonical_id] = apollo_name
+                self._dirty = True
+        return self.canonical_id(name)
+
+    def save(self):
+        """Write the index if anything was learned since it was loaded"""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'aliases': self.aliases, 'names': self.names}, f, ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+# Index shared by the scrapers, the agent, the enricher and the reports
+_default_index: Optional[CompanyIndex] = None
+
+def get_company_index() -> CompanyIndex:
+    """The shared company index, loaded on first use and again if COMPANY_INDEX_FILE changes"""
+    global _default_index
+    path = output_path(Config, 'COMPANY_INDEX_FILE')
+    if _default_index is None or _default_index.path != path:
+        _default_index = CompanyIndex(path)
+    return _default_index
+
+def company_key(name: Optional[str]) -> str:
+    """Canonical company id from the shared index, for dedupe and grouping"""
+    return get_company_index().canonical_id(name)
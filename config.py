@@ -1,11 +1,13 @@
 import os
+import importlib.util
 from dotenv import load_dotenv
 
 load_dotenv()
 
 class Config:
     # Job Search Filters
-    LOCATION = "Bangalore"
+    LOCATION = "Bangalore"  # One city, or several as "Bangalore, Mumbai, Delhi"
+    LOCATIONS = []  # Wanted cities as a list; overrides LOCATION when set
     EXPERIENCE_LEVEL = "fresher"  # fresher, entry-level, 0-1 years
     JOB_TYPE = "full-time"  # full-time, part-time, contract, internship
     
@@ -47,12 +49,130 @@ class Config:
     # Schedule Configuration
     SEARCH_FREQUENCY = "daily"  # daily, weekly
     SEARCH_TIME = "09:00"  # Time to run the search
+    # Cron schedules per search profile ("minute hour day month weekday"),
+    # e.g. {"default": ["0 9 * * 1-5"], "Data Analyst": ["30 18 * * 5"]}.
+    # "default" searches with these settings; other names are search profiles
+    # (a preset name or a filters_*.json file). Empty falls back to
+    # SEARCH_FREQUENCY and SEARCH_TIME.
+    SEARCH_SCHEDULES = {}
     
-    # Output Configuration
+    # Job boards searched each run, in order: linkedin, glassdoor (browser),
+    # glassdoor_http, indeed
+    JOB_SOURCES = ["linkedin", "glassdoor"]
+    
+    # Job board endpoints (point at mock_job_board.py for offline runs)
+    INDEED_BASE_URL = os.getenv("INDEED_BASE_URL", "https://in.indeed.com")
+    GLASSDOOR_BASE_URL = os.getenv("GLASSDOOR_BASE_URL", "https://www.glassdoor.com")
+    MAX_PAGES_PER_SEARCH = 1  # Result pages fetched per keyword
+    # Multiplier for the randomized politeness delays between requests
+    # (0 disables them, e.g. against a local mock server)
+    SCRAPE_DELAY_SCALE = float(os.getenv("SCRAPE_DELAY_SCALE", "1.0"))
+    
+    # BeautifulSoup backend for HTML parsing: html.parser (stdlib), lxml, html5lib
+    HTML_PARSER = "html.parser"
+    
+    # Output Configuration (path settings left as None resolve under OUTPUT_DIR
+    # when used, see output_path(), so moving OUTPUT_DIR moves them all)
     OUTPUT_DIR = "job_reports"
     MAX_JOBS_PER_SEARCH = 50
+    # full: rank every job (Apollo enrichment still stops at MAX_JOBS_PER_SEARCH);
+    # top_k: opt in to keeping only the best MAX_JOBS_PER_SEARCH jobs after
+    # scoring (partial sort), and the reports say they were truncated
+    RANKING_MODE = "full"
+    # auto: process batches of up to FAST_PATH_MAX_JOBS jobs as plain dicts and
+    # larger ones with pandas; python/pandas: always use that engine
+    PROCESSING_ENGINE = os.getenv("PROCESSING_ENGINE", "auto")
+    FAST_PATH_MAX_JOBS = int(os.getenv("FAST_PATH_MAX_JOBS", "1000"))
+    
+    # Columnar Export Configuration
+    COLUMNAR_EXPORT_ENABLED = True
+    COLUMNAR_FORMAT = "parquet"  # parquet, arrow
+    COLUMNAR_DIR = None  # None: <OUTPUT_DIR>/columnar
+    
+    # Pipeline Checkpoints (resume with: python job_search_agent.py resume <run-id>)
+    CHECKPOINT_DIR = None  # None: <OUTPUT_DIR>/checkpoints
+    CHECKPOINT_RETENTION_DAYS = 7
+    
+    # HTTP cache under the Indeed and Glassdoor (HTTP) sessions:
+    # off, record (serve entries younger than HTTP_CACHE_TTL seconds,
+    # revalidate older ones), replay (cache only, e.g. CI), refresh (refetch all)
+    HTTP_CACHE_MODE = os.getenv("HTTP_CACHE_MODE", "off")
+    HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR")  # None: <OUTPUT_DIR>/http_cache
+    HTTP_CACHE_TTL = float(os.getenv("HTTP_CACHE_TTL", "3600"))
+    # Recording runs delete entries stored more than this many days ago
+    HTTP_CACHE_RETENTION_DAYS = 7
+    # Apollo responses hold HR contacts' names, emails and phone numbers, so
+    # they are only cached (unencrypted, on disk) when this is switched on
+    HTTP_CACHE_APOLLO = False
+    # Result pages are re-requested with If-None-Match / If-Modified-Since;
+    # on 304 the jobs parsed from them last time are reused. Pages not seen for
+    # PAGE_VALIDATORS_MAX_AGE_DAYS are forgotten, and at most
+    # PAGE_VALIDATORS_MAX_PAGES (the most recently seen) are kept per board
+    CONDITIONAL_REQUESTS = True
+    PAGE_VALIDATORS_DIR = None  # None: <OUTPUT_DIR>/page_validators
+    PAGE_VALIDATORS_MAX_AGE_DAYS = 7
+    PAGE_VALIDATORS_MAX_PAGES = 2000
+    
+    # Company alias index: scraped name variants mapped to one canonical id,
+    # learned from the organizations Apollo resolves them to
+    COMPANY_INDEX_FILE = None  # None: <OUTPUT_DIR>/company_index.json
+    
+    # Offline gazetteer of city aliases, regions and remote/hybrid markers,
+    # used to resolve job locations to canonical city ids
+    LOCATION_GAZETTEER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "location_gazetteer.json")
+    
+    # Settings file applied over these values on start and whenever it changes,
+    # e.g. configure_filters' custom_config.json or a quick_filter_setup filters_*.json
+    CONFIG_PROFILE_FILE = os.getenv("CONFIG_PROFILE_FILE", "custom_config.json")
+    
+    # Cross-source duplicates: jobs of one company whose titles overlap and whose
+    # description shingles have an estimated Jaccard similarity (containment, if
+    # one is under half the other's length) of at least NEAR_DUPLICATE_THRESHOLD
+    # are merged into one job listing every source URL. When either description
+    # is missing or shorter than NEAR_DUPLICATE_MIN_DESCRIPTION_WORDS (a board's
+    # snippet), the titles alone must reach NEAR_DUPLICATE_TITLE_ONLY_THRESHOLD.
+    NEAR_DUPLICATE_DETECTION = True
+    NEAR_DUPLICATE_THRESHOLD = 0.6
+    NEAR_DUPLICATE_TITLE_THRESHOLD = 0.5  # Jaccard of title words, so shared boilerplate alone never merges
+    NEAR_DUPLICATE_TITLE_ONLY_THRESHOLD = 0.75
+    NEAR_DUPLICATE_MIN_DESCRIPTION_WORDS = 40
+    MINHASH_PERMUTATIONS = 64
+    LSH_BANDS = 16  # 4 rows per band: pairs above ~0.5 similarity become candidates
+    
+    # Full-text job index (SQLite FTS5) updated after every run;
+    # query with: python job_index.py search '"data analyst" AND sql'
+    JOB_INDEX_ENABLED = True
+    JOB_INDEX_PATH = None  # None: <OUTPUT_DIR>/job_index.sqlite
+    
+    # Run Metrics (per-run JSON plus a Prometheus textfile-collector file;
+    # point METRICS_TEXTFILE at node_exporter's --collector.textfile.directory)
+    METRICS_DIR = None  # None: <OUTPUT_DIR>/metrics
+    METRICS_TEXTFILE = None  # None: <METRICS_DIR>/job_search.prom
+    
+    # Relevance Scoring (relevance_score = sum of weight x points per component;
+    # SCORING_WEIGHTS_FILE may point at a JSON file overriding any of these,
+    # e.g. {"weights": {"recency": 2}, "title_keywords": ["python"]})
+    SCORING_WEIGHTS = {
+        "title": 2,         # per high-value keyword in the title
+        "company_size": 1,  # 0-3 points by employee count
+        "contacts": 1,      # per HR contact, up to SCORING_MAX_CONTACT_POINTS
+        "source": 1,        # job from a preferred source
+        "recency": 1        # 3/2/1 points for posted within 1/3/7 days
+    }
+    SCORING_TITLE_KEYWORDS = [
+        "software engineer", "developer", "programmer", "python", "java",
+        "full stack", "frontend", "backend", "data analyst", "qa engineer"
+    ]
+    SCORING_PREFERRED_SOURCES = ["LinkedIn"]
+    SCORING_MAX_CONTACT_POINTS = 3
+    SCORING_WEIGHTS_FILE = os.getenv("SCORING_WEIGHTS_FILE", "scoring_weights.json")
     
     # Apollo.io Search Configuration
+    # Point at mock_apollo_server.py for offline load testing
+    APOLLO_BASE_URL = os.getenv("APOLLO_BASE_URL", "https://api.apollo.io/v1")
+    APOLLO_MAX_RETRIES = 3  # Retries of a 429 response, honouring Retry-After
+    APOLLO_REQUEST_DELAY = 0.5  # Seconds between contact searches
+    APOLLO_JOB_DELAY = 1.0  # Seconds between enriched jobs
     APOLLO_SEARCH_LIMIT = 10  # Max contacts per company
     APOLLO_CONTACT_ROLES = [
         "HR Manager",
@@ -61,3 +181,43 @@ class Config:
         "HR Business Partner",
         "People Operations"
     ]
+
+# Where each path setting left as None lives under OUTPUT_DIR
+OUTPUT_PATHS = {
+    'COLUMNAR_DIR': 'columnar',
+    'CHECKPOINT_DIR': 'checkpoints',
+    'HTTP_CACHE_DIR': 'http_cache',
+    'PAGE_VALIDATORS_DIR': 'page_validators',
+    'COMPANY_INDEX_FILE': 'company_index.json',
+    'JOB_INDEX_PATH': 'job_index.sqlite',
+    'METRICS_DIR': 'metrics'
+}
+
+def output_path(config, name: str) -> str:
+    """A path setting's value, or where it defaults to under the config's current OUTPUT_DIR"""
+    value = getattr(config, name)
+    if value:
+        return value
+    if name == 'METRICS_TEXTFILE':
+        return os.path.join(output_path(config, 'METRICS_DIR'), 'job_search.prom')
+    return os.path.join(config.OUTPUT_DIR, OUTPUT_PATHS[name])
+
+# Files whose changes require rebuilding long-lived components
+CONFIG_FILES = [os.path.abspath(__file__), os.path.abspath(".env"), os.path.abspath(Config.SCORING_WEIGHTS_FILE),
+                os.path.abspath(Config.CONFIG_PROFILE_FILE)]
+
+def reload_config() -> Config:
+    """A Config instance with .env's and config.py's current values
+
+    The Config class every module imported keeps the values it had, so runs
+    already going are unaffected; pass the instance to the components to rebuild.
+    """
+    load_dotenv(override=True)
+    spec = importlib.util.spec_from_file_location("_config_reload", os.path.abspath(__file__))
+    fresh = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fresh)
+    config = Config()
+    for name, value in vars(fresh.Config).items():
+        if name.isupper():
+            setattr(config, name, value)
+    return config
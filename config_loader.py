@@ -0,0 +1,180 @@
+import os
+import re
+import copy
+import json
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Pattern, Tuple
+from location_matcher import LocationTargets, get_location_matcher, configured_locations, split_locations
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bookkeeping keys settings files carry (configure_filters writes "last_updated")
+METADATA_KEYS = {'last_updated'}
+
+# Preset settings with no Config default: accepted and kept on the profile as extras
+EXTRA_SETTINGS = {'REMOTE_WORK', 'COMPANY_SIZE', 'COMPANY_TYPE', 'REQUIRED_SKILLS'}
+
+# Defaults as config.py defines them, which settings are type-checked against
+DEFAULTS = {name: value for name, value in vars(Config).items() if name.isupper()}
+
+@dataclass(frozen=True)
+class ProfileSettings:
+    """One version of a validated settings file"""
+    path: str
+    version: Tuple[int, int]  # (mtime_ns, size) the settings were read at
+    overrides: Mapping[str, Any]
+    extras: Mapping[str, Any]
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    """Settings compiled once and shared by every component built from them"""
+    keywords: Tuple[str, ...]
+    # Any keyword, case-insensitively (longest first); None without keywords
+    keyword_regex: Optional[Pattern]
+    locations: Tuple[str, ...]
+    location_targets: LocationTargets
+    # load_scoring_model() result with SCORING_WEIGHTS_FILE applied, read-only
+    scoring: Mapping[str, Any]
+    extras: Mapping[str, Any]
+
+def _type_problem(name: str, value: Any, default: Any) -> Optional[str]:
+    """Why a value cannot replace a setting's default, or None"""
+    if default is None:
+        # Settings read from the environment (credentials, URLs)
+        return None if value is None or isinstance(value, str) else f"{name} must be a string"
+    if isinstance(default, bool):
+        return None if isinstance(value, bool) else f"{name} must be true or false"
+    if isinstance(default, (int, float)):
+        allowed = (int, float) if isinstance(default, float) else int
+        if isinstance(value, bool) or not isinstance(value, allowed):
+            return f"{name} must be {'a number' if allowed != int else 'an integer'}"
+        return None
+    if isinstance(default, (list, tuple)):
+        if not isinstance(value, list):
+            return f"{name} must be a list"
+        if all(isinstance(item, str) for item in default) and not all(isinstance(item, str) for item in value):
+            return f"{name} must be a list of strings"
+        return None
+    if not isinstance(value, type(default)):
+        return f"{name} must be a {type(default).__name__}"
+    return None
+
+def validate_settings(settings: Any, source: str = 'settings') -> Tuple[Dict, Dict]:
+    """Split settings into Config overrides and extras, raising one ValueError listing every problem"""
+    if not isinstance(settings, dict):
+        raise ValueError(f"{source}: expected a JSON object of settings")
+    overrides, extras, problems = {}, {}, []
+    for name, value in settings.items():
+        if name in METADATA_KEYS:
+            continue
+        if name in EXTRA_SETTINGS:
+            extras[name] = value
+        elif name not in DEFAULTS:
+            problems.append(f"unknown setting {name}")
+        else:
+            problem = _type_problem(name, value, DEFAULTS[name])
+            if problem:
+                problems.append(problem)
+            else:
+                overrides[name] = value
+    if 'JOB_KEYWORDS' in overrides and not overrides['JOB_KEYWORDS']:
+        problems.append("JOB_KEYWORDS must not be empty")
+    if problems:
+        raise ValueError(f"Invalid settings in {source}: {'; '.join(problems)}")
+    return overrides, extras
+
+def _file_version(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+# Last version read of each settings file
+_settings_cache: Dict[str, ProfileSettings] = {}
+
+def read_settings(path: str) -> ProfileSettings:
+    """A settings file, validated; parsed again only once the file changes"""
+    path = os.path.abspath(path)
+    version = _file_version(path)
+    cached = _settings_cache.get(path)
+    if cached is not None and cached.version == version:
+        return cached
+    with open(path, 'r', encoding='utf-8') as f:
+        overrides, extras = validate_settings(json.load(f), path)
+    settings = _settings_cache[path] = ProfileSettings(path, version, MappingProxyType(overrides), MappingProxyType(extras))
+    logger.info(f"Loaded {len(overrides) + len(extras)} settings from {path}")
+    return settings
+
+def load_config(path: Optional[str] = None, base: Optional[Config] = None) -> Config:
+    """A Config instance with CONFIG_PROFILE_FILE's settings set on it, over config.py's (or base's) values
+
+    The Config class itself keeps config.py's values, so agents and
+    profiles running at the same time never see each other's settings.
+    Without a file the instance has config.py's values.
+    """
+    config = copy.copy(base) if base is not None else Config()
+    path = config.CONFIG_PROFILE_FILE if path is None else path
+    if not path or not os.path.exists(path):
+        return config
+    settings = read_settings(path)
+    for name, value in {**settings.overrides, **settings.extras}.items():
+        # Copies, so components extending JOB_KEYWORDS and the like leave the cache intact
+        setattr(config, name, copy.deepcopy(value))
+    return config
+
+def _keyword_regex(keywords: Tuple[str, ...]) -> Optional[Pattern]:
+    terms = sorted({keyword.lower() for keyword in keywords}, key=len, reverse=True)
+    return re.compile('|'.join(map(re.escape, terms)), re.IGNORECASE) if terms else None
+
+def _frozen_scoring(model: Dict) -> Mapping[str, Any]:
+    return MappingProxyType({
+        'weights': MappingProxyType(dict(model['weights'])),
+        'title_keywords': tuple(model['title_keywords']),
+        'preferred_sources': tuple(model['preferred_sources']),
+        'max_contact_points': model['max_contact_points']
+    })
+
+def _profile_key(config) -> str:
+    """Everything a compiled profile is derived from, as one comparable string"""
+    values = {name: getattr(config, name, None) for name in (
+        'JOB_KEYWORDS', 'LOCATION', 'LOCATIONS', 'LOCATION_GAZETTEER_FILE', 'SCORING_WEIGHTS', 'SCORING_TITLE_KEYWORDS',
+        'SCORING_PREFERRED_SOURCES', 'SCORING_MAX_CONTACT_POINTS', 'SCORING_WEIGHTS_FILE'
+    )}
+    values['extras'] = {name: getattr(config, name) for name in sorted(EXTRA_SETTINGS) if hasattr(config, name)}
+    values['scoring_file_version'] = _file_version(config.SCORING_WEIGHTS_FILE) if config.SCORING_WEIGHTS_FILE else None
+    return json.dumps(values, sort_keys=True, default=str)
+
+# Compiled profiles by _profile_key, so equal settings share one object
+_compiled: Dict[str, CompiledProfile] = {}
+MAX_COMPILED_PROFILES = 64
+
+def compile_config(config) -> CompiledProfile:
+    """Keyword regex, location targets and scoring model of a config, compiled once per distinct settings"""
+    key = _profile_key(config)
+    profile = _compiled.get(key)
+    if profile is None:
+        from scoring_model import load_scoring_model
+        keywords = tuple(config.JOB_KEYWORDS)
+        locations = configured_locations(config)
+        extras = {name: getattr(config, name) for name in EXTRA_SETTINGS if hasattr(config, name)}
+        profile = CompiledProfile(
+            keywords=keywords,
+            keyword_regex=_keyword_regex(keywords),
+            locations=tuple(split_locations(locations)),
+            location_targets=get_location_matcher().targets(locations),
+            scoring=_frozen_scoring(load_scoring_model(config)),
+            extras=MappingProxyType(extras)
+        )
+        if len(_compiled) >= MAX_COMPILED_PROFILES:
+            _compiled.clear()
+        _compiled[key] = profile
+    return profile
+
+def get_profile(config=None) -> CompiledProfile:
+    """The compiled profile for a config (by default load_config()'s, i.e. with CONFIG_PROFILE_FILE applied)"""
+    return compile_config(config if config is not None else load_config())
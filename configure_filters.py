@@ -5,11 +5,13 @@ Interactive Filter Configuration Tool
 
 import json
 from datetime import datetime
+from config_loader import load_config
 from config import Config
 
 class FilterConfigurator:
     def __init__(self):
-        self.config = Config()
+        # Start from the saved settings, if any
+        self.config = load_config()
         
     def show_current_filters(self):
         """Display current filter configuration"""
@@ -288,11 +290,11 @@ class FilterConfigurator:
             "last_updated": datetime.now().isoformat()
         }
         
-        with open("custom_config.json", "w") as f:
+        with open(Config.CONFIG_PROFILE_FILE, "w") as f:
             json.dump(config_data, f, indent=2)
         
-        print(f"\n✅ Configuration saved to custom_config.json")
-        print("To use this configuration, update your config.py file with these values.")
+        print(f"\n✅ Configuration saved to {Config.CONFIG_PROFILE_FILE}")
+        print("The agent applies it on its next run (and a running scheduler reloads it).")
     
     def run_interactive_config(self):
         """Run interactive configuration"""
@@ -0,0 +1,273 @@
+import heapq
+import logging
+import signal
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CRON_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *'
+}
+
+# Never sleep longer than this, so wall-clock changes (DST, NTP) are picked up
+MAX_SLEEP_SECONDS = 3600
+
+class CronSchedule:
+    """Five-field cron expression: minute hour day-of-month month day-of-week"""
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 6)]
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = CRON_ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Invalid cron expression '{expression}': expected 5 fields")
+
+        self.minutes = self._parse_field(fields[0], *self.FIELD_RANGES[0])
+        self.hours = self._parse_field(fields[1], *self.FIELD_RANGES[1])
+        self.days = self._parse_field(fields[2], *self.FIELD_RANGES[2])
+        self.months = self._parse_field(fields[3], *self.FIELD_RANGES[3])
+        # Cron allows 7 as an alias for Sunday
+        self.weekdays = {day % 7 for day in self._parse_field(fields[4], 0, 7)}
+        # "*/2" still counts as unrestricted for the day-of-month/day-of-week rule
+        self.days_restricted = not fields[2].startswith('*')
+        self.weekdays_restricted = not fields[4].startswith('*')
+
+    def _parse_field(self, field: str, low: int, high: int) -> Set[int]:
+        """Parse a cron field with lists, ranges and steps into a set of values"""
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step_str = part.split('/', 1)
+                step = int(step_str)
+                if step <= 0:
+                    raise ValueError(f"Invalid step in cron field '{field}'")
+
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start_str, end_str = part.split('-', 1)
+                start, end = int(start_str), int(end_str)
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end:
+                raise ValueError(f"Cron field '{field}' out of range {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, dt: datetime) -> bool:
+        """Match day-of-month and day-of-week with standard cron OR semantics"""
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """Return the first matching minute strictly after the given time"""
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after + timedelta(days=366 * 5)
+
+        while dt <= limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+                continue
+            if dt.minute not in self.minutes:
+                dt = dt + timedelta(minutes=1)
+                continue
+            return dt
+
+        raise ValueError(f"Cron expression '{self.expression}' never fires")
+
+    def __repr__(self):
+        return f"CronSchedule('{self.expression}')"
+
+def default_schedules(config) -> List[str]:
+    """Translate SEARCH_FREQUENCY/SEARCH_TIME into cron expressions"""
+    hour, minute = config.SEARCH_TIME.split(':')
+    frequency = config.SEARCH_FREQUENCY.lower()
+    if frequency == 'daily':
+        return [f"{int(minute)} {int(hour)} * * *"]
+    elif frequency == 'weekly':
+        return [f"{int(minute)} {int(hour)} * * 1"]
+    raise ValueError(f"Unknown search frequency: {config.SEARCH_FREQUENCY}")
+
+class JobScheduler:
+    """Sleeps until the next due schedule and runs each profile in its own worker"""
+
+    def __init__(self):
+        self.config = Config()
+        self.profiles = {}
+        self._queue = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+
+    def add_profile(self, name: str, job: Callable[[], object], schedules: List[str]):
+        """Register a search profile with one or more cron schedules"""
+        self.profiles[name] = {
+            'job': job,
+            'schedules': [CronSchedule(expression) for expression in schedules],
+            'run_lock': threading.Lock(),
+            'worker': None,
+            'last_started': None,
+            'last_finished': None,
+            'last_result': None,
+            'last_error': None,
+            'runs': 0,
+            'skipped': 0
+        }
+        now = datetime.now()
+        for schedule in self.profiles[name]['schedules']:
+            self._push(schedule.next_after(now), name, schedule)
+        logger.info(f"Scheduled profile '{name}' with {', '.join(s.expression for s in self.profiles[name]['schedules'])}")
+        self._wake.set()
+
+    def _push(self, due: datetime, name: str, schedule: CronSchedule):
+        """Queue the next firing of a schedule"""
+        with self._lock:
+            self._sequence += 1
+            heapq.heappush(self._queue, (due, self._sequence, name, schedule))
+
+    def run_now(self, name: str) -> bool:
+        """Start a profile immediately; returns False if it is already running"""
+        profile = self.profiles[name]
+        if not profile['run_lock'].acquire(blocking=False):
+            profile['skipped'] += 1
+            logger.warning(f"Profile '{name}' is still running, skipping this execution")
+            return False
+
+        worker = threading.Thread(target=self._run_profile, args=(name,), name=f"search-{name}", daemon=True)
+        profile['worker'] = worker
+        worker.start()
+        return True
+
+    def _run_profile(self, name: str):
+        """Worker body: run the job and record its outcome"""
+        profile = self.profiles[name]
+        profile['last_started'] = datetime.now()
+        profile['runs'] += 1
+        try:
+            logger.info(f"Starting scheduled job search for profile '{name}'...")
+            profile['last_result'] = profile['job']()
+            profile['last_error'] = None
+            logger.info(f"Scheduled job search for profile '{name}' completed. Result: {profile['last_result']}")
+        except Exception as e:
+            profile['last_error'] = str(e)
+            logger.error(f"Scheduled job search for profile '{name}' failed: {str(e)}")
+        finally:
+            profile['last_finished'] = datetime.now()
+            profile['run_lock'].release()
+
+    def next_run(self, name: Optional[str] = None) -> Optional[datetime]:
+        """Next due time overall, or for a single profile"""
+        with self._lock:
+            times = [due for due, _, profile, _ in self._queue if name is None or profile == name]
+        return min(times) if times else None
+
+    def status(self) -> Dict:
+        """Snapshot of every profile's state"""
+        snapshot = {}
+        for name, profile in self.profiles.items():
+            snapshot[name] = {
+                'running': profile['run_lock'].locked(),
+                'schedules': [schedule.expression for schedule in profile['schedules']],
+                'next_run': self.next_run(name),
+                'last_started': profile['last_started'],
+                'last_finished': profile['last_finished'],
+                'last_result': profile['last_result'],
+                'last_error': profile['last_error'],
+                'runs': profile['runs'],
+                'skipped': profile['skipped']
+            }
+        return snapshot
+
+    def log_status(self, *args):
+        """Log the scheduler status (also bound to SIGUSR1 where available)"""
+        for name, state in self.status().items():
+            logger.info(
+                f"Profile '{name}': running={state['running']} runs={state['runs']} "
+                f"skipped={state['skipped']} next_run={state['next_run']} last_error={state['last_error']}"
+            )
+
+    def stop(self, *args):
+        """Ask the main loop to exit"""
+        self._stopping = True
+        self._wake.set()
+
+    def _install_signal_handlers(self):
+        """Route SIGTERM to shutdown and SIGUSR1 to a status dump"""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGTERM, self.stop)
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self.log_status)
+
+    def run_forever(self, run_on_start: bool = True):
+        """Main loop: sleep until the next due time, dispatch, repeat"""
+        self._install_signal_handlers()
+
+        if run_on_start:
+            logger.info("Running initial job search...")
+            for name in self.profiles:
+                self.run_now(name)
+
+        logger.info("Scheduler started. Press Ctrl+C to stop.")
+        try:
+            while not self._stopping:
+                self._dispatch_due()
+
+                next_due = self.next_run()
+                timeout = MAX_SLEEP_SECONDS
+                if next_due is not None:
+                    timeout = min(max((next_due - datetime.now()).total_seconds(), 0), MAX_SLEEP_SECONDS)
+
+                self._wake.wait(timeout)
+                self._wake.clear()
+        except KeyboardInterrupt:
+            logger.info("Scheduler stopped by user")
+        finally:
+            self._stopping = True
+            self._wait_for_workers()
+
+    def _dispatch_due(self):
+        """Start every profile whose schedule is due and requeue its next firing"""
+        now = datetime.now()
+        due_profiles = []
+        with self._lock:
+            while self._queue and self._queue[0][0] <= now:
+                _, _, name, schedule = heapq.heappop(self._queue)
+                due_profiles.append((name, schedule))
+
+        started = set()
+        for name, schedule in due_profiles:
+            self._push(schedule.next_after(now), name, schedule)
+            # Several schedules of one profile may coincide; run it once
+            if name not in started:
+                started.add(name)
+                self.run_now(name)
+
+    def _wait_for_workers(self, timeout: Optional[float] = None):
+        """Let in-flight searches finish before returning"""
+        for name, profile in self.profiles.items():
+            worker = profile['worker']
+            if worker is not None and worker.is_alive():
+                logger.info(f"Waiting for running search '{name}' to finish...")
+                worker.join(timeout)
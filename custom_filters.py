@@ -3,34 +3,39 @@
 Custom Filter Examples for Advanced Job Search
 """
 
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Sequence
+from salary_parser import SalaryIndex, SalaryParser, salary_fields, salary_overlaps
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_salary_parser = SalaryParser()
+
+# A predicate maps (block of jobs, indices still passing, lowercased text lookup)
+# to the indices that pass it
+BlockTest = Callable[[List[Dict], List[int], Callable[[str, List[int]], List[str]]], List[int]]
+
 def filter_by_salary_range(jobs, min_salary=300000, max_salary=800000):
     """Filter jobs by salary range (in INR per annum)"""
-    filtered_jobs = []
-    for job in jobs:
-        # Extract salary from description or salary field
-        salary_text = (job.get('salary', '') + ' ' + job.get('description', '')).lower()
-        
-        # Look for salary indicators
-        if any(indicator in salary_text for indicator in ['lpa', 'lakh', 'lac', 'rs', 'inr']):
-            # Simple salary extraction (you can make this more sophisticated)
-            if '3-5' in salary_text or '3 to 5' in salary_text:
-                filtered_jobs.append(job)
-            elif '4-6' in salary_text or '4 to 6' in salary_text:
-                filtered_jobs.append(job)
-            elif '5-8' in salary_text or '5 to 8' in salary_text:
-                filtered_jobs.append(job)
-        else:
-            # If no salary mentioned, include the job
-            filtered_jobs.append(job)
-    
-    return filtered_jobs
+    # Keep jobs whose salary range overlaps the wanted one, and jobs
+    # without a salary in rupees (nothing to compare)
+    salary_index = SalaryIndex(list(jobs), parser=_salary_parser)
+    return salary_index.between(min_salary, max_salary, include_unknown=True)
+
+def _salary_overlaps(job, min_salary: Optional[float], max_salary: Optional[float]) -> Optional[bool]:
+    """salary_overlaps over the salary parsed when the job was processed, parsing it now if it never was"""
+    fields = job if 'salary_min' in job else salary_fields(_salary_parser.parse_job(job))
+    return salary_overlaps(fields, min_salary, max_salary)
 
 def filter_by_company_size(jobs, company_sizes=['100-500', '500-1000', '1000+']):
     """Filter jobs by company size"""
     filtered_jobs = []
     for job in jobs:
         company_info = job.get('company_info', {})
-        employee_count = company_info.get('employee_count', '')
+        # Apollo reports estimated_num_employees as an int
+        employee_count = str(company_info.get('employee_count') or '')
         
         if any(size in employee_count for size in company_sizes):
             filtered_jobs.append(job)
@@ -107,35 +112,167 @@ def filter_by_company_type(jobs, company_types=['Product', 'Startup', 'MNC']):
     
     return filtered_jobs
 
-def apply_custom_filters(jobs, filter_config):
-    """Apply multiple custom filters"""
-    filtered_jobs = jobs.copy()
+# Filters whose every branch keeps the job: compiling drops them instead of paying a pass
+NO_OP_FILTERS = ['education_levels', 'work_modes', 'company_types']
+
+class FilterPredicate:
+    """One compiled filter with its measured cost and pass rate"""
     
-    # Apply salary filter
-    if filter_config.get('salary_range'):
-        min_sal, max_sal = filter_config['salary_range']
-        filtered_jobs = filter_by_salary_range(filtered_jobs, min_sal, max_sal)
+    def __init__(self, name: str, test: BlockTest):
+        self.name = name
+        self.test = test
+        self.evaluated = 0
+        self.passed = 0
+        self.seconds = 0.0
     
-    # Apply company size filter
-    if filter_config.get('company_sizes'):
-        filtered_jobs = filter_by_company_size(filtered_jobs, filter_config['company_sizes'])
+    def record(self, evaluated: int, passed: int, seconds: float):
+        """Add one block's evaluation to the totals"""
+        self.evaluated += evaluated
+        self.passed += passed
+        self.seconds += seconds
     
-    # Apply skills filter
-    if filter_config.get('required_skills'):
-        filtered_jobs = filter_by_skills_required(filtered_jobs, filter_config['required_skills'])
+    @property
+    def pass_rate(self) -> float:
+        return self.passed / self.evaluated if self.evaluated else 1.0
     
-    # Apply education filter
-    if filter_config.get('education_levels'):
-        filtered_jobs = filter_by_education(filtered_jobs, filter_config['education_levels'])
+    @property
+    def cost(self) -> float:
+        """Seconds per job evaluated"""
+        return self.seconds / self.evaluated if self.evaluated else 0.0
     
-    # Apply work mode filter
-    if filter_config.get('work_modes'):
-        filtered_jobs = filter_by_work_mode(filtered_jobs, filter_config['work_modes'])
+    def rank(self) -> tuple:
+        """Sort key: least time spent per job rejected first, non-rejecting predicates last"""
+        rejection_rate = 1.0 - self.pass_rate
+        return (self.cost / rejection_rate if rejection_rate > 0 else float('inf'), self.cost)
+
+class FilterPlan:
+    """A filter config compiled into predicates evaluated in one pass over the jobs
+    
+    Jobs are taken a block at a time and each predicate runs over the block's
+    survivors. A text field is lowercased once per job, and only for jobs
+    still passing when a predicate first needs it. Between blocks the
+    predicates are reordered by measured cost and pass rate, so selective,
+    cheap ones run first.
+    """
+    
+    BLOCK_SIZE = 1024
     
-    # Apply company type filter
-    if filter_config.get('company_types'):
-        filtered_jobs = filter_by_company_type(filtered_jobs, filter_config['company_types'])
+    def __init__(self, predicates: List[FilterPredicate], dropped: Sequence[str] = ()):
+        self.predicates = predicates
+        self.dropped = list(dropped)
+    
+    def apply(self, jobs: List[Dict]) -> List[Dict]:
+        """Jobs passing every predicate, in their original order"""
+        if not isinstance(jobs, list):
+            jobs = list(jobs)
+        if not self.predicates:
+            return jobs.copy()
+        
+        kept = []
+        for start in range(0, len(jobs), self.BLOCK_SIZE):
+            block = jobs[start:start + self.BLOCK_SIZE]
+            columns = {}
+            
+            def text(field, indices):
+                column = columns.get(field)
+                if column is None and len(indices) == len(block):
+                    column = columns[field] = [(job.get(field) or '').lower() for job in block]
+                    return column
+                if column is None:
+                    column = columns[field] = [None] * len(block)
+                for i in indices:
+                    if column[i] is None:
+                        column[i] = (block[i].get(field) or '').lower()
+                return column
+            
+            survivors = list(range(len(block)))
+            for predicate in self.predicates:
+                began = time.perf_counter()
+                passed = predicate.test(block, survivors, text)
+                predicate.record(len(survivors), len(passed), time.perf_counter() - began)
+                survivors = passed
+                if not survivors:
+                    break
+            kept.extend(block[i] for i in survivors)
+            self.predicates.sort(key=FilterPredicate.rank)
+        return kept
     
+    def stats(self) -> List[Dict]:
+        """Per-predicate jobs evaluated, pass rate and time, in evaluation order"""
+        return [{
+            'predicate': predicate.name,
+            'evaluated': predicate.evaluated,
+            'passed': predicate.passed,
+            'pass_rate': predicate.pass_rate,
+            'seconds': predicate.seconds,
+            'us_per_job': predicate.cost * 1e6
+        } for predicate in self.predicates]
+    
+    def report(self) -> str:
+        """Stats as aligned text lines"""
+        lines = [f"{'predicate':<16} {'evaluated':>10} {'pass rate':>10} {'seconds':>10} {'us/job':>8}"]
+        for stat in self.stats():
+            lines.append(f"{stat['predicate']:<16} {stat['evaluated']:>10} {stat['pass_rate']:>10.1%} "
+                         f"{stat['seconds']:>10.4f} {stat['us_per_job']:>8.2f}")
+        if self.dropped:
+            lines.append(f"dropped (never reject): {', '.join(self.dropped)}")
+        return "\n".join(lines)
+
+def _salary_predicate(min_salary: Optional[float], max_salary: Optional[float]) -> BlockTest:
+    """filter_by_salary_range"""
+    def test(block, survivors, text):
+        return [i for i in survivors if _salary_overlaps(block[i], min_salary, max_salary) is not False]
+    return test
+
+def _company_size_predicate(company_sizes: List[str]) -> BlockTest:
+    """filter_by_company_size"""
+    def test(block, survivors, text):
+        passed = []
+        for i in survivors:
+            employee_count = str((block[i].get('company_info') or {}).get('employee_count') or '')
+            if not employee_count or any(size in employee_count for size in company_sizes):
+                passed.append(i)
+        return passed
+    return test
+
+def _skills_predicate(required_skills: List[str]) -> BlockTest:
+    """filter_by_skills_required"""
+    skills = [skill.lower() for skill in required_skills]
+    def test(block, survivors, text):
+        titles = text('title', survivors)
+        descriptions = text('description', survivors)
+        passed = []
+        for i in survivors:
+            job_text = titles[i] + ' ' + descriptions[i]
+            for skill in skills:
+                if skill in job_text:
+                    passed.append(i)
+                    break
+        return passed
+    return test
+
+def compile_filters(filter_config: Dict) -> FilterPlan:
+    """Compile an apply_custom_filters config into a FilterPlan"""
+    predicates = []
+    if filter_config.get('salary_range'):
+        predicates.append(FilterPredicate('salary_range', _salary_predicate(*filter_config['salary_range'])))
+    if filter_config.get('company_sizes'):
+        predicates.append(FilterPredicate('company_sizes', _company_size_predicate(filter_config['company_sizes'])))
+    if filter_config.get('required_skills'):
+        predicates.append(FilterPredicate('required_skills', _skills_predicate(filter_config['required_skills'])))
+    dropped = [name for name in NO_OP_FILTERS if filter_config.get(name)]
+    return FilterPlan(predicates, dropped)
+
+def apply_custom_filters(jobs, filter_config):
+    """Apply multiple custom filters
+    
+    Same result as chaining the filter_by_* functions above, in one pass.
+    """
+    plan = compile_filters(filter_config)
+    filtered_jobs = plan.apply(jobs)
+    for stat in plan.stats():
+        logger.info(f"Custom filter {stat['predicate']}: {stat['pass_rate']:.1%} of {stat['evaluated']} passed "
+                    f"in {stat['seconds']:.4f}s")
     return filtered_jobs
 
 # Example usage
@@ -153,3 +290,10 @@ if __name__ == "__main__":
     print("Custom filter configuration:")
     for key, value in custom_filter_config.items():
         print(f"  {key}: {value}")
+    
+    # Compiled plan over a synthetic corpus, with per-predicate timing
+    from synthetic_jobs import SyntheticJobGenerator
+    plan = compile_filters(custom_filter_config)
+    jobs = SyntheticJobGenerator(seed=42).generate_list(10000)
+    print(f"\n{len(plan.apply(jobs))} of {len(jobs)} jobs passed")
+    print(plan.report())
@@ -1,227 +1,324 @@
+import re
+import heapq
+import numpy as np
 import pandas as pd
 import logging
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-import re
+import metrics
+from scoring_model import ScoringModel
+from date_normalizer import DateNormalizer
+from salary_parser import SalaryParser, SalaryIndex, SALARY_FIELDS, salary_fields
+from location_matcher import get_location_matcher
+from config_loader import get_profile
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Filtering rules, shared by the pandas and plain-Python paths
+FRESHER_KEYWORDS = [
+    'fresher', 'entry level', 'entry-level', 'junior', 'trainee', 
+    'graduate', '0-1 years', '0-2 years', '1-2 years', 'intern'
+]
+SENIOR_KEYWORDS = [
+    'senior', 'lead', 'principal', 'architect', 'manager', 
+    'director', 'vp', 'vice president', 'head of', '5+ years',
+    '10+ years', '8+ years'
+]
+NOT_FULL_TIME_PATTERN = 'part.time|contract|freelance'
+CLEANED_COLUMNS = ['company', 'title', 'location', 'description']
+
+EPOCH = datetime(1970, 1, 1)
+
+def _is_missing(value) -> bool:
+    """None or NaN, as pandas treats them"""
+    return value is None or (isinstance(value, float) and value != value)
+
 class JobDataProcessor:
-    def __init__(self):
-        self.config = Config()
-        
-    def process_jobs(self, jobs: List[Dict]) -> List[Dict]:
-        """Process and filter job data"""
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
+        self.scoring_model = ScoringModel(self.config)
+        self.date_normalizer = DateNormalizer()
+        self.salary_parser = SalaryParser()
+        self.location_matcher = get_location_matcher()
+        self._fresher_regex = re.compile('|'.join(map(re.escape, FRESHER_KEYWORDS)), re.IGNORECASE)
+        self._senior_regex = re.compile('|'.join(map(re.escape, SENIOR_KEYWORDS)), re.IGNORECASE)
+        self._not_full_time_regex = re.compile(NOT_FULL_TIME_PATTERN, re.IGNORECASE)
+        
+    def process_jobs(self, jobs: List[Dict], top_k: Optional[int] = None, engine: Optional[str] = None) -> List[Dict]:
+        """Process and filter job data
+        
+        Every job that passes the filters is returned, best first; with
+        top_k (or RANKING_MODE "top_k", which uses MAX_JOBS_PER_SEARCH) only
+        the best top_k are kept. Batches up to
+        FAST_PATH_MAX_JOBS are processed as plain dicts, larger ones with
+        pandas; engine (or PROCESSING_ENGINE) can force either.
+        """
         if not jobs:
             return []
         
         logger.info(f"Processing {len(jobs)} jobs")
+        now = datetime.now()
+        if top_k is None and self.config.RANKING_MODE == "top_k":
+            top_k = self.config.MAX_JOBS_PER_SEARCH
+        engine = engine or self.config.PROCESSING_ENGINE
+        if engine == "auto":
+            engine = "python" if len(jobs) <= self.config.FAST_PATH_MAX_JOBS else "pandas"
+        elif engine not in ("python", "pandas"):
+            raise ValueError(f"Unknown processing engine '{engine}' (choose from: auto, python, pandas)")
+        
+        if engine == "python":
+            processed_jobs = self._process_records(jobs, now, top_k)
+        else:
+            processed_jobs = self._process_frame(jobs, now, top_k)
+        metrics.increment("jobs_processed", len(jobs), outcome="input")
+        metrics.increment("jobs_processed", len(processed_jobs), outcome="kept")
         
+        logger.info(f"Processed {len(processed_jobs)} jobs after filtering")
+        return processed_jobs
+    
+    def _process_frame(self, jobs: List[Dict], now: datetime, top_k: Optional[int]) -> List[Dict]:
+        """The pandas path, for large batches"""
         # Convert to DataFrame for easier processing
-        df = pd.DataFrame(jobs)
+        with metrics.timer("process", step="load", engine="pandas"):
+            df = pd.DataFrame(jobs)
         
         # Apply filters
-        df = self._apply_filters(df)
+        with metrics.timer("process", step="filter", engine="pandas"):
+            df = self._apply_filters(df)
         
         # Clean and standardize data
-        df = self._clean_data(df)
+        with metrics.timer("process", step="clean", engine="pandas"):
+            df = self._clean_data(df, now)
         
         # Score jobs based on relevance
-        df = self._score_jobs(df)
+        with metrics.timer("process", step="score", engine="pandas"):
+            df = self._score_jobs(df, now)
         
         # Sort by score and other criteria
-        df = self._sort_jobs(df)
+        with metrics.timer("process", step="sort", engine="pandas"):
+            df = self._sort_jobs(df, top_k)
         
         # Convert back to list of dictionaries
-        processed_jobs = df.to_dict('records')
-        
-        logger.info(f"Processed {len(processed_jobs)} jobs after filtering")
-        return processed_jobs
+        with metrics.timer("process", step="export", engine="pandas"):
+            # posted_at is internal; jobs keep the JSON-safe posted_date string
+            df = df.drop(columns=['posted_at'], errors='ignore')
+            # Fields only some sources provide come back as NaN; export them as None
+            df = df.astype(object).where(df.notna(), None)
+            return df.to_dict('records')
+    
+    def _process_records(self, jobs: List[Dict], now: datetime, top_k: Optional[int]) -> List[Dict]:
+        """The plain-Python path: same steps and results as the pandas path, without the DataFrame round trip"""
+        with metrics.timer("process", step="load", engine="python"):
+            # Every record gets every field, as DataFrame columns would
+            columns = list(dict.fromkeys(key for job in jobs for key in job))
+            records = [{column: job.get(column) for column in columns} for job in jobs]
+        
+        with metrics.timer("process", step="filter", engine="python"):
+            records = self._filter_records(records, set(columns))
+        
+        with metrics.timer("process", step="clean", engine="python"):
+            self._clean_records(records, set(columns), now)
+        
+        with metrics.timer("process", step="score", engine="python"):
+            self.scoring_model.score_records(records, now)
+        
+        with metrics.timer("process", step="sort", engine="python"):
+            records = self._sort_records(records, top_k)
+        
+        with metrics.timer("process", step="export", engine="python"):
+            for record in records:
+                record.pop('posted_at', None)
+                for key, value in record.items():
+                    if _is_missing(value):
+                        record[key] = None
+        return records
     
     def _apply_filters(self, df: pd.DataFrame) -> pd.DataFrame:
         """Apply various filters to job data"""
         original_count = len(df)
+        keep = np.ones(len(df), dtype=bool)
         
-        # Filter by location (case-insensitive)
+        # Filter by location: any configured city, by gazetteer alias
         if 'location' in df.columns:
-            df = df[df['location'].str.contains('bangalore|bengaluru', case=False, na=False)]
+            keep &= self.location_matcher.mask(df['location'], self._location_targets())
         
         # Filter by experience level keywords
         if 'title' in df.columns and 'description' in df.columns:
             # Look for fresher/entry-level keywords in title or description
-            fresher_keywords = [
-                'fresher', 'entry level', 'entry-level', 'junior', 'trainee', 
-                'graduate', '0-1 years', '0-2 years', '1-2 years', 'intern'
-            ]
-            
-            def has_fresher_keywords(row):
-                title = str(row.get('title', '')).lower()
-                description = str(row.get('description', '')).lower()
-                text = f"{title} {description}"
-                return any(keyword in text for keyword in fresher_keywords)
-            
-            df = df[df.apply(has_fresher_keywords, axis=1)]
+            fresher = self._fresher_regex.pattern
+            keep &= self._text_matches(df['title'], fresher) | self._text_matches(df['description'], fresher)
         
         # Filter out senior positions
         if 'title' in df.columns:
-            senior_keywords = [
-                'senior', 'lead', 'principal', 'architect', 'manager', 
-                'director', 'vp', 'vice president', 'head of', '5+ years',
-                '10+ years', '8+ years'
-            ]
-            
-            def is_not_senior(row):
-                title = str(row.get('title', '')).lower()
-                return not any(keyword in title for keyword in senior_keywords)
-            
-            df = df[df.apply(is_not_senior, axis=1)]
+            keep &= ~self._text_matches(df['title'], self._senior_regex.pattern)
         
         # Filter by job type if specified
-        if self.config.JOB_TYPE and 'description' in df.columns:
-            job_type = self.config.JOB_TYPE.lower()
-            if job_type == 'full-time':
-                df = df[~df['description'].str.contains('part.time|contract|freelance', case=False, na=False)]
+        if self._full_time_only() and 'description' in df.columns:
+            keep &= ~self._text_matches(df['description'], NOT_FULL_TIME_PATTERN)
         
-        filtered_count = len(df)
-        logger.info(f"Filtered from {original_count} to {filtered_count} jobs")
+        df = df[keep]
+        logger.info(f"Filtered from {original_count} to {len(df)} jobs")
         
         return df
     
-    def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _text_matches(self, column: pd.Series, pattern: str) -> np.ndarray:
+        """Case-insensitive regex search over a column; non-text values never match"""
+        if not self._is_text(column):
+            return np.zeros(len(column), dtype=bool)
+        return column.str.contains(pattern, case=False, regex=True, na=False).to_numpy(dtype=bool)
+    
+    def _is_text(self, column: pd.Series) -> bool:
+        """Whether a column can hold strings (a column of only None/NaN comes back as float)"""
+        return column.dtype == object or pd.api.types.is_string_dtype(column)
+    
+    def _location_targets(self):
+        """The configured cities (LOCATIONS, else LOCATION), compiled once per distinct settings"""
+        return get_profile(self.config).location_targets
+    
+    def _full_time_only(self) -> bool:
+        """Whether part-time, contract and freelance jobs are filtered out"""
+        return bool(self.config.JOB_TYPE) and self.config.JOB_TYPE.lower() == 'full-time'
+    
+    def _filter_records(self, records: List[Dict], columns: set) -> List[Dict]:
+        """_apply_filters for plain dicts"""
+        def search(regex, value):
+            return isinstance(value, str) and regex.search(value) is not None
+        
+        has_location = 'location' in columns
+        targets = self._location_targets()
+        matches = self.location_matcher.matches
+        check_fresher = 'title' in columns and 'description' in columns
+        check_senior = 'title' in columns
+        check_job_type = self._full_time_only() and 'description' in columns
+        
+        kept = [
+            record for record in records
+            if (not has_location or matches(record['location'], targets))
+            and (not check_fresher or search(self._fresher_regex, record['title'])
+                 or search(self._fresher_regex, record['description']))
+            and (not check_senior or not search(self._senior_regex, record['title']))
+            and (not check_job_type or not search(self._not_full_time_regex, record['description']))
+        ]
+        logger.info(f"Filtered from {len(records)} to {len(kept)} jobs")
+        return kept
+    
+    def _clean_data(self, df: pd.DataFrame, now: Optional[datetime] = None) -> pd.DataFrame:
         """Clean and standardize job data"""
-        # Clean company names
-        if 'company' in df.columns:
-            df['company'] = df['company'].str.strip()
-            df['company'] = df['company'].str.replace(r'\s+', ' ', regex=True)
-        
-        # Clean job titles
-        if 'title' in df.columns:
-            df['title'] = df['title'].str.strip()
-            df['title'] = df['title'].str.replace(r'\s+', ' ', regex=True)
-        
-        # Clean locations
-        if 'location' in df.columns:
-            df['location'] = df['location'].str.strip()
-            df['location'] = df['location'].str.replace(r'\s+', ' ', regex=True)
-        
-        # Clean descriptions
-        if 'description' in df.columns:
-            df['description'] = df['description'].str.strip()
-            df['description'] = df['description'].str.replace(r'\s+', ' ', regex=True)
+        # Trim and collapse whitespace in company names, titles, locations and descriptions
+        cleaned = {
+            column: df[column].str.strip().str.replace(r'\s+', ' ', regex=True)
+            if self._is_text(df[column]) else pd.Series(None, index=df.index, dtype=object)
+            for column in CLEANED_COLUMNS if column in df.columns
+        }
         
-        # Standardize posted dates
+        # Standardize posted dates: a real datetime for sorting and scoring,
+        # and YYYY-MM-DD text (raw text if unrecognized) for reports
         if 'posted_date' in df.columns:
-            df['posted_date'] = df['posted_date'].apply(self._standardize_date)
-        
-        return df
+            posted_at = self.date_normalizer.normalize(df['posted_date'], now)
+            raw_dates = df['posted_date'].where(df['posted_date'].notna(), '').astype(str)
+            cleaned['posted_at'] = posted_at
+            cleaned['posted_date'] = posted_at.dt.strftime('%Y-%m-%d').where(posted_at.notna(), raw_dates)
+        
+        # Canonical city id ("bangalore" for Bengaluru or Whitefield; "remote" for remote-only jobs)
+        if 'location' in cleaned:
+            cleaned['location_id'] = pd.Series(
+                self.location_matcher.location_ids(cleaned['location']), index=df.index, dtype=object
+            )
+        
+        # Parse salaries once into per-annum numbers for range filters and sorting
+        if 'salary' in df.columns or 'description' in df.columns:
+            missing = [None] * len(df)
+            parsed = self.salary_parser.parse_columns(
+                df['salary'] if 'salary' in df.columns else missing,
+                df['description'] if 'description' in df.columns else missing
+            )
+            fields = [salary_fields(salary) for salary in parsed]
+            for name in SALARY_FIELDS:
+                dtype = np.float64 if name in ('salary_min', 'salary_max') else object
+                cleaned[name] = pd.Series([field[name] for field in fields], index=df.index, dtype=dtype)
+        
+        # assign() builds a new frame instead of writing into the filtered view
+        return df.assign(**cleaned)
     
-    def _standardize_date(self, date_str: str) -> str:
-        """Standardize date format"""
-        if not date_str or pd.isna(date_str):
-            return ""
-        
-        date_str = str(date_str).lower()
-        
-        # Handle relative dates
-        if 'hour' in date_str or 'minute' in date_str:
-            return datetime.now().strftime('%Y-%m-%d')
-        elif 'day' in date_str:
-            days_ago = re.search(r'(\d+)', date_str)
-            if days_ago:
-                days = int(days_ago.group(1))
-                return (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
-        elif 'week' in date_str:
-            weeks_ago = re.search(r'(\d+)', date_str)
-            if weeks_ago:
-                weeks = int(weeks_ago.group(1))
-                return (datetime.now() - timedelta(weeks=weeks)).strftime('%Y-%m-%d')
-        
-        return date_str
+    def _clean_records(self, records: List[Dict], columns: set, now: datetime):
+        """_clean_data for plain dicts, in place"""
+        whitespace = re.compile(r'\s+')
+        text_columns = [column for column in CLEANED_COLUMNS if column in columns]
+        for record in records:
+            for column in text_columns:
+                value = record[column]
+                record[column] = whitespace.sub(' ', value.strip()) if isinstance(value, str) else None
+        
+        if 'posted_date' in columns:
+            posted = self.date_normalizer.resolve([record['posted_date'] for record in records], now)
+            for record, posted_at in zip(records, posted):
+                raw = record['posted_date']
+                record['posted_at'] = posted_at
+                if posted_at is not None:
+                    record['posted_date'] = posted_at.strftime('%Y-%m-%d')
+                else:
+                    record['posted_date'] = '' if _is_missing(raw) else str(raw)
+        
+        if 'location' in columns:
+            for record in records:
+                record['location_id'] = self.location_matcher.location_id(record['location'])
+        
+        if 'salary' in columns or 'description' in columns:
+            parsed = self.salary_parser.parse_columns(
+                [record.get('salary') for record in records], [record.get('description') for record in records]
+            )
+            for record, salary in zip(records, parsed):
+                record.update(salary_fields(salary))
     
-    def _score_jobs(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Score jobs based on relevance and quality"""
-        df['relevance_score'] = 0
-        
-        # Score based on title keywords
-        if 'title' in df.columns:
-            high_value_keywords = [
-                'software engineer', 'developer', 'programmer', 'python', 'java',
-                'full stack', 'frontend', 'backend', 'data analyst', 'qa engineer'
-            ]
-            
-            for keyword in high_value_keywords:
-                df.loc[df['title'].str.contains(keyword, case=False, na=False), 'relevance_score'] += 2
-        
-        # Score based on company size (if available)
-        if 'company_info' in df.columns:
-            def score_company_size(company_info):
-                if not company_info or not isinstance(company_info, dict):
-                    return 0
-                
-                employee_count = company_info.get('employee_count', '')
-                if isinstance(employee_count, str):
-                    if '1000+' in employee_count or '10000+' in employee_count:
-                        return 3
-                    elif '100+' in employee_count or '500+' in employee_count:
-                        return 2
-                    elif '10+' in employee_count or '50+' in employee_count:
-                        return 1
-                return 0
-            
-            df['company_score'] = df['company_info'].apply(score_company_size)
-            df['relevance_score'] += df['company_score']
-        
-        # Score based on HR contacts availability
-        if 'hr_contacts' in df.columns:
-            def score_contacts(contacts):
-                if not contacts:
-                    return 0
-                return min(len(contacts), 3)  # Max 3 points for contacts
-            
-            df['contact_score'] = df['hr_contacts'].apply(score_contacts)
-            df['relevance_score'] += df['contact_score']
-        
-        # Score based on job source
-        if 'source' in df.columns:
-            df.loc[df['source'] == 'LinkedIn', 'relevance_score'] += 1
-        
-        # Score based on recency
-        if 'posted_date' in df.columns:
-            def score_recency(date_str):
-                if not date_str:
-                    return 0
-                try:
-                    if isinstance(date_str, str) and len(date_str) == 10:  # YYYY-MM-DD format
-                        job_date = datetime.strptime(date_str, '%Y-%m-%d')
-                        days_ago = (datetime.now() - job_date).days
-                        if days_ago <= 1:
-                            return 3
-                        elif days_ago <= 3:
-                            return 2
-                        elif days_ago <= 7:
-                            return 1
-                except:
-                    pass
-                return 0
-            
-            df['recency_score'] = df['posted_date'].apply(score_recency)
-            df['relevance_score'] += df['recency_score']
-        
-        return df
+    def _score_jobs(self, df: pd.DataFrame, now: Optional[datetime] = None) -> pd.DataFrame:
+        """Score jobs based on relevance and quality (see scoring_model.py)"""
+        return self.scoring_model.score(df, now)
     
-    def _sort_jobs(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Sort jobs by relevance and other criteria"""
-        # Sort by relevance score (descending), then by posted date (descending)
-        sort_columns = ['relevance_score']
-        
-        if 'posted_date' in df.columns:
-            sort_columns.append('posted_date')
-        
-        df = df.sort_values(by=sort_columns, ascending=[False] + [False] * (len(sort_columns) - 1))
-        
-        return df
+    def _sort_jobs(self, df: pd.DataFrame, top_k: Optional[int] = None) -> pd.DataFrame:
+        """Rank by relevance score, then newest posting, then scrape order
+        
+        With top_k, a partial sort (argpartition) picks the candidates first,
+        so only rows that can make the cut are ordered.
+        """
+        if df.empty:
+            return df
+        
+        scores = df['relevance_score'].to_numpy(dtype=np.float64)
+        if 'posted_at' in df.columns:
+            # Descending-date key; undated jobs rank after every dated one
+            posted = df['posted_at'].to_numpy(dtype='datetime64[ns]')
+            date_keys = np.where(np.isnat(posted), np.iinfo(np.int64).max, -posted.astype(np.int64))
+        else:
+            date_keys = np.zeros(len(df), dtype=np.int64)
+        
+        positions = np.arange(len(df))
+        if top_k and top_k < len(df):
+            cutoff = len(df) - top_k
+            threshold = np.partition(scores, cutoff)[cutoff]
+            positions = np.flatnonzero(scores >= threshold)
+        
+        # lexsort orders by its last key first; positions last keeps full ties in scrape order
+        order = positions[np.lexsort((positions, date_keys[positions], -scores[positions]))]
+        if top_k:
+            order = order[:top_k]
+        return df.iloc[order]
+    
+    def _sort_records(self, records: List[Dict], top_k: Optional[int] = None) -> List[Dict]:
+        """_sort_jobs for plain dicts; with top_k a heap selects the best rows"""
+        def rank_key(item):
+            position, record = item
+            posted_at = record.get('posted_at')
+            date_key = (0, -((posted_at - EPOCH) // timedelta(microseconds=1))) if posted_at else (1, 0)
+            return (-record['relevance_score'], date_key, position)
+        
+        indexed = list(enumerate(records))
+        if top_k and top_k < len(records):
+            ranked = heapq.nsmallest(top_k, indexed, key=rank_key)
+        else:
+            ranked = sorted(indexed, key=rank_key)
+        return [record for _, record in ranked]
     
     def get_job_statistics(self, jobs: List[Dict]) -> Dict:
         """Get statistics about the processed jobs"""
@@ -244,7 +341,8 @@ class JobDataProcessor:
     
     def filter_by_criteria(self, jobs: List[Dict], criteria: Dict) -> List[Dict]:
         """Filter jobs by specific criteria"""
-        filtered_jobs = jobs.copy()
+        # Each filter below builds a new list, so the input is never modified
+        filtered_jobs = jobs
         
         # Filter by minimum relevance score
         if 'min_relevance_score' in criteria:
@@ -288,6 +386,13 @@ class JobDataProcessor:
             
             filtered_jobs = [job for job in filtered_jobs if is_in_date_range(job)]
         
+        # Filter by annual INR salary range (a range query over the parsed salary_min/salary_max)
+        if criteria.get('salary_range'):
+            min_salary, max_salary = criteria['salary_range']
+            # Include jobs without a comparable salary, as with dates
+            salary_index = SalaryIndex(filtered_jobs, parser=self.salary_parser)
+            filtered_jobs = salary_index.between(min_salary, max_salary, include_unknown=True)
+        
         return filtered_jobs
 
 if __name__ == "__main__":
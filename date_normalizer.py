@@ -0,0 +1,106 @@
+import re
+import logging
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Phrases meaning "posted now" across LinkedIn, Indeed and Glassdoor
+NOW_PHRASES = {'just posted', 'today', 'posted today', 'active today', 'new', 'just now', 'moments ago'}
+YESTERDAY_PHRASES = {'yesterday', 'posted yesterday', 'active yesterday'}
+
+# "5 days ago", "Posted 30+ days ago", "Active 2 weeks ago", "24h", "30d+", "3 hours ago"
+RELATIVE_PATTERN = r'(?P<count>\d+)\s*\+?\s*(?P<unit>minute|min|hour|hr|h|day|d|week|wk|w|month|mo)s?(?![a-z])'
+ABSOLUTE_PATTERN = r'^\d{4}-\d{2}-\d{2}'
+OFFSET_PATTERN = r'(?:Z|[+-]\d{2}:?\d{2})$'
+
+UNIT_DAYS = {
+    'minute': 1 / 1440, 'min': 1 / 1440,
+    'hour': 1 / 24, 'hr': 1 / 24, 'h': 1 / 24,
+    'day': 1, 'd': 1,
+    'week': 7, 'wk': 7, 'w': 7,
+    'month': 30, 'mo': 30
+}
+
+class DateNormalizer:
+    """Parses posted-date strings from every source into datetimes
+
+    Each distinct raw string is parsed once and remembered as either an age
+    (relative formats) or a fixed datetime (ISO dates), so the memo stays
+    valid across runs and only the reference "now" changes.
+    """
+
+    def __init__(self):
+        self._memo: Dict[str, Tuple[Optional[timedelta], Optional[datetime]]] = {}
+
+    def normalize(self, values: pd.Series, now: Optional[datetime] = None) -> pd.Series:
+        """Datetime column (NaT where unparseable) for a column of raw posted dates"""
+        now = now or datetime.now()
+        raw = values.where(values.notna(), '').astype(str)
+        codes, uniques = pd.factorize(raw)
+        self._learn(value for value in uniques if value not in self._memo)
+
+        ages = np.array(
+            [np.timedelta64('NaT') if age is None else age for age, _ in map(self._memo.get, uniques)],
+            dtype='timedelta64[ns]'
+        )
+        fixed = np.array(
+            [np.datetime64('NaT') if date is None else date for _, date in map(self._memo.get, uniques)],
+            dtype='datetime64[ns]'
+        )
+        resolved = np.where(np.isnat(ages), fixed, np.datetime64(now, 'ns') - ages)
+        return pd.Series(resolved[codes] if len(codes) else resolved[:0], index=values.index, dtype='datetime64[ns]')
+
+    def resolve(self, values: List, now: Optional[datetime] = None) -> List[Optional[datetime]]:
+        """Datetimes (None where unparseable) for a list of raw posted dates, without pandas once memoized"""
+        now = now or datetime.now()
+        raw = ['' if value is None or value != value else str(value) for value in values]
+        unseen = {value for value in raw if value not in self._memo}
+        if unseen:
+            self._learn(unseen)
+        resolved = []
+        for value in raw:
+            age, fixed = self._memo[value]
+            resolved.append(now - age if age is not None else fixed)
+        return resolved
+
+    def parse(self, value: str, now: Optional[datetime] = None) -> Optional[datetime]:
+        """Datetime for a single raw posted date, or None"""
+        return self.resolve([value], now)[0]
+
+    def _learn(self, values: Iterable[str]):
+        """Parse raw strings not seen before, with vectorized extraction over all of them"""
+        raw = pd.Series(list(values), dtype=object)
+        if raw.empty:
+            return
+        stripped = raw.str.strip()
+        text = stripped.str.lower()
+
+        is_absolute = stripped.str.match(ABSOLUTE_PATTERN)
+        has_offset = is_absolute & stripped.str.contains(OFFSET_PATTERN)
+        absolute = pd.to_datetime(stripped.where(is_absolute & ~has_offset), format='ISO8601', errors='coerce')
+        if has_offset.any():
+            # Timestamps with an offset are converted to local time, the zone "now" is taken in
+            aware = pd.to_datetime(stripped.where(has_offset), format='ISO8601', errors='coerce', utc=True)
+            local = aware.dt.tz_convert(datetime.now().astimezone().tzinfo).dt.tz_localize(None)
+            absolute = absolute.where(~has_offset, local)
+
+        extracted = text.str.extract(RELATIVE_PATTERN, flags=re.IGNORECASE)
+        counts = pd.to_numeric(extracted['count'], errors='coerce')
+        age_days = counts * extracted['unit'].map(UNIT_DAYS)
+        age_days = age_days.mask(text.isin(NOW_PHRASES), 0.0)
+        age_days = age_days.mask(text.isin(YESTERDAY_PHRASES), 1.0)
+        ages = pd.to_timedelta(age_days, unit='D')
+
+        for value, is_abs, fixed, age in zip(raw, is_absolute, absolute, ages):
+            if is_abs and not pd.isna(fixed):
+                self._memo[value] = (None, fixed.to_pydatetime())
+            elif not pd.isna(age):
+                self._memo[value] = (age.to_pytimedelta(), None)
+            else:
+                if value:
+                    logger.debug(f"Unrecognized posted date: {value!r}")
+                self._memo[value] = (None, None)
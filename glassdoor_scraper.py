@@ -2,6 +2,7 @@ import time
 import json
 import logging
 import requests
+from urllib.parse import urlencode
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 from selenium import webdriver
@@ -11,14 +12,18 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
+import metrics
+from company_normalizer import company_key
+from location_matcher import get_location_matcher
+from search_profiles import SearchQuery, search_queries
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class GlassdoorJobScraper:
-    def __init__(self):
-        self.config = Config()
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
         self.driver = None
         self.jobs = []
         self.session = requests.Session()
@@ -45,12 +50,22 @@ class GlassdoorJobScraper:
         )
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
     
-    def search_jobs_selenium(self, keyword: str) -> List[Dict]:
+    def _location_params(self, location: str) -> Dict[str, str]:
+        """Glassdoor location parameters: the gazetteer's Glassdoor city id when it has one, else the location as text"""
+        city = get_location_matcher().city(location)
+        if city and city.get('glassdoor_loc_id'):
+            return {'locT': 'C', 'locId': city['glassdoor_loc_id']}
+        return {'locKeyword': location}
+    
+    def search_jobs_selenium(self, keyword: str, location: Optional[str] = None) -> List[Dict]:
         """Search for jobs using Selenium (for dynamic content)"""
         jobs = []
         try:
             # Construct Glassdoor search URL
-            search_url = f"https://www.glassdoor.com/Job/jobs.htm?sc.keyword={keyword}&locT=C&locId=1157405&jobType=&fromAge=1&minSalary=0&includeNoSalaryJobs=true&radius=100&cityId=-1"
+            params = {'sc.keyword': keyword, **self._location_params(location or self.config.LOCATION),
+                      'jobType': '', 'fromAge': '1', 'minSalary': '0', 'includeNoSalaryJobs': 'true',
+                      'radius': '100', 'cityId': '-1'}
+            search_url = f"https://www.glassdoor.com/Job/jobs.htm?{urlencode(params)}"
             
             self.driver.get(search_url)
             time.sleep(3)
@@ -68,23 +83,26 @@ class GlassdoorJobScraper:
             self._scroll_and_load_jobs()
             
             # Extract job information
-            job_elements = self.driver.find_elements(By.CSS_SELECTOR, "[data-test='jobListing']")
-            
-            for job_element in job_elements:
-                try:
-                    job_data = self._extract_job_data_selenium(job_element)
-                    if job_data:
-                        jobs.append(job_data)
-                except Exception as e:
-                    logger.warning(f"Failed to extract job data: {str(e)}")
-                    continue
+            with metrics.timer("parse_page", source="Glassdoor"):
+                job_elements = self.driver.find_elements(By.CSS_SELECTOR, "[data-test='jobListing']")
+                
+                for job_element in job_elements:
+                    try:
+                        job_data = self._extract_job_data_selenium(job_element)
+                        if job_data:
+                            job_data['search_keyword'] = keyword
+                            jobs.append(job_data)
+                    except Exception as e:
+                        logger.warning(f"Failed to extract job data: {str(e)}")
+                        continue
+            metrics.increment("pages_parsed", source="Glassdoor")
                     
         except Exception as e:
             logger.error(f"Error searching jobs for keyword '{keyword}': {str(e)}")
             
         return jobs
     
-    def search_jobs_requests(self, keyword: str) -> List[Dict]:
+    def search_jobs_requests(self, keyword: str, location: Optional[str] = None) -> List[Dict]:
         """Search for jobs using requests (for static content)"""
         jobs = []
         try:
@@ -92,8 +110,7 @@ class GlassdoorJobScraper:
             search_url = f"https://www.glassdoor.com/Job/jobs.htm"
             params = {
                 'sc.keyword': keyword,
-                'locT': 'C',
-                'locId': '1157405',  # Bangalore location ID
+                **self._location_params(location or self.config.LOCATION),
                 'jobType': '',
                 'fromAge': '1',  # Last 24 hours
                 'minSalary': '0',
@@ -102,22 +119,27 @@ class GlassdoorJobScraper:
                 'cityId': '-1'
             }
             
-            response = self.session.get(search_url, params=params)
+            with metrics.timer("http_request", source="Glassdoor"):
+                response = self.session.get(search_url, params=params)
+            metrics.increment("http_responses", source="Glassdoor", status=response.status_code)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find job listings
-            job_elements = soup.find_all('div', {'data-test': 'jobListing'})
-            
-            for job_element in job_elements:
-                try:
-                    job_data = self._extract_job_data_requests(job_element)
-                    if job_data:
-                        jobs.append(job_data)
-                except Exception as e:
-                    logger.warning(f"Failed to extract job data: {str(e)}")
-                    continue
+            with metrics.timer("parse_page", source="Glassdoor"):
+                soup = BeautifulSoup(response.content, self.config.HTML_PARSER)
+                
+                # Find job listings
+                job_elements = soup.find_all('div', {'data-test': 'jobListing'})
+                
+                for job_element in job_elements:
+                    try:
+                        job_data = self._extract_job_data_requests(job_element)
+                        if job_data:
+                            job_data['search_keyword'] = keyword
+                            jobs.append(job_data)
+                    except Exception as e:
+                        logger.warning(f"Failed to extract job data: {str(e)}")
+                        continue
+            metrics.increment("pages_parsed", source="Glassdoor")
                     
         except Exception as e:
             logger.error(f"Error searching jobs for keyword '{keyword}': {str(e)}")
@@ -242,25 +264,29 @@ class GlassdoorJobScraper:
             logger.warning(f"Failed to extract job data: {str(e)}")
             return None
     
-    def search_all_keywords(self) -> List[Dict]:
-        """Search for jobs using all configured keywords"""
+    def search_all_keywords(self, queries: Optional[List[SearchQuery]] = None) -> List[Dict]:
+        """Search for jobs using all configured keywords (or the given (keyword, location) queries)"""
         all_jobs = []
+        queries = queries if queries is not None else search_queries(self.config)
         
-        # Try Selenium first, fallback to requests
+        # Try Selenium first (reusing a warm browser), fallback to requests
         try:
-            self.setup_driver()
+            if not self.driver:
+                self.setup_driver()
             use_selenium = True
         except Exception as e:
             logger.warning(f"Failed to setup Selenium driver: {str(e)}. Using requests method.")
             use_selenium = False
         
-        for keyword in self.config.JOB_KEYWORDS:
-            logger.info(f"Searching Glassdoor for jobs with keyword: {keyword}")
+        for keyword, location in queries:
+            logger.info(f"Searching Glassdoor for jobs with keyword: {keyword} in {location}")
             
-            if use_selenium:
-                jobs = self.search_jobs_selenium(keyword)
-            else:
-                jobs = self.search_jobs_requests(keyword)
+            with metrics.timer("scrape_keyword", source="Glassdoor", keyword=keyword):
+                if use_selenium:
+                    jobs = self.search_jobs_selenium(keyword, location)
+                else:
+                    jobs = self.search_jobs_requests(keyword, location)
+            metrics.increment("jobs_scraped", len(jobs), source="Glassdoor")
                 
             all_jobs.extend(jobs)
             
@@ -274,12 +300,12 @@ class GlassdoorJobScraper:
         return unique_jobs
     
     def _remove_duplicates(self, jobs: List[Dict]) -> List[Dict]:
-        """Remove duplicate jobs based on title and company"""
+        """Remove duplicate jobs based on title and canonical company"""
         seen = set()
         unique_jobs = []
         
         for job in jobs:
-            key = (job.get("title", "").lower(), job.get("company", "").lower())
+            key = (job.get("title", "").lower(), company_key(job.get("company", "")))
             if key not in seen:
                 seen.add(key)
                 unique_jobs.append(job)
@@ -290,6 +316,7 @@ class GlassdoorJobScraper:
         """Close the browser"""
         if self.driver:
             self.driver.quit()
+            self.driver = None
 
 if __name__ == "__main__":
     scraper = GlassdoorJobScraper()
@@ -1,3 +1,4 @@
+import re
 import time
 import json
 import logging
@@ -5,21 +6,23 @@ import requests
 import random
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+import metrics
+from http_cache import PageValidators, accept_encoding, mount_cache
+from company_normalizer import company_key
+from checkpoint_store import IncompleteResult
+from location_matcher import get_location_matcher
+from search_profiles import SearchQuery, search_queries
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Text naming pay; "rs" only as a word, so "years" doesn't count
+SALARY_TEXT_PATTERN = re.compile(r'lpa|lakh|₹|(?<![a-z])rs\b')
+
 class GlassdoorScraperFixed:
-    def __init__(self):
-        self.config = Config()
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
         self.driver = None
         self.jobs = []
         
@@ -34,6 +37,8 @@ class GlassdoorScraperFixed:
         ]
         
         self._setup_session()
+        mount_cache(self.session, self.config)
+        self.page_validators = PageValidators('glassdoor', config=self.config)
         
     def _setup_session(self):
         """Setup session with anti-detection measures"""
@@ -44,14 +49,13 @@ class GlassdoorScraperFixed:
             'User-Agent': user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': accept_encoding(),
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Sec-Fetch-Dest': 'document',
             'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0'
+            'Sec-Fetch-Site': 'none'
         })
         
         # Add cookies to appear more like a real browser
@@ -62,6 +66,11 @@ class GlassdoorScraperFixed:
     
     def setup_driver(self):
         """Setup Chrome driver with enhanced anti-detection"""
+        # Only the browser fallback needs selenium; HTTP scraping starts without it
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from webdriver_manager.chrome import ChromeDriverManager
+        
         chrome_options = Options()
         
         # Basic options
@@ -105,65 +114,114 @@ class GlassdoorScraperFixed:
             logger.error(f"Failed to setup Chrome driver: {str(e)}")
             return False
     
-    def search_jobs_with_delays(self, keyword: str) -> List[Dict]:
-        """Search for jobs with proper delays and error handling"""
+    def _sleep(self, low: float, high: float):
+        """Randomized politeness delay, scaled by SCRAPE_DELAY_SCALE"""
+        delay = random.uniform(low, high) * self.config.SCRAPE_DELAY_SCALE
+        if delay > 0:
+            time.sleep(delay)
+    
+    def search_jobs_with_delays(self, keyword: str, location: Optional[str] = None) -> List[Dict]:
+        """Search for jobs with proper delays and error handling, over up to MAX_PAGES_PER_SEARCH pages
+        
+        A page that failed every retry (or an exception) makes the result an
+        IncompleteResult holding the jobs found before it.
+        """
         jobs = []
+        failed = False
+        location = location or self.config.LOCATION
         
         try:
-            # Use a more realistic search approach
-            search_url = f"https://www.glassdoor.com/Job/jobs.htm"
-            
-            # Build parameters more carefully
-            params = {
-                'sc.keyword': keyword,
-                'locT': 'C',
-                'locId': '1157405',  # Bangalore
-                'jobType': '',
-                'fromAge': '7',  # Last 7 days instead of 1
-                'minSalary': '0',
-                'includeNoSalaryJobs': 'true',
-                'radius': '100',
-                'cityId': '-1',
-                'suggestCount': '0',
-                'suggestChosen': 'false',
-                'clickSource': 'searchBtn'
-            }
-            
-            # Add random delay
-            time.sleep(random.uniform(2, 5))
-            
-            # Make request with retry logic
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    # Rotate user agent for each attempt
-                    self.session.headers['User-Agent'] = random.choice(self.user_agents)
-                    
-                    response = self.session.get(search_url, params=params, timeout=30)
-                    
-                    if response.status_code == 200:
-                        jobs = self._parse_jobs_from_html(response.text, keyword)
-                        break
-                    elif response.status_code == 403:
-                        logger.warning(f"403 Forbidden on attempt {attempt + 1}. Waiting...")
-                        time.sleep(random.uniform(10, 20))  # Wait longer for 403
-                        continue
-                    else:
-                        logger.warning(f"Unexpected status code: {response.status_code}")
-                        time.sleep(random.uniform(5, 10))
-                        continue
-                        
-                except requests.exceptions.RequestException as e:
-                    logger.warning(f"Request failed on attempt {attempt + 1}: {str(e)}")
-                    time.sleep(random.uniform(5, 15))
-                    continue
+            for page in range(1, self.config.MAX_PAGES_PER_SEARCH + 1):
+                page_jobs = self._search_page(keyword, page, location)
+                if isinstance(page_jobs, IncompleteResult):
+                    failed = True
+                    break
+                if not page_jobs:
+                    break
+                jobs.extend(page_jobs)
             
             if not jobs:
-                logger.warning(f"No jobs found for keyword '{keyword}' after {max_retries} attempts")
+                logger.warning(f"No jobs found for keyword '{keyword}'")
                 
         except Exception as e:
             logger.error(f"Error searching jobs for keyword '{keyword}': {str(e)}")
-            
+            failed = True
+        
+        self.page_validators.save()
+        return IncompleteResult(jobs) if failed else jobs
+    
+    def _location_params(self, location: str) -> Dict[str, str]:
+        """Glassdoor location parameters: the gazetteer's Glassdoor city id when it has one, else the location as text"""
+        city = get_location_matcher().city(location)
+        if city and city.get('glassdoor_loc_id'):
+            return {'locT': 'C', 'locId': city['glassdoor_loc_id']}
+        return {'locKeyword': location}
+    
+    def _search_page(self, keyword: str, page: int, location: Optional[str] = None) -> List[Dict]:
+        """Fetch and parse one result page, retrying 403s and transient errors (an empty IncompleteResult if every attempt failed)"""
+        jobs = IncompleteResult()
+        
+        # Use a more realistic search approach
+        search_url = f"{self.config.GLASSDOOR_BASE_URL}/Job/jobs.htm"
+        
+        # Build parameters more carefully
+        params = {
+            'sc.keyword': keyword,
+            **self._location_params(location or self.config.LOCATION),
+            'jobType': '',
+            'fromAge': '7',  # Last 7 days instead of 1
+            'minSalary': '0',
+            'includeNoSalaryJobs': 'true',
+            'radius': '100',
+            'cityId': '-1',
+            'suggestCount': '0',
+            'suggestChosen': 'false',
+            'clickSource': 'searchBtn',
+            'p': str(page)
+        }
+        
+        # Add random delay
+        self._sleep(2, 5)
+        
+        # Make request with retry logic (conditional if the page was fetched before)
+        page_key = self.page_validators.key(search_url, params)
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                # Rotate user agent for each attempt
+                self.session.headers['User-Agent'] = random.choice(self.user_agents)
+                
+                with metrics.timer("http_request", source="Glassdoor"):
+                    response = self.session.get(search_url, params=params, headers=self.page_validators.headers(page_key),
+                                                timeout=30)
+                metrics.increment("http_responses", source="Glassdoor", status=response.status_code)
+                
+                reused = self.page_validators.reuse(page_key, response)
+                if reused is not None:
+                    # Unchanged since it was last parsed
+                    jobs = reused
+                    metrics.increment("pages_not_modified", source="Glassdoor")
+                    break
+                elif response.status_code == 200:
+                    with metrics.timer("parse_page", source="Glassdoor"):
+                        jobs = self._parse_jobs_from_html(response.text, keyword)
+                    metrics.increment("pages_parsed", source="Glassdoor")
+                    self.page_validators.remember(page_key, response, jobs)
+                    break
+                elif response.status_code == 403:
+                    logger.warning(f"403 Forbidden on attempt {attempt + 1}. Waiting...")
+                    self._sleep(10, 20)  # Wait longer for 403
+                    continue
+                else:
+                    logger.warning(f"Unexpected status code: {response.status_code}")
+                    self._sleep(5, 10)
+                    continue
+                    
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Request failed on attempt {attempt + 1}: {str(e)}")
+                self._sleep(5, 15)
+                continue
+        
         return jobs
     
     def _parse_jobs_from_html(self, html_content: str, keyword: str) -> List[Dict]:
@@ -171,7 +229,7 @@ class GlassdoorScraperFixed:
         jobs = []
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, self.config.HTML_PARSER)
             
             # Look for job listings - Glassdoor uses different selectors
             job_selectors = [
@@ -209,6 +267,15 @@ class GlassdoorScraperFixed:
         
         return jobs
     
+    def _parse_job_description_from_html(self, html_content: str) -> str:
+        """Parse the full description from a Glassdoor job detail page"""
+        soup = BeautifulSoup(html_content, self.config.HTML_PARSER)
+        return self._extract_text_by_selectors(soup, [
+            '[data-test="jobDescriptionText"]',
+            '.jobDescriptionContent',
+            '#JobDescriptionContainer'
+        ])
+    
     def _extract_job_data_from_element(self, job_element) -> Optional[Dict]:
         """Extract job data from a job element"""
         try:
@@ -250,11 +317,11 @@ class GlassdoorScraperFixed:
             if link_element:
                 url = link_element['href']
                 if url and not url.startswith('http'):
-                    url = f"https://www.glassdoor.com{url}"
+                    url = f"{self.config.GLASSDOOR_BASE_URL}{url}"
             
             # Extract salary if available
             salary = ""
-            salary_element = job_element.find(text=lambda text: text and ('lpa' in text.lower() or 'lakh' in text.lower() or 'rs' in text.lower()))
+            salary_element = job_element.find(text=lambda text: text and SALARY_TEXT_PATTERN.search(text.lower()))
             if salary_element:
                 salary = str(salary_element).strip()
             
@@ -287,37 +354,47 @@ class GlassdoorScraperFixed:
                 continue
         return ""
     
-    def search_all_keywords(self) -> List[Dict]:
-        """Search for jobs using all configured keywords with proper delays"""
+    def search_all_keywords(self, queries: Optional[List[SearchQuery]] = None) -> List[Dict]:
+        """Search for jobs using all configured keywords (or the given (keyword, location) queries) with proper delays
+        
+        An IncompleteResult if any search failed, so the run checkpoints Glassdoor as unfinished.
+        """
         all_jobs = []
+        failed = []
+        queries = queries if queries is not None else search_queries(self.config)
         
         logger.info("Starting Glassdoor search with anti-detection measures...")
         
-        for i, keyword in enumerate(self.config.JOB_KEYWORDS):
-            logger.info(f"Searching Glassdoor for jobs with keyword: {keyword} ({i+1}/{len(self.config.JOB_KEYWORDS)})")
+        for i, (keyword, location) in enumerate(queries):
+            logger.info(f"Searching Glassdoor for jobs with keyword: {keyword} in {location} ({i+1}/{len(queries)})")
             
-            jobs = self.search_jobs_with_delays(keyword)
+            with metrics.timer("scrape_keyword", source="Glassdoor", keyword=keyword):
+                jobs = self.search_jobs_with_delays(keyword, location)
+            metrics.increment("jobs_scraped", len(jobs), source="Glassdoor")
+            if isinstance(jobs, IncompleteResult):
+                failed.append(keyword)
             all_jobs.extend(jobs)
             
             # Add delay between searches to avoid rate limiting
-            if i < len(self.config.JOB_KEYWORDS) - 1:
-                delay = random.uniform(10, 20)  # 10-20 seconds between searches
-                logger.info(f"Waiting {delay:.1f} seconds before next search...")
-                time.sleep(delay)
+            if i < len(queries) - 1:
+                self._sleep(10, 20)  # 10-20 seconds between searches
         
         # Remove duplicates
         unique_jobs = self._remove_duplicates(all_jobs)
         logger.info(f"Found {len(unique_jobs)} unique jobs from Glassdoor")
+        if failed:
+            logger.warning(f"Glassdoor searches failed for: {', '.join(failed)}")
+            return IncompleteResult(unique_jobs)
         
         return unique_jobs
     
     def _remove_duplicates(self, jobs: List[Dict]) -> List[Dict]:
-        """Remove duplicate jobs based on title and company"""
+        """Remove duplicate jobs based on title and canonical company"""
         seen = set()
         unique_jobs = []
         
         for job in jobs:
-            key = (job.get("title", "").lower(), job.get("company", "").lower())
+            key = (job.get("title", "").lower(), company_key(job.get("company", "")))
             if key not in seen:
                 seen.add(key)
                 unique_jobs.append(job)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Offline HTML fixture corpus for the LinkedIn, Indeed and Glassdoor parsers
+
+The pages mirror the markup each scraper's selectors target, wrapped in the
+navigation, inline scripts and tracking markup real result pages carry.
+Running this module regenerates fixtures/html/ deterministically; captured
+pages can be dropped into the same directories alongside them.
+"""
+
+import os
+import glob
+import random
+import argparse
+from html import escape
+from typing import Dict, List
+from synthetic_jobs import SyntheticJobGenerator
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html")
+SITES = ["linkedin", "indeed", "glassdoor"]
+RESULTS_PER_PAGE = {"linkedin": 25, "indeed": 15, "glassdoor": 30}
+
+def fixture_paths(site: str, kind: str = "search") -> List[str]:
+    """Sorted fixture files for a site; kind is 'search' or 'detail'"""
+    return sorted(glob.glob(os.path.join(FIXTURE_DIR, site, f"{kind}_*.html")))
+
+def load_fixture_pages(site: str, kind: str = "search") -> List[str]:
+    """Contents of every fixture page of one kind for a site"""
+    pages = []
+    for path in fixture_paths(site, kind):
+        with open(path, "r", encoding="utf-8") as f:
+            pages.append(f.read())
+    return pages
+
+def _page_shell(title: str, body: str, rng: random.Random) -> str:
+    """Wrap content in the boilerplate that dominates real page weight"""
+    nav_links = "".join(
+        f'<li class="nav-item"><a href="/nav/{i}" data-tracking="nav-{i}">Link {i}</a></li>' for i in range(40)
+    )
+    state_blob = ",".join(
+        f'"k{i}":{{"id":{rng.randint(1, 10 ** 9)},"flags":[{rng.randint(0, 9)},{rng.randint(0, 9)}],"label":"item-{i}"}}'
+        for i in range(300)
+    )
+    return (
+        "<!DOCTYPE html><html lang=\"en\"><head><meta charset=\"utf-8\">"
+        f"<title>{escape(title)}</title>"
+        "<link rel=\"stylesheet\" href=\"/static/app.css\">"
+        "<style>.hidden{display:none}.job-card{margin:0}</style>"
+        "</head><body>"
+        f"<header class=\"global-nav\"><ul class=\"nav-list\">{nav_links}</ul></header>"
+        f"<main id=\"main\">{body}</main>"
+        "<footer class=\"footer\"><p>&copy; Example footer</p></footer>"
+        f"<script type=\"application/json\" id=\"initial-state\">{{{state_blob}}}</script>"
+        "<script src=\"/static/app.js\"></script>"
+        "</body></html>"
+    )
+
+def _indeed_card(job: Dict, index: int) -> str:
+    """Indeed mosaic result card"""
+    job_key = job.get('job_id') or f"{index:016x}"
+    salary = f'<div class="salary-snippet"><span>{escape(job["salary"])}</span></div>' if job['salary'] else ''
+    snippet = escape(job['description'][:180])
+    return (
+        f'<div class="job_seen_beacon cardOutline" data-jk="{job_key}">'
+        '<table class="jobCard_mainContent"><tbody><tr><td class="resultContent">'
+        f'<h2 class="jobTitle"><a class="jcs-JobTitle" data-jk="{job_key}" href="/rc/clk?jk={job_key}&amp;from=serp">'
+        f'<span title="{escape(job["title"])}">{escape(job["title"])}</span></a></h2>'
+        f'<span class="companyName">{escape(job["company"])}</span>'
+        f'<div class="companyLocation">{escape(job["location"])}</div>'
+        f'{salary}'
+        '</td></tr></tbody></table>'
+        f'<div class="job-snippet"><ul><li>{snippet}</li></ul></div>'
+        f'<span class="date">{escape(job["posted_date"] or "Today")}</span>'
+        '</div>'
+    )
+
+def _glassdoor_card(job: Dict, index: int) -> str:
+    """Glassdoor job listing"""
+    salary = f'<div data-test="detailSalary" class="salary-estimate">{escape(job["salary"])}</div>' if job['salary'] else ''
+    return (
+        f'<li class="react-job-listing" data-test="jobListing" data-id="{1000000 + index}">'
+        f'<div class="d-flex"><a data-test="job-link" href="/partner/jobListing.htm?jobListingId={1000000 + index}">'
+        f'<div data-test="job-title" class="jobTitle">{escape(job["title"])}</div></a>'
+        f'<div data-test="employer-name" class="employerName">{escape(job["company"])}</div>'
+        f'<div data-test="job-location" class="location">{escape(job["location"])}</div>'
+        f'{salary}'
+        f'<div data-test="job-age">{escape(job["posted_date"] or "24h")}</div>'
+        '</div></li>'
+    )
+
+def _linkedin_card(job: Dict, index: int) -> str:
+    """LinkedIn jobs search list item"""
+    return (
+        f'<li class="jobs-search-results__list-item occludable-update" data-occludable-job-id="{3700000000 + index}">'
+        '<div class="job-card-container job-card-list">'
+        f'<a class="job-card-list__title job-card-list__title-link" href="https://www.linkedin.com/jobs/view/{3700000000 + index}/">'
+        f'{escape(job["title"])}</a>'
+        f'<div class="job-card-container__company-name">{escape(job["company"])}</div>'
+        f'<ul class="job-card-container__metadata-wrapper"><li class="job-card-container__metadata-item">{escape(job["location"])}</li></ul>'
+        f'<time datetime="{escape(job["posted_date"][:10])}">recently</time>'
+        '</div></li>'
+    )
+
+def _detail_page(site: str, job: Dict, rng: random.Random) -> str:
+    """Job detail page with the full description"""
+    paragraphs = "".join(f"<p>{escape(job['description'])}</p>" for _ in range(4))
+    description_markup = {
+        'linkedin': f'<div class="jobs-description-content__text"><span>{paragraphs}</span></div>',
+        'indeed': f'<div id="jobDescriptionText" class="jobsearch-jobDescriptionText">{paragraphs}</div>',
+        'glassdoor': f'<div class="jobDescriptionContent desc" data-test="jobDescriptionText">{paragraphs}</div>'
+    }[site]
+    body = (
+        f'<section class="top-card"><h1>{escape(job["title"])}</h1><h2>{escape(job["company"])}</h2>'
+        f'<span>{escape(job["location"])}</span></section>{description_markup}'
+    )
+    return _page_shell(f"{job['title']} - {job['company']}", body, rng)
+
+def build_fixtures(pages_per_site: int = 3, details_per_site: int = 2, seed: int = 2024) -> List[str]:
+    """Render the fixture corpus to FIXTURE_DIR"""
+    rng = random.Random(seed)
+    written = []
+    card_renderers = {'linkedin': _linkedin_card, 'indeed': _indeed_card, 'glassdoor': _glassdoor_card}
+    list_wrappers = {
+        'linkedin': ('<ul class="jobs-search-results__list list-style-none">', '</ul>'),
+        'indeed': ('<div id="mosaic-provider-jobcards"><ul class="jobsearch-ResultsList">', '</ul></div>'),
+        'glassdoor': ('<ul class="hover JobsList_jobsList" data-test="jobListings">', '</ul>')
+    }
+
+    for site_index, site in enumerate(SITES):
+        site_dir = os.path.join(FIXTURE_DIR, site)
+        os.makedirs(site_dir, exist_ok=True)
+        per_page = RESULTS_PER_PAGE[site]
+        generator = SyntheticJobGenerator(seed=seed + site_index)
+        jobs = generator.generate_list(per_page * pages_per_site)
+        for job in jobs:
+            job['source'] = {'linkedin': 'LinkedIn', 'indeed': 'Indeed', 'glassdoor': 'Glassdoor'}[site]
+
+        for page in range(pages_per_site):
+            page_jobs = jobs[page * per_page:(page + 1) * per_page]
+            opening, closing = list_wrappers[site]
+            cards = "".join(card_renderers[site](job, page * per_page + i) for i, job in enumerate(page_jobs))
+            body = f'<div class="results-context"><h1>{len(jobs)} results</h1></div>{opening}{cards}{closing}'
+            path = os.path.join(site_dir, f"search_{page + 1}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(_page_shell(f"{site} jobs page {page + 1}", body, rng))
+            written.append(path)
+
+        for detail in range(details_per_site):
+            path = os.path.join(site_dir, f"detail_{detail + 1}.html")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(_detail_page(site, jobs[detail], rng))
+            written.append(path)
+
+    return written
+
+def main():
+    """Regenerate the fixture corpus"""
+    parser = argparse.ArgumentParser(description="Build the offline HTML fixture corpus")
+    parser.add_argument("--pages", type=int, default=3, help="Search result pages per site")
+    parser.add_argument("--details", type=int, default=2, help="Detail pages per site")
+    parser.add_argument("--seed", type=int, default=2024)
+    args = parser.parse_args()
+
+    for path in build_fixtures(args.pages, args.details, args.seed):
+        print(f"Wrote {os.path.relpath(path)}")
+
+if __name__ == "__main__":
+    main()
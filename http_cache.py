@@ -0,0 +1,311 @@
+import io
+import os
+import copy
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3 import HTTPResponse
+from urllib3.util.request import ACCEPT_ENCODING
+import metrics
+from config import Config, output_path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# off: no cache; record: serve fresh entries, revalidate stale ones and store
+# what is fetched; replay: serve only from the store (misses get a 504);
+# refresh: always fetch and overwrite the store
+CACHE_MODES = ('off', 'record', 'replay', 'refresh')
+
+# Headers describing the body as sent; stored bodies are already decoded
+TRANSFER_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+def accept_encoding() -> str:
+    """Accept-Encoding naming only codings urllib3 can decode here (br needs brotli installed)"""
+    return ', '.join(ACCEPT_ENCODING.split(','))
+
+def _client_validates(request: requests.PreparedRequest, entry: Dict) -> bool:
+    """Whether the request's own If-None-Match / If-Modified-Since already names the entry's version"""
+    headers = CaseInsensitiveDict(entry['headers'])
+    etag, modified = headers.get('ETag'), headers.get('Last-Modified')
+    return bool(etag and request.headers.get('If-None-Match') == etag) or \
+        bool(modified and request.headers.get('If-Modified-Since') == modified)
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """Store key of a request: its method and full URL"""
+    return hashlib.sha256(f"{request.method} {request.url}".encode('utf-8')).hexdigest()
+
+def _served(response: requests.Response, content: bytes) -> requests.Response:
+    """Give a response built from the store its body, readable whole or streamed (stream=True, iter_content)"""
+    response._content = content
+    response._content_consumed = True
+    response.raw = HTTPResponse(body=io.BytesIO(content), headers=dict(response.headers), status=response.status_code,
+                                reason=response.reason, preload_content=False, decode_content=False)
+    return response
+
+class HttpCacheStore:
+    """On-disk responses: bodies stored once by content hash, one small JSON entry per request"""
+
+    def __init__(self, directory: Optional[str] = None, config: Optional[Config] = None):
+        self.config = config or Config()
+        self.directory = directory or output_path(self.config, 'HTTP_CACHE_DIR')
+        self.entries_dir = os.path.join(self.directory, 'entries')
+        self.bodies_dir = os.path.join(self.directory, 'bodies')
+        os.makedirs(self.entries_dir, exist_ok=True)
+        os.makedirs(self.bodies_dir, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.entries_dir, f"{key}.json")
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.bodies_dir, digest[:2], digest)
+
+    def _write(self, path: str, data: bytes):
+        """Write atomically, so a crashed run never leaves a torn entry"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """The stored entry with its body under 'content', or None"""
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(self._body_path(entry['digest']), 'rb') as f:
+                entry['content'] = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry
+
+    def put(self, key: str, response: requests.Response) -> Dict:
+        """Store a response (its decoded body once per distinct content)"""
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        body_path = self._body_path(digest)
+        if not os.path.exists(body_path):
+            self._write(body_path, content)
+        entry = {
+            'url': response.url,
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {name: value for name, value in response.headers.items() if name.lower() not in TRANSFER_HEADERS},
+            'digest': digest,
+            'stored_at': time.time()
+        }
+        self._write(self._entry_path(key), json.dumps(entry).encode('utf-8'))
+        entry['content'] = content
+        return entry
+
+    def prune(self, max_age_days: float) -> int:
+        """Delete entries stored more than max_age_days ago and the bodies no entry uses; returns entries removed"""
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        referenced = set()
+        for name in os.listdir(self.entries_dir):
+            path = os.path.join(self.entries_dir, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                stored_at, digest = entry['stored_at'], entry['digest']
+            except (OSError, ValueError, KeyError):
+                stored_at, digest = os.path.getmtime(path), None
+            if stored_at < cutoff:
+                os.remove(path)
+                removed += 1
+            elif digest:
+                referenced.add(digest)
+        # Recent unreferenced bodies may belong to an entry another session is writing
+        for shard in os.listdir(self.bodies_dir):
+            shard_dir = os.path.join(self.bodies_dir, shard)
+            for digest in os.listdir(shard_dir):
+                path = os.path.join(shard_dir, digest)
+                if digest not in referenced and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            if not os.listdir(shard_dir):
+                os.rmdir(shard_dir)
+        if removed:
+            logger.info(f"Removed {removed} HTTP cache entries older than {max_age_days:g} days")
+        return removed
+
+    def touch(self, key: str, entry: Dict) -> Dict:
+        """Mark an entry fresh again after the server confirmed it unchanged"""
+        entry['stored_at'] = time.time()
+        stored = {name: value for name, value in entry.items() if name != 'content'}
+        self._write(self._entry_path(key), json.dumps(stored).encode('utf-8'))
+        return entry
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter answering GETs from an HttpCacheStore according to the cache mode
+
+    Stale entries with an ETag or Last-Modified are revalidated with a
+    conditional request; a 304 renews the entry without a body transfer.
+    Conditional requests the caller makes itself get a 304 when they name
+    the stored version. Served responses carry from_cache = True.
+    """
+
+    def __init__(self, store: HttpCacheStore, mode: str = 'record', ttl: float = 3600, **kwargs):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown HTTP cache mode '{mode}' (choose from: {', '.join(CACHE_MODES)})")
+        super().__init__(**kwargs)
+        self.store = store
+        self.mode = mode
+        self.ttl = ttl
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.mode == 'off' or request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        key = request_key(request)
+        entry = self.store.get(key) if self.mode != 'refresh' else None
+        if self.mode == 'replay':
+            metrics.increment("http_cache", result="hit" if entry else "miss")
+            return self._build(request, entry) if entry else self._miss(request)
+        if entry and time.time() - entry['stored_at'] <= self.ttl:
+            metrics.increment("http_cache", result="hit")
+            return self._build(request, entry)
+
+        original = request
+        if entry:
+            request = request.copy()
+            headers = CaseInsensitiveDict(entry['headers'])
+            for validator, conditional in (('ETag', 'If-None-Match'), ('Last-Modified', 'If-Modified-Since')):
+                if headers.get(validator):
+                    request.headers[conditional] = headers[validator]
+        response = super().send(request, **kwargs)
+
+        if entry and response.status_code == 304:
+            metrics.increment("http_cache", result="revalidated")
+            return self._build(original, self.store.touch(key, entry))
+        metrics.increment("http_cache", result="stored" if response.status_code == 200 else "uncacheable")
+        if response.status_code == 200 and 'no-store' not in response.headers.get('Cache-Control', ''):
+            self.store.put(key, response)
+        return response
+
+    def _build(self, request: requests.PreparedRequest, entry: Dict) -> requests.Response:
+        """A Response for a stored entry (a bodiless 304 if the request already has its version)"""
+        not_modified = _client_validates(request, entry)
+        response = requests.Response()
+        response.status_code = 304 if not_modified else entry['status']
+        response.reason = 'Not Modified' if not_modified else entry['reason']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = entry['url']
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return _served(response, b'' if not_modified else entry['content'])
+
+    def _miss(self, request: requests.PreparedRequest) -> requests.Response:
+        """Replay miss: 504, as for a request only-if-cached"""
+        logger.warning(f"HTTP cache replay miss: {request.url}")
+        response = requests.Response()
+        response.status_code = 504
+        response.reason = 'Not in HTTP cache'
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+        return _served(response, b'')
+
+class PageValidators:
+    """ETag / Last-Modified of each result page a scraper fetched, with the jobs parsed from it
+
+    Persisted between runs, so the next request for a page can be
+    conditional and a 304 reuses the jobs without downloading or parsing
+    the page again. Pages not seen within PAGE_VALIDATORS_MAX_AGE_DAYS are
+    dropped on load, and saving keeps the PAGE_VALIDATORS_MAX_PAGES most
+    recently seen.
+    """
+
+    def __init__(self, name: str, directory: Optional[str] = None, config: Optional[Config] = None):
+        self.config = config or Config()
+        directory = directory or output_path(self.config, 'PAGE_VALIDATORS_DIR')
+        self.path = os.path.join(directory, f"{name}.json")
+        self.lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                pages: Dict[str, Dict] = json.load(f)
+        except (OSError, ValueError):
+            pages = {}
+        cutoff = time.time() - self.config.PAGE_VALIDATORS_MAX_AGE_DAYS * 86400
+        self.pages = {key: page for key, page in pages.items() if page.get('seen_at', 0) >= cutoff}
+        self.changed = len(self.pages) < len(pages)
+
+    def key(self, url: str, params: Optional[Dict] = None) -> str:
+        """The page's full URL"""
+        return requests.Request('GET', url, params=params).prepare().url
+
+    def headers(self, key: str) -> Dict[str, str]:
+        """Conditional request headers for a page seen before (none when CONDITIONAL_REQUESTS is off)"""
+        page = self.pages.get(key)
+        if not page or not self.config.CONDITIONAL_REQUESTS:
+            return {}
+        headers = {}
+        if page.get('etag'):
+            headers['If-None-Match'] = page['etag']
+        if page.get('last_modified'):
+            headers['If-Modified-Since'] = page['last_modified']
+        return headers
+
+    def reuse(self, key: str, response: requests.Response) -> Optional[List[Dict]]:
+        """The page's stored jobs if the response is a 304 for it, else None"""
+        page = self.pages.get(key)
+        if response.status_code != 304 or page is None:
+            return None
+        with self.lock:
+            page['seen_at'] = time.time()
+            self.changed = True
+        return copy.deepcopy(page['jobs'])
+
+    def remember(self, key: str, response: requests.Response, jobs: List[Dict]):
+        """Keep a 200 page's validators and parsed jobs (pages without validators are forgotten)"""
+        etag, modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        with self.lock:
+            if etag or modified:
+                self.pages[key] = {'etag': etag, 'last_modified': modified, 'jobs': copy.deepcopy(jobs), 'seen_at': time.time()}
+                self.changed = True
+            elif self.pages.pop(key, None) is not None:
+                self.changed = True
+
+    def save(self):
+        """Write the validators out if any changed"""
+        with self.lock:
+            if not self.changed:
+                return
+            if len(self.pages) > self.config.PAGE_VALIDATORS_MAX_PAGES:
+                recent = sorted(self.pages.items(), key=lambda item: item[1]['seen_at'], reverse=True)
+                self.pages = dict(recent[:self.config.PAGE_VALIDATORS_MAX_PAGES])
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.pages, f)
+            os.replace(tmp_path, self.path)
+            self.changed = False
+
+def mount_cache(session: requests.Session, config: Optional[Config] = None) -> requests.Session:
+    """Route a session's HTTP(S) requests through the cache, per HTTP_CACHE_MODE (off leaves it alone)
+
+    Modes that write to the store first prune entries older than
+    HTTP_CACHE_RETENTION_DAYS; replay leaves a recorded store intact.
+    """
+    config = config or Config()
+    if config.HTTP_CACHE_MODE == 'off':
+        return session
+    store = HttpCacheStore(config=config)
+    if config.HTTP_CACHE_MODE in ('record', 'refresh'):
+        try:
+            store.prune(config.HTTP_CACHE_RETENTION_DAYS)
+        except OSError as e:
+            logger.warning(f"Failed to prune HTTP cache: {str(e)}")
+    adapter = CachingAdapter(store, config.HTTP_CACHE_MODE, config.HTTP_CACHE_TTL)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
@@ -5,14 +5,19 @@ import requests
 import random
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
+import metrics
+from http_cache import PageValidators, accept_encoding, mount_cache
+from company_normalizer import company_key
+from checkpoint_store import IncompleteResult
+from search_profiles import SearchQuery, search_queries
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class IndeedScraper:
-    def __init__(self):
-        self.config = Config()
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
         self.jobs = []
         
         # Setup session with proper headers
@@ -24,6 +29,8 @@ class IndeedScraper:
         ]
         
         self._setup_session()
+        mount_cache(self.session, self.config)
+        self.page_validators = PageValidators('indeed', config=self.config)
         
     def _setup_session(self):
         """Setup session with proper headers"""
@@ -33,56 +40,86 @@ class IndeedScraper:
             'User-Agent': user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': accept_encoding(),
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
             'Sec-Fetch-Dest': 'document',
             'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0'
+            'Sec-Fetch-Site': 'none'
         })
     
-    def search_jobs(self, keyword: str) -> List[Dict]:
-        """Search for jobs on Indeed"""
+    def _sleep(self, low: float, high: float):
+        """Randomized politeness delay, scaled by SCRAPE_DELAY_SCALE"""
+        delay = random.uniform(low, high) * self.config.SCRAPE_DELAY_SCALE
+        if delay > 0:
+            time.sleep(delay)
+    
+    def search_jobs(self, keyword: str, location: Optional[str] = None) -> List[Dict]:
+        """Search for jobs on Indeed, following up to MAX_PAGES_PER_SEARCH result pages
+        
+        A page that failed (an error status or exception) makes the result an
+        IncompleteResult holding the jobs found before it.
+        """
         jobs = []
+        failed = False
+        location = location or self.config.LOCATION
         
         try:
             # Indeed search URL
-            search_url = "https://in.indeed.com/jobs"
-            
-            # Build parameters
-            params = {
-                'q': keyword,
-                'l': self.config.LOCATION,
-                'fromage': '7',  # Last 7 days
-                'sort': 'date',  # Sort by date
-                'start': '0'     # Start from first page
-            }
-            
-            # Add delay
-            time.sleep(random.uniform(2, 4))
-            
-            # Make request
-            response = self.session.get(search_url, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                jobs = self._parse_jobs_from_html(response.text, keyword)
-                logger.info(f"Found {len(jobs)} jobs for keyword '{keyword}'")
-            else:
-                logger.warning(f"Indeed returned status code: {response.status_code}")
+            search_url = f"{self.config.INDEED_BASE_URL}/jobs"
+            
+            for page in range(self.config.MAX_PAGES_PER_SEARCH):
+                # Build parameters
+                params = {
+                    'q': keyword,
+                    'l': location,
+                    'fromage': '7',  # Last 7 days
+                    'sort': 'date',  # Sort by date
+                    'start': str(page * 10)  # Indeed pages in steps of 10
+                }
+                
+                # Add delay
+                self._sleep(2, 4)
+                
+                # Make request (conditional if the page was fetched before)
+                page_key = self.page_validators.key(search_url, params)
+                with metrics.timer("http_request", source="Indeed"):
+                    response = self.session.get(search_url, params=params, headers=self.page_validators.headers(page_key),
+                                                timeout=30)
+                metrics.increment("http_responses", source="Indeed", status=response.status_code)
+                
+                page_jobs = self.page_validators.reuse(page_key, response)
+                if page_jobs is not None:
+                    metrics.increment("pages_not_modified", source="Indeed")
+                elif response.status_code != 200:
+                    logger.warning(f"Indeed returned status code: {response.status_code}")
+                    failed = True
+                    break
+                else:
+                    with metrics.timer("parse_page", source="Indeed"):
+                        page_jobs = self._parse_jobs_from_html(response.text, keyword)
+                    metrics.increment("pages_parsed", source="Indeed")
+                    self.page_validators.remember(page_key, response, page_jobs)
+                if not page_jobs:
+                    break
+                jobs.extend(page_jobs)
+            
+            logger.info(f"Found {len(jobs)} jobs for keyword '{keyword}'")
                 
         except Exception as e:
             logger.error(f"Error searching Indeed for keyword '{keyword}': {str(e)}")
-            
-        return jobs
+            failed = True
+        
+        self.page_validators.save()
+        return IncompleteResult(jobs) if failed else jobs
     
     def _parse_jobs_from_html(self, html_content: str, keyword: str) -> List[Dict]:
         """Parse jobs from Indeed HTML content"""
         jobs = []
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, self.config.HTML_PARSER)
             
             # Indeed job selectors
             job_elements = soup.find_all('div', {'data-jk': True})
@@ -108,6 +145,12 @@ class IndeedScraper:
         
         return jobs
     
+    def _parse_job_description_from_html(self, html_content: str) -> str:
+        """Parse the full description from an Indeed job detail page"""
+        soup = BeautifulSoup(html_content, self.config.HTML_PARSER)
+        desc_element = soup.find(id='jobDescriptionText')
+        return desc_element.get_text(' ', strip=True) if desc_element else ""
+    
     def _extract_job_data_from_element(self, job_element) -> Optional[Dict]:
         """Extract job data from Indeed job element"""
         try:
@@ -147,7 +190,7 @@ class IndeedScraper:
             if link_element:
                 url = link_element['href']
                 if url and not url.startswith('http'):
-                    url = f"https://in.indeed.com{url}"
+                    url = f"{self.config.INDEED_BASE_URL}{url}"
             
             # Extract posted date
             posted_date = ""
@@ -181,37 +224,47 @@ class IndeedScraper:
         
         return None
     
-    def search_all_keywords(self) -> List[Dict]:
-        """Search for jobs using all configured keywords"""
+    def search_all_keywords(self, queries: Optional[List[SearchQuery]] = None) -> List[Dict]:
+        """Search for jobs using all configured keywords (or the given (keyword, location) queries)
+        
+        An IncompleteResult if any search failed, so the run checkpoints Indeed as unfinished.
+        """
         all_jobs = []
+        failed = []
+        queries = queries if queries is not None else search_queries(self.config)
         
         logger.info("Starting Indeed job search...")
         
-        for i, keyword in enumerate(self.config.JOB_KEYWORDS):
-            logger.info(f"Searching Indeed for jobs with keyword: {keyword} ({i+1}/{len(self.config.JOB_KEYWORDS)})")
+        for i, (keyword, location) in enumerate(queries):
+            logger.info(f"Searching Indeed for jobs with keyword: {keyword} in {location} ({i+1}/{len(queries)})")
             
-            jobs = self.search_jobs(keyword)
+            with metrics.timer("scrape_keyword", source="Indeed", keyword=keyword):
+                jobs = self.search_jobs(keyword, location)
+            metrics.increment("jobs_scraped", len(jobs), source="Indeed")
+            if isinstance(jobs, IncompleteResult):
+                failed.append(keyword)
             all_jobs.extend(jobs)
             
             # Add delay between searches
-            if i < len(self.config.JOB_KEYWORDS) - 1:
-                delay = random.uniform(5, 10)
-                logger.info(f"Waiting {delay:.1f} seconds before next search...")
-                time.sleep(delay)
+            if i < len(queries) - 1:
+                self._sleep(5, 10)
         
         # Remove duplicates
         unique_jobs = self._remove_duplicates(all_jobs)
         logger.info(f"Found {len(unique_jobs)} unique jobs from Indeed")
+        if failed:
+            logger.warning(f"Indeed searches failed for: {', '.join(failed)}")
+            return IncompleteResult(unique_jobs)
         
         return unique_jobs
     
     def _remove_duplicates(self, jobs: List[Dict]) -> List[Dict]:
-        """Remove duplicate jobs based on title and company"""
+        """Remove duplicate jobs based on title and canonical company"""
         seen = set()
         unique_jobs = []
         
         for job in jobs:
-            key = (job.get("title", "").lower(), job.get("company", "").lower())
+            key = (job.get("title", "").lower(), company_key(job.get("company", "")))
             if key not in seen:
                 seen.add(key)
                 unique_jobs.append(job)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Full-text index (SQLite FTS5) over the title, company and description of every job scraped
+
+    python job_index.py search 'python AND (django OR flask)' --source LinkedIn --from 2024-01-01
+    python job_index.py search '"machine learning" NOT senior' --limit 5
+    python job_index.py search 'title:devop*'
+    python job_index.py import job_reports/job_report_*.json
+    python job_index.py stats
+"""
+
+import os
+import glob
+import json
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from datetime import datetime
+from functools import cached_property
+from typing import Dict, Iterable, List, Optional
+from company_normalizer import company_key
+from config import Config, output_path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# jobs holds one row per posting; jobs_fts indexes its text columns and is
+# kept in step by triggers (an external-content FTS5 table stores no copy)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    job_key TEXT NOT NULL UNIQUE,
+    title TEXT,
+    company TEXT,
+    company_id TEXT,
+    location TEXT,
+    source TEXT,
+    sources TEXT,
+    url TEXT,
+    posted_date TEXT,
+    description TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    run_id TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_posted_date ON jobs(posted_date);
+CREATE INDEX IF NOT EXISTS jobs_source ON jobs(source);
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, company, description,
+    content='jobs', content_rowid='id',
+    tokenize='porter unicode61 remove_diacritics 1',
+    prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_after_insert AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, company, description)
+    VALUES (new.id, new.title, new.company, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_after_delete AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description)
+    VALUES ('delete', old.id, old.title, old.company, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_after_update AFTER UPDATE OF title, company, description ON jobs
+WHEN old.title IS NOT new.title OR old.company IS NOT new.company OR old.description IS NOT new.description
+BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, company, description)
+    VALUES ('delete', old.id, old.title, old.company, old.description);
+    INSERT INTO jobs_fts(rowid, title, company, description)
+    VALUES (new.id, new.title, new.company, new.description);
+END;
+"""
+
+# Seen again: refresh the text and last_seen, but keep when it was first seen and posted
+UPSERT = """
+INSERT INTO jobs (job_key, title, company, company_id, location, source, sources, url,
+                  posted_date, description, first_seen, last_seen, run_id)
+VALUES (:job_key, :title, :company, :company_id, :location, :source, :sources, :url,
+        :posted_date, :description, :seen, :seen, :run_id)
+ON CONFLICT(job_key) DO UPDATE SET
+    title = excluded.title,
+    company = excluded.company,
+    company_id = excluded.company_id,
+    location = COALESCE(excluded.location, jobs.location),
+    sources = COALESCE(excluded.sources, jobs.sources),
+    description = COALESCE(excluded.description, jobs.description),
+    last_seen = MAX(jobs.last_seen, excluded.last_seen),
+    run_id = excluded.run_id
+"""
+
+# bm25 weights for title, company and description matches
+RANK_WEIGHTS = (10.0, 5.0, 1.0)
+
+class JobIndex:
+    """Persistent full-text index of scraped jobs with ranked, filtered search"""
+
+    def __init__(self, path: Optional[str] = None, config: Optional[Config] = None):
+        self.config = config or Config()
+        self.path = path or output_path(self.config, 'JOB_INDEX_PATH')
+        self._connection = None
+        # The scheduler runs each search on a new thread; one at a time uses the connection
+        self._lock = threading.RLock()
+
+    @cached_property
+    def date_normalizer(self):
+        """Posted-date parser, imported on first use (it needs pandas)"""
+        from date_normalizer import DateNormalizer
+        return DateNormalizer()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Connection to the index, created with its schema on first use (usable from any thread, under _lock)"""
+        with self._lock:
+            if self._connection is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._connection = sqlite3.connect(self.path, check_same_thread=False)
+                self._connection.row_factory = sqlite3.Row
+                self._connection.execute("PRAGMA journal_mode=WAL")
+                self._connection.executescript(SCHEMA)
+            return self._connection
+
+    def close(self):
+        """Close the connection (reopened on next use)"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def add_jobs(self, jobs: List[Dict], run_id: Optional[str] = None, seen_at: Optional[datetime] = None) -> int:
+        """Insert new jobs and refresh ones seen before; returns how many were new"""
+        if not jobs:
+            return 0
+        seen_at = seen_at or datetime.now()
+        seen = seen_at.strftime('%Y-%m-%d')
+        posted = self.date_normalizer.resolve([job.get('posted_date') for job in jobs], seen_at)
+
+        rows = []
+        for job, posted_at in zip(jobs, posted):
+            rows.append({
+                'job_key': self.job_key(job),
+                'title': self._text(job.get('title')),
+                'company': self._text(job.get('company')),
+                'company_id': company_key(job.get('company')),
+                'location': self._text(job.get('location')),
+                'source': self._text(job.get('source')),
+                'sources': ', '.join(job['sources']) if job.get('sources') else None,
+                'url': self._text(job.get('url')),
+                # Boards without a usable date fall back to the day the job was first seen
+                'posted_date': posted_at.strftime('%Y-%m-%d') if posted_at else seen,
+                'description': self._text(job.get('description')),
+                'seen': seen,
+                'run_id': run_id
+            })
+
+        with self._lock, self.connection as connection:
+            before = connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            connection.executemany(UPSERT, rows)
+            after = connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        logger.info(f"Indexed {len(rows)} jobs ({after - before} new, {after} total)")
+        return after - before
+
+    def job_key(self, job: Dict) -> str:
+        """Stable identity of a posting: its URL, else source, title, location and canonical company"""
+        url = self._text(job.get('url'))
+        if url:
+            return url
+        parts = [self._text(job.get(field)) or '' for field in ('source', 'title', 'location')]
+        parts.append(company_key(job.get('company')))
+        return 'sha1:' + hashlib.sha1('\x1f'.join(parts).lower().encode('utf-8')).hexdigest()
+
+    def search(self, query: str, sources: Optional[Iterable[str]] = None, date_from: Optional[str] = None,
+               date_to: Optional[str] = None, limit: int = 20, offset: int = 0) -> List[Dict]:
+        """Best matches first for an FTS5 query
+
+        Supports words (stemmed), "exact phrases", prefix* terms, AND/OR/NOT,
+        NEAR(a b, 5) and column filters such as title:python. Dates are
+        inclusive YYYY-MM-DD bounds on the posted date.
+        """
+        sql = [
+            "SELECT jobs.*, bm25(jobs_fts, ?, ?, ?) AS rank,",
+            "       snippet(jobs_fts, 2, '[', ']', '...', 12) AS snippet",
+            "FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid",
+            "WHERE jobs_fts MATCH ?"
+        ]
+        params: List = [*RANK_WEIGHTS, query]
+        sources = list(sources or [])
+        if sources:
+            sql.append(f"AND jobs.source IN ({', '.join('?' * len(sources))})")
+            params.extend(sources)
+        if date_from:
+            sql.append("AND jobs.posted_date >= ?")
+            params.append(date_from)
+        if date_to:
+            sql.append("AND jobs.posted_date <= ?")
+            params.append(date_to)
+        sql.append("ORDER BY rank LIMIT ? OFFSET ?")
+        params.extend([limit, offset])
+
+        try:
+            with self._lock:
+                rows = self.connection.execute("\n".join(sql), params).fetchall()
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search query {query!r}: {e} (quote terms containing punctuation)") from e
+        results = []
+        for row in rows:
+            result = dict(row)
+            result['score'] = -result.pop('rank')
+            results.append(result)
+        return results
+
+    def stats(self) -> Dict:
+        """Indexed job counts overall and per source, and the posted date range"""
+        with self._lock:
+            total, first, last = self.connection.execute(
+                "SELECT COUNT(*), MIN(posted_date), MAX(posted_date) FROM jobs"
+            ).fetchone()
+            by_source = dict(self.connection.execute(
+                "SELECT COALESCE(source, ''), COUNT(*) FROM jobs GROUP BY source ORDER BY COUNT(*) DESC"
+            ).fetchall())
+        return {'jobs': total, 'posted_from': first, 'posted_to': last, 'by_source': by_source}
+
+    def import_reports(self, paths: Iterable[str]) -> int:
+        """Backfill from JSON reports written by ReportGenerator; returns how many jobs were new"""
+        added = 0
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+            try:
+                seen_at = datetime.fromisoformat(report.get('generated_at', ''))
+            except ValueError:
+                seen_at = datetime.fromtimestamp(os.path.getmtime(path))
+            run_id = os.path.splitext(os.path.basename(path))[0].replace('job_report_', '')
+            added += self.add_jobs(report.get('jobs', []), run_id=run_id, seen_at=seen_at)
+        return added
+
+    def optimize(self):
+        """Merge FTS5 index segments (worth running after large imports)"""
+        with self._lock, self.connection as connection:
+            connection.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('optimize')")
+
+    def _text(self, value) -> Optional[str]:
+        """Non-empty strings as they are, anything else as NULL"""
+        return value if isinstance(value, str) and value else None
+
+def main():
+    """Query or fill the job index from the command line"""
+    parser = argparse.ArgumentParser(description="Full-text search over every job scraped")
+    parser.add_argument("--index", help="Index file (default: JOB_INDEX_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="Ranked full-text search")
+    search.add_argument("query", help='FTS5 query: words, "phrases", prefix*, AND/OR/NOT, title:word')
+    search.add_argument("--source", action="append", help="Only jobs from this source (repeatable)")
+    search.add_argument("--from", dest="date_from", help="Posted on or after YYYY-MM-DD")
+    search.add_argument("--to", dest="date_to", help="Posted on or before YYYY-MM-DD")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    backfill = commands.add_parser("import", help="Backfill from JSON reports")
+    backfill.add_argument("reports", nargs="*", help="Report files (default: OUTPUT_DIR/job_report_*.json)")
+
+    commands.add_parser("stats", help="Index size and coverage")
+    commands.add_parser("optimize", help="Merge index segments")
+    args = parser.parse_args()
+
+    index = JobIndex(args.index)
+    try:
+        if args.command == "search":
+            results = index.search(args.query, args.source, args.date_from, args.date_to, args.limit)
+            if args.json:
+                print(json.dumps(results, indent=2, ensure_ascii=False))
+            for job in [] if args.json else results:
+                print(f"{job['score']:6.2f}  {job['posted_date']}  {job['source'] or '':<10}  {job['title']} at {job['company']}")
+                if job['snippet']:
+                    print(f"        {job['snippet']}")
+                if job['url']:
+                    print(f"        {job['url']}")
+            if not args.json:
+                print(f"{len(results)} result(s)")
+        elif args.command == "import":
+            reports = args.reports or sorted(glob.glob(os.path.join(index.config.OUTPUT_DIR, "job_report_*.json")))
+            added = index.import_reports(reports)
+            print(f"Imported {len(reports)} report(s), {added} new job(s)")
+        elif args.command == "stats":
+            print(json.dumps(index.stats(), indent=2))
+        elif args.command == "optimize":
+            index.optimize()
+            print("Index optimized")
+    except ValueError as e:
+        parser.exit(2, f"{e}\n")
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    main()
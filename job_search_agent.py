@@ -1,67 +1,119 @@
+import os
 import logging
-import time
+import sqlite3
 from datetime import datetime
-from typing import List, Dict
-import schedule
-import threading
-from linkedin_scraper import LinkedInJobScraper
-from glassdoor_scraper import GlassdoorJobScraper
-from apollo_enricher import ApolloEnricher
-from data_processor import JobDataProcessor
-from report_generator import ReportGenerator
+from functools import cached_property
+from typing import List, Dict, Optional, Callable, Any
+from cron_scheduler import JobScheduler, default_schedules
+from checkpoint_store import CheckpointStore, IncompleteResult
+from job_index import JobIndex
+from search_profiles import SearchProfile, SearchQuery, load_profiles, profile_config, unique_queries
+import metrics
+from config_loader import load_config
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class JobSearchAgent:
-    def __init__(self):
-        self.config = Config()
-        self.linkedin_scraper = LinkedInJobScraper()
-        self.glassdoor_scraper = GlassdoorJobScraper()
-        self.apollo_enricher = ApolloEnricher()
-        self.data_processor = JobDataProcessor()
-        self.report_generator = ReportGenerator()
+    def __init__(self, config: Optional[Config] = None):
+        # This agent's settings (CONFIG_PROFILE_FILE over config.py), handed to every component it builds
+        self.config = config or load_config()
+        self.job_index = JobIndex(config=self.config)
         self.is_running = False
+        # Keep browsers open between runs (used by the scheduler daemon)
+        self.keep_warm = False
+    
+    # Components are built, and their modules imported, on first use: starting
+    # the agent costs no selenium, pandas or openpyxl until a run needs them
+    @cached_property
+    def linkedin_scraper(self):
+        from linkedin_scraper import LinkedInJobScraper
+        return LinkedInJobScraper(self.config)
+    
+    @cached_property
+    def glassdoor_scraper(self):
+        from glassdoor_scraper import GlassdoorJobScraper
+        return GlassdoorJobScraper(self.config)
+    
+    @cached_property
+    def glassdoor_http_scraper(self):
+        from glassdoor_scraper_fixed import GlassdoorScraperFixed
+        return GlassdoorScraperFixed(self.config)
+    
+    @cached_property
+    def indeed_scraper(self):
+        from indeed_scraper import IndeedScraper
+        return IndeedScraper(self.config)
+    
+    @cached_property
+    def apollo_enricher(self):
+        from apollo_enricher import ApolloEnricher
+        return ApolloEnricher(self.config)
+    
+    @cached_property
+    def near_duplicate_detector(self):
+        from near_duplicates import NearDuplicateDetector
+        return NearDuplicateDetector(self.config)
+    
+    @cached_property
+    def data_processor(self):
+        from data_processor import JobDataProcessor
+        return JobDataProcessor(self.config)
+    
+    @cached_property
+    def report_generator(self):
+        from report_generator import ReportGenerator
+        return ReportGenerator(self.config)
+    
+
+    def run_job_search(self, run_id: Optional[str] = None) -> str:
+        """Run the complete job search process
         
-    def run_job_search(self) -> str:
-        """Run the complete job search process"""
+        Every stage's output is checkpointed under the run id, so passing the
+        id of a failed run restarts it from the last completed stage.
+        """
         logger.info("Starting job search process...")
         start_time = datetime.now()
+        run_id = run_id or start_time.strftime("%Y%m%d_%H%M%S")
+        recorder = metrics.start_run(run_id, self.config)
+        checkpoints = CheckpointStore(run_id, self.config)
+        if checkpoints.exists():
+            logger.info(f"Resuming run {run_id}; completed stages: {', '.join(checkpoints.completed_stages()) or 'none'}")
+        else:
+            logger.info(f"Run id: {run_id}")
+            checkpoints.prune()
         
         try:
-            # Step 1: Search for jobs on LinkedIn
-            logger.info("Step 1: Searching LinkedIn for jobs...")
-            linkedin_jobs = self._search_linkedin_jobs()
-            logger.info(f"Found {len(linkedin_jobs)} jobs from LinkedIn")
-            
-            # Step 2: Search for jobs on Glassdoor
-            logger.info("Step 2: Searching Glassdoor for jobs...")
-            glassdoor_jobs = self._search_glassdoor_jobs()
-            logger.info(f"Found {len(glassdoor_jobs)} jobs from Glassdoor")
-            
-            # Step 3: Combine and deduplicate jobs
-            logger.info("Step 3: Combining and deduplicating jobs...")
-            all_jobs = self._combine_jobs(linkedin_jobs, glassdoor_jobs)
-            logger.info(f"Total unique jobs found: {len(all_jobs)}")
+            # Steps 1-3: Search every configured job board, then combine and deduplicate
+            all_jobs = self._collect_jobs(checkpoints, run_id)
             
             # Step 4: Process and filter jobs
             logger.info("Step 4: Processing and filtering jobs...")
-            processed_jobs = self.data_processor.process_jobs(all_jobs)
+            processed_jobs = self._run_stage(
+                checkpoints, "process", lambda: self.data_processor.process_jobs(all_jobs)
+            )
             logger.info(f"Jobs after processing: {len(processed_jobs)}")
             
             # Step 5: Enrich jobs with HR contacts
             logger.info("Step 5: Enriching jobs with HR contacts...")
-            enriched_jobs = self.apollo_enricher.enrich_jobs_batch(processed_jobs)
+            enriched_jobs = self._run_stage(
+                checkpoints, "enrich", lambda: self._enrich_top_jobs(processed_jobs)
+            )
             
             # Step 6: Get contacts summary
-            contacts_summary = self.apollo_enricher.get_company_contacts_summary(enriched_jobs)
+            contacts_summary = self._run_stage(
+                checkpoints, "summary", lambda: self.apollo_enricher.get_company_contacts_summary(enriched_jobs)
+            )
             
             # Step 7: Generate comprehensive report
             logger.info("Step 7: Generating comprehensive report...")
-            report_path = self.report_generator.generate_comprehensive_report(
-                enriched_jobs, contacts_summary
+            report_path = self._run_stage(
+                checkpoints, "report", lambda: self.report_generator.generate_comprehensive_report(
+                    enriched_jobs, contacts_summary
+                )
             )
+            self._mark_finished(checkpoints, f"python job_search_agent.py resume {run_id}")
             
             # Step 8: Log summary
             end_time = datetime.now()
@@ -82,47 +134,283 @@ class JobSearchAgent:
             return report_path
             
         except Exception as e:
+            checkpoints.mark_status("failed", str(e))
             logger.error(f"Error during job search: {str(e)}")
+            logger.error(f"Resume with: python job_search_agent.py resume {run_id}")
             raise
+        finally:
+            self._write_metrics(recorder)
+    
+    def run_profiles(self, profiles: List[SearchProfile], run_id: Optional[str] = None) -> Dict[str, str]:
+        """Run several search profiles over one shared scrape; returns each profile's report path
+        
+        Each (source, keyword, location) query is searched once however many
+        profiles ask for it. Each profile then takes the jobs its keywords
+        found, filters and ranks them with its own settings, and gets its own
+        report under OUTPUT_DIR/profiles/<name>. Apollo lookups are shared.
+        """
+        if not profiles:
+            raise ValueError("No search profiles given")
+        slugs = [profile.slug for profile in profiles]
+        if len(set(slugs)) != len(slugs):
+            raise ValueError(f"Search profile names must be distinct: {', '.join(profile.name for profile in profiles)}")
+        
+        start_time = datetime.now()
+        # Profiles in the id, so runs of different profiles started in the same second stay apart
+        run_id = run_id or f"{start_time.strftime('%Y%m%d_%H%M%S')}_{'_'.join(slugs)}"
+        recorder = metrics.start_run(run_id, self.config, '_'.join(slugs))
+        checkpoints = CheckpointStore(run_id, self.config)
+        if checkpoints.exists():
+            logger.info(f"Resuming run {run_id}; completed stages: {', '.join(checkpoints.completed_stages()) or 'none'}")
+        else:
+            logger.info(f"Run id: {run_id}")
+            checkpoints.prune()
+        
+        try:
+            queries = unique_queries(profiles)
+            requested = sum(len(profile.queries()) for profile in profiles)
+            logger.info(f"{len(profiles)} profiles: {len(queries)} unique queries of {requested} requested")
+            all_jobs = self._collect_jobs(checkpoints, run_id, queries)
+            
+            lookups = {}
+            report_paths = {}
+            for profile in profiles:
+                logger.info(f"Profile '{profile.name}': processing, enriching and reporting...")
+                processor = self._profile_processor(profile)
+                processed_jobs = self._run_stage(
+                    checkpoints, f"process_{profile.slug}",
+                    lambda: processor.process_jobs([job for job in all_jobs if profile.selects(job)])
+                )
+                enriched_jobs = self._run_stage(
+                    checkpoints, f"enrich_{profile.slug}",
+                    lambda: self._enrich_top_jobs(processed_jobs, self._profile_config(profile), lookups)
+                )
+                contacts_summary = self._run_stage(
+                    checkpoints, f"summary_{profile.slug}",
+                    lambda: self.apollo_enricher.get_company_contacts_summary(enriched_jobs)
+                )
+                report_paths[profile.name] = self._run_stage(
+                    checkpoints, f"report_{profile.slug}",
+                    lambda: self._profile_report_generator(profile).generate_comprehensive_report(
+                        enriched_jobs, contacts_summary
+                    )
+                )
+                logger.info(f"Profile '{profile.name}': {len(processed_jobs)} jobs, report {report_paths[profile.name]}")
+            names = ' '.join(f'"{profile.name}"' for profile in profiles)
+            self._mark_finished(checkpoints, f"python job_search_agent.py resume {run_id} {names}")
+            
+            logger.info(f"Profile run completed in {datetime.now() - start_time}")
+            return report_paths
+            
+        except Exception as e:
+            checkpoints.mark_status("failed", str(e))
+            logger.error(f"Error during profile run: {str(e)}")
+            names = ' '.join(f'"{profile.name}"' for profile in profiles)
+            logger.error(f"Resume with: python job_search_agent.py resume {run_id} {names}")
+            raise
+        finally:
+            self._write_metrics(recorder)
+    
+    def _collect_jobs(self, checkpoints: CheckpointStore, run_id: str,
+                      queries: Optional[List[SearchQuery]] = None) -> List[Dict]:
+        """Search every configured job board (one stage each), then combine, deduplicate and index the results
+        
+        queries are the (keyword, location) searches made on each board; by
+        default every JOB_KEYWORDS keyword in every configured location.
+        """
+        searches = self._source_searches()
+        source_jobs, failed_sources = [], []
+        for source in self.config.JOB_SOURCES:
+            if source not in searches:
+                raise ValueError(f"Unknown job source '{source}' (choose from: {', '.join(searches)})")
+            logger.info(f"Searching {source} for jobs...")
+            search = searches[source]
+            jobs = self._run_stage(checkpoints, source, search if queries is None else lambda: search(queries))
+            if isinstance(jobs, IncompleteResult):
+                failed_sources.append(source)
+            logger.info(f"Found {len(jobs)} jobs from {source}")
+            source_jobs.append(jobs)
+        
+        # The boards searched are checkpointed; what is built from their jobs waits until all succeed
+        checkpoints.failed_sources = failed_sources
+        
+        # Step 3: Combine and deduplicate jobs
+        logger.info("Step 3: Combining and deduplicating jobs...")
+        all_jobs = self._run_stage(
+            checkpoints, "combine", lambda: self._combine_jobs(*source_jobs)
+        )
+        logger.info(f"Total unique jobs found: {len(all_jobs)}")
+        
+        # Every job scraped stays searchable across runs, filtered or not
+        if self.config.JOB_INDEX_ENABLED:
+            self._run_stage(checkpoints, "index", lambda: self._index_jobs(all_jobs, run_id))
+        return all_jobs
     
-    def _search_linkedin_jobs(self) -> List[Dict]:
+    def _profile_config(self, profile: SearchProfile, **settings) -> Config:
+        """This agent's config with the profile's settings (and any given here) set over it"""
+        return profile_config({**profile.overrides, **settings}, self.config)
+    
+    def _profile_processor(self, profile: SearchProfile):
+        """Job processor applying the profile's filters and ranking"""
+        from data_processor import JobDataProcessor
+        return JobDataProcessor(self._profile_config(profile))
+    
+    def _profile_report_generator(self, profile: SearchProfile):
+        """Report generator writing to the profile's own directory
+        
+        The columnar history is left to single-profile runs, so jobs several
+        profiles share are not appended once per profile.
+        """
+        from report_generator import ReportGenerator
+        config = self._profile_config(profile, COLUMNAR_EXPORT_ENABLED=False)
+        return ReportGenerator(config, os.path.join(self.config.OUTPUT_DIR, "profiles", profile.slug))
+    
+    def _enrich_top_jobs(self, processed_jobs: List[Dict], config: Optional[Config] = None,
+                         lookups: Optional[Dict] = None) -> List[Dict]:
+        """Spend Apollo calls only on the best MAX_JOBS_PER_SEARCH jobs"""
+        limit = (config or self.config).MAX_JOBS_PER_SEARCH or len(processed_jobs)
+        top_jobs, remaining_jobs = processed_jobs[:limit], processed_jobs[limit:]
+        if remaining_jobs:
+            logger.info(f"Enriching the top {len(top_jobs)} of {len(processed_jobs)} jobs")
+        if lookups is None:
+            return self.apollo_enricher.enrich_jobs_batch(top_jobs) + remaining_jobs
+        return self.apollo_enricher.enrich_jobs_batch(top_jobs, lookups) + remaining_jobs
+    
+    def _index_jobs(self, jobs: List[Dict], run_id: str) -> int:
+        """Add this run's jobs to the full-text index; returns how many were new"""
+        try:
+            return self.job_index.add_jobs(jobs, run_id=run_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to update job index: {str(e)}")
+            return 0
+    
+    def _write_metrics(self, recorder: metrics.MetricsRecorder):
+        """Persist run metrics and log the slowest stages"""
+        try:
+            metrics_path = recorder.write_json()
+            recorder.write_prometheus()
+            for series in recorder.slowest("stage", limit=3):
+                logger.info(f"Stage '{series['labels']['stage']}' took {series['total']:.2f}s")
+            logger.info(f"Run metrics written to: {metrics_path}")
+        except Exception as e:
+            logger.warning(f"Failed to write run metrics: {str(e)}")
+    
+    def _run_stage(self, checkpoints: CheckpointStore, stage: str, func: Callable[[], Any]) -> Any:
+        """Run a pipeline stage, or load its output if this run already completed it"""
+        if checkpoints.has(stage):
+            logger.info(f"Loaded '{stage}' stage from checkpoint")
+            metrics.increment("stages_resumed", stage=stage)
+            return checkpoints.load(stage)
+        
+        with metrics.timer("stage", stage=stage):
+            result = func()
+        if isinstance(result, list):
+            metrics.increment("stage_output_items", len(result), stage=stage)
+        if isinstance(result, IncompleteResult) or checkpoints.failed_sources:
+            # Not checkpointed, so resuming the run does this stage again
+            metrics.increment("stages_incomplete", stage=stage)
+            return result
+        with metrics.timer("checkpoint_write", stage=stage):
+            checkpoints.save(stage, result)
+        return result
+    
+    def _mark_finished(self, checkpoints: CheckpointStore, resume_command: str):
+        """Record the run as completed, or as partial if a job board search failed"""
+        if not checkpoints.failed_sources:
+            checkpoints.mark_status("completed")
+            return
+        failed = ', '.join(checkpoints.failed_sources)
+        checkpoints.mark_status("partial", f"Search failed on: {failed}")
+        logger.warning(f"Search failed on: {failed}; retry with: {resume_command}")
+    
+    def resume(self, run_id: str, profiles: Optional[List[SearchProfile]] = None):
+        """Restart a previous run (of run_profiles, if profiles are given) from its last completed stage"""
+        checkpoints = CheckpointStore(run_id, self.config)
+        if not checkpoints.exists():
+            raise ValueError(f"No checkpoints found for run '{run_id}'")
+        if profiles:
+            return self.run_profiles(profiles, run_id=run_id)
+        return self.run_job_search(run_id=run_id)
+    
+    def _source_searches(self) -> Dict[str, Callable[[], List[Dict]]]:
+        """Search function per JOB_SOURCES name"""
+        return {
+            'linkedin': self._search_linkedin_jobs,
+            'glassdoor': self._search_glassdoor_jobs,
+            'glassdoor_http': self._search_glassdoor_http_jobs,
+            'indeed': self._search_indeed_jobs
+        }
+    
+    def _search_linkedin_jobs(self, queries: Optional[List[SearchQuery]] = None) -> List[Dict]:
         """Search for jobs on LinkedIn"""
         try:
-            self.linkedin_scraper.setup_driver()
-            jobs = self.linkedin_scraper.search_all_keywords()
+            if not self.linkedin_scraper.driver:
+                self.linkedin_scraper.setup_driver()
+            jobs = self.linkedin_scraper.search_all_keywords(queries)
             return jobs
         except Exception as e:
             logger.error(f"Error searching LinkedIn: {str(e)}")
-            return []
-        finally:
+            # Never reuse a browser that failed mid-search
             self.linkedin_scraper.close()
+            return IncompleteResult()
+        finally:
+            if not self.keep_warm:
+                self.linkedin_scraper.close()
     
-    def _search_glassdoor_jobs(self) -> List[Dict]:
+    def _search_glassdoor_jobs(self, queries: Optional[List[SearchQuery]] = None) -> List[Dict]:
         """Search for jobs on Glassdoor"""
         try:
-            jobs = self.glassdoor_scraper.search_all_keywords()
+            jobs = self.glassdoor_scraper.search_all_keywords(queries)
             return jobs
         except Exception as e:
             logger.error(f"Error searching Glassdoor: {str(e)}")
-            return []
-        finally:
             self.glassdoor_scraper.close()
+            return IncompleteResult()
+        finally:
+            if not self.keep_warm:
+                self.glassdoor_scraper.close()
     
-    def _combine_jobs(self, linkedin_jobs: List[Dict], glassdoor_jobs: List[Dict]) -> List[Dict]:
-        """Combine jobs from different sources and remove duplicates"""
-        all_jobs = linkedin_jobs + glassdoor_jobs
-        
-        # Remove duplicates based on title and company
-        seen = set()
-        unique_jobs = []
-        
-        for job in all_jobs:
-            key = (job.get("title", "").lower(), job.get("company", "").lower())
-            if key not in seen:
-                seen.add(key)
-                unique_jobs.append(job)
+    def _search_glassdoor_http_jobs(self, queries: Optional[List[SearchQuery]] = None) -> List[Dict]:
+        """Search for jobs on Glassdoor over plain HTTP"""
+        try:
+            return self.glassdoor_http_scraper.search_all_keywords(queries)
+        except Exception as e:
+            logger.error(f"Error searching Glassdoor over HTTP: {str(e)}")
+            return IncompleteResult()
+    
+    def _search_indeed_jobs(self, queries: Optional[List[SearchQuery]] = None) -> List[Dict]:
+        """Search for jobs on Indeed"""
+        try:
+            return self.indeed_scraper.search_all_keywords(queries)
+        except Exception as e:
+            logger.error(f"Error searching Indeed: {str(e)}")
+            return IncompleteResult()
+    
+    def _combine_jobs(self, *job_lists: List[Dict]) -> List[Dict]:
+        """Combine jobs from different sources and merge duplicate postings"""
+        all_jobs = [job for jobs in job_lists for job in jobs]
         
-        return unique_jobs
+        # Same title at the same canonical company, or (with NEAR_DUPLICATE_DETECTION)
+        # a near-identical title and description, is one posting; the merged job
+        # keeps every source and URL in 'sources' and 'source_urls'
+        return self.near_duplicate_detector.merge(all_jobs)
+    
+    def close(self):
+        """Release browsers and HTTP connection pools (of the components built so far)"""
+        built = self.__dict__
+        if 'linkedin_scraper' in built:
+            self.linkedin_scraper.close()
+        if 'glassdoor_scraper' in built:
+            self.glassdoor_scraper.close()
+            self.glassdoor_scraper.session.close()
+        if 'glassdoor_http_scraper' in built:
+            self.glassdoor_http_scraper.close()
+            self.glassdoor_http_scraper.session.close()
+        if 'indeed_scraper' in built:
+            self.indeed_scraper.session.close()
+        if 'apollo_enricher' in built:
+            self.apollo_enricher.session.close()
+        self.job_index.close()
     
     def run_scheduled_search(self):
         """Run scheduled job search"""
@@ -145,28 +433,19 @@ class JobSearchAgent:
         logger.info("Starting job search scheduler...")
         
         # Schedule based on configuration
-        if self.config.SEARCH_FREQUENCY.lower() == "daily":
-            schedule.every().day.at(self.config.SEARCH_TIME).do(self.run_scheduled_search)
-            logger.info(f"Scheduled daily job search at {self.config.SEARCH_TIME}")
-        elif self.config.SEARCH_FREQUENCY.lower() == "weekly":
-            schedule.every().monday.at(self.config.SEARCH_TIME).do(self.run_scheduled_search)
-            logger.info(f"Scheduled weekly job search on Mondays at {self.config.SEARCH_TIME}")
-        else:
-            logger.warning(f"Unknown search frequency: {self.config.SEARCH_FREQUENCY}")
-            return
+        schedules = self.config.SEARCH_SCHEDULES.get("default")
+        if not schedules:
+            try:
+                schedules = default_schedules(self.config)
+            except ValueError as e:
+                logger.warning(str(e))
+                return
         
-        # Run initial search
-        logger.info("Running initial job search...")
-        self.run_scheduled_search()
+        scheduler = JobScheduler()
+        scheduler.add_profile("default", self.run_job_search, schedules)
         
-        # Keep scheduler running
-        logger.info("Scheduler started. Press Ctrl+C to stop.")
-        try:
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
-        except KeyboardInterrupt:
-            logger.info("Scheduler stopped by user")
+        # Run initial search, then sleep until each schedule is due
+        scheduler.run_forever(run_on_start=True)
     
     def run_once(self):
         """Run job search once (for manual execution)"""
@@ -190,6 +469,20 @@ def main():
         # Run once
         report_path = agent.run_once()
         print(f"Job search completed. Report saved to: {report_path}")
+    elif len(sys.argv) > 3 and sys.argv[1] == "resume":
+        # Resume a failed profile run from its last completed stage
+        report_paths = agent.resume(sys.argv[2], load_profiles(sys.argv[3:]))
+        for name, report_path in report_paths.items():
+            print(f"{name}: report saved to {report_path}")
+    elif len(sys.argv) > 2 and sys.argv[1] == "resume":
+        # Resume a failed run from its last completed stage
+        report_path = agent.resume(sys.argv[2])
+        print(f"Job search completed. Report saved to: {report_path}")
+    elif len(sys.argv) > 2 and sys.argv[1] == "profiles":
+        # Run several presets (or filters_*.json files) over one shared scrape
+        report_paths = agent.run_profiles(load_profiles(sys.argv[2:]))
+        for name, report_path in report_paths.items():
+            print(f"{name}: report saved to {report_path}")
     else:
         # Run with scheduler
         agent.start_scheduler()
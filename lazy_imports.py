@@ -0,0 +1,46 @@
+import sys
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Iterable, List
+
+# Dependencies too slow to import on every start (selenium alone takes about a quarter second)
+HEAVY_MODULES = ['selenium', 'webdriver_manager', 'bs4', 'lxml', 'requests', 'numpy', 'pandas', 'openpyxl', 'pyarrow']
+
+class _LazyModule(ModuleType):
+    """Handle that imports its module on first attribute access
+
+    The handle belongs to the module holding it; sys.modules only ever sees
+    the real module, imported the normal way.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def __getattr__(self, attr: str):
+        module = self.__dict__['_module']
+        if module is None:
+            module = self.__dict__['_module'] = importlib.import_module(self.__name__)
+        return getattr(module, attr)
+
+def lazy_module(name: str) -> ModuleType:
+    """The named module, imported on first attribute access instead of now
+
+    Missing modules still fail here, at import time. A module that is
+    already imported is returned as is.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return _LazyModule(name)
+
+def is_loaded(name: str) -> bool:
+    """Whether a module has actually been imported (a lazy handle alone does not count)"""
+    return name in sys.modules
+
+def loaded_modules(names: Iterable[str] = HEAVY_MODULES) -> List[str]:
+    """Those of the names that have been imported"""
+    return [name for name in names if is_loaded(name)]
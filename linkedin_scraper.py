@@ -2,6 +2,7 @@ import time
 import json
 import logging
 from typing import List, Dict, Optional
+from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -9,15 +10,19 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
+import metrics
+from company_normalizer import company_key
+from search_profiles import SearchQuery, search_queries
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class LinkedInJobScraper:
-    def __init__(self):
-        self.config = Config()
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
         self.driver = None
+        self.logged_in = False
         self.jobs = []
         
     def setup_driver(self):
@@ -64,18 +69,20 @@ class LinkedInJobScraper:
             )
             
             logger.info("Successfully logged into LinkedIn")
+            self.logged_in = True
             return True
             
         except Exception as e:
             logger.error(f"Failed to login to LinkedIn: {str(e)}")
             return False
     
-    def search_jobs(self, keyword: str) -> List[Dict]:
+    def search_jobs(self, keyword: str, location: Optional[str] = None) -> List[Dict]:
         """Search for jobs with specific keyword"""
         jobs = []
+        location = location or self.config.LOCATION
         try:
             # Navigate to jobs page
-            search_url = f"https://www.linkedin.com/jobs/search/?keywords={keyword}&location={self.config.LOCATION}&f_E=2&f_JT=F&f_TPR=r86400"
+            search_url = f"https://www.linkedin.com/jobs/search/?keywords={keyword}&location={location}&f_E=2&f_JT=F&f_TPR=r86400"
             self.driver.get(search_url)
             
             # Wait for jobs to load
@@ -87,16 +94,19 @@ class LinkedInJobScraper:
             self._scroll_and_load_jobs()
             
             # Extract job information
-            job_elements = self.driver.find_elements(By.CSS_SELECTOR, ".jobs-search-results__list-item")
-            
-            for job_element in job_elements:
-                try:
-                    job_data = self._extract_job_data(job_element)
-                    if job_data:
-                        jobs.append(job_data)
-                except Exception as e:
-                    logger.warning(f"Failed to extract job data: {str(e)}")
-                    continue
+            with metrics.timer("parse_page", source="LinkedIn"):
+                job_elements = self.driver.find_elements(By.CSS_SELECTOR, ".jobs-search-results__list-item")
+                
+                for job_element in job_elements:
+                    try:
+                        job_data = self._extract_job_data(job_element)
+                        if job_data:
+                            job_data['search_keyword'] = keyword
+                            jobs.append(job_data)
+                    except Exception as e:
+                        logger.warning(f"Failed to extract job data: {str(e)}")
+                        continue
+            metrics.increment("pages_parsed", source="LinkedIn")
                     
         except Exception as e:
             logger.error(f"Error searching jobs for keyword '{keyword}': {str(e)}")
@@ -178,16 +188,71 @@ class LinkedInJobScraper:
             logger.warning(f"Failed to extract job data: {str(e)}")
             return None
     
-    def search_all_keywords(self) -> List[Dict]:
-        """Search for jobs using all configured keywords"""
+    def _parse_jobs_from_html(self, html_content: str, keyword: str) -> List[Dict]:
+        """Parse jobs from saved LinkedIn search results HTML (offline counterpart of search_jobs)"""
+        jobs = []
+        
+        try:
+            soup = BeautifulSoup(html_content, self.config.HTML_PARSER)
+            job_elements = soup.select(".jobs-search-results__list-item")
+            
+            for job_element in job_elements:
+                try:
+                    job_data = self._extract_job_data_from_soup(job_element)
+                    if job_data:
+                        job_data['search_keyword'] = keyword
+                        jobs.append(job_data)
+                except Exception as e:
+                    logger.warning(f"Failed to extract job data: {str(e)}")
+                    continue
+                    
+        except Exception as e:
+            logger.error(f"Error parsing LinkedIn HTML: {str(e)}")
+        
+        return jobs
+    
+    def _extract_job_data_from_soup(self, job_element) -> Optional[Dict]:
+        """Extract job data from a parsed job card, using the same selectors as _extract_job_data"""
+        title_element = job_element.select_one(".job-card-list__title")
+        company_element = job_element.select_one(".job-card-container__company-name")
+        if not title_element or not company_element:
+            return None
+        
+        location_element = job_element.select_one(".job-card-container__metadata-item")
+        link_element = job_element.select_one("a.job-card-list__title-link")
+        date_element = job_element.select_one("time")
+        
+        return {
+            "title": title_element.get_text(strip=True),
+            "company": company_element.get_text(strip=True),
+            "location": location_element.get_text(strip=True) if location_element else "",
+            "description": "",
+            "url": link_element.get("href", "") if link_element else "",
+            "posted_date": date_element.get("datetime", "") if date_element else "",
+            "source": "LinkedIn",
+            "experience_level": self.config.EXPERIENCE_LEVEL
+        }
+    
+    def _parse_job_description_from_html(self, html_content: str) -> str:
+        """Parse the full description from a LinkedIn job detail page"""
+        soup = BeautifulSoup(html_content, self.config.HTML_PARSER)
+        desc_element = soup.select_one(".jobs-description-content__text")
+        return desc_element.get_text(' ', strip=True) if desc_element else ""
+    
+    def search_all_keywords(self, queries: Optional[List[SearchQuery]] = None) -> List[Dict]:
+        """Search for jobs using all configured keywords (or the given (keyword, location) queries)"""
         all_jobs = []
+        queries = queries if queries is not None else search_queries(self.config)
         
-        if not self.login_to_linkedin():
+        # A warm browser keeps its LinkedIn session between runs
+        if not self.logged_in and not self.login_to_linkedin():
             return all_jobs
         
-        for keyword in self.config.JOB_KEYWORDS:
-            logger.info(f"Searching for jobs with keyword: {keyword}")
-            jobs = self.search_jobs(keyword)
+        for keyword, location in queries:
+            logger.info(f"Searching for jobs with keyword: {keyword} in {location}")
+            with metrics.timer("scrape_keyword", source="LinkedIn", keyword=keyword):
+                jobs = self.search_jobs(keyword, location)
+            metrics.increment("jobs_scraped", len(jobs), source="LinkedIn")
             all_jobs.extend(jobs)
             
             # Add delay between searches
@@ -200,12 +265,12 @@ class LinkedInJobScraper:
         return unique_jobs
     
     def _remove_duplicates(self, jobs: List[Dict]) -> List[Dict]:
-        """Remove duplicate jobs based on title and company"""
+        """Remove duplicate jobs based on title and canonical company"""
         seen = set()
         unique_jobs = []
         
         for job in jobs:
-            key = (job.get("title", "").lower(), job.get("company", "").lower())
+            key = (job.get("title", "").lower(), company_key(job.get("company", "")))
             if key not in seen:
                 seen.add(key)
                 unique_jobs.append(job)
@@ -216,6 +281,8 @@ class LinkedInJobScraper:
         """Close the browser"""
         if self.driver:
             self.driver.quit()
+            self.driver = None
+        self.logged_in = False
 
 if __name__ == "__main__":
     scraper = LinkedInJobScraper()
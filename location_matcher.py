@@ -0,0 +1,169 @@
+import re
+import json
+import logging
+import unicodedata
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple, Union
+from lazy_imports import lazy_module
+from config import Config
+
+# Only mask() needs these; resolving single locations stays free of them
+np = lazy_module('numpy')
+pd = lazy_module('pandas')
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+REMOTE = 'remote'
+
+class ResolvedLocation(NamedTuple):
+    """Cities a job location names (in order of mention) and its remote/hybrid markers"""
+    cities: Tuple[str, ...]
+    remote: bool
+    hybrid: bool
+
+    @property
+    def location_id(self) -> Optional[str]:
+        """Canonical id: the first city named, else "remote" for remote-only jobs"""
+        if self.cities:
+            return self.cities[0]
+        return REMOTE if self.remote else None
+
+class LocationTargets(NamedTuple):
+    """Compiled set of wanted locations"""
+    cities: FrozenSet[str]
+    remote: bool
+    # Wanted names the gazetteer does not know, matched as plain substrings
+    literals: Tuple[str, ...]
+
+    @property
+    def any(self) -> bool:
+        return not (self.cities or self.remote or self.literals)
+
+def split_locations(locations: Union[str, Iterable[str], None]) -> List[str]:
+    """Location names from a list, or from one comma/slash/pipe-separated string"""
+    if isinstance(locations, str):
+        locations = re.split(r'[,/|;]', locations)
+    return [name.strip() for name in locations or [] if isinstance(name, str) and name.strip()]
+
+def _normalize(text: str) -> str:
+    """Lowercase without accents, with whitespace collapsed"""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.lower().split())
+
+class LocationMatcher:
+    """Resolves free-text job locations to canonical city ids through the bundled gazetteer
+
+    Every alias, region and remote/hybrid marker is compiled into one regex
+    (longest alias first, on word boundaries); each distinct location string
+    is resolved once and remembered.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.config = Config()
+        self.path = path or self.config.LOCATION_GAZETTEER_FILE
+        with open(self.path, 'r', encoding='utf-8') as f:
+            gazetteer = json.load(f)
+
+        self.cities: Dict[str, Dict] = gazetteer['cities']
+        self.names: Dict[str, str] = {}
+        self.aliases: Dict[str, str] = {}
+        for city_id, city in self.cities.items():
+            self.names[city_id] = city.get('name', city_id.title())
+            for alias in [city_id, *city.get('aliases', [])]:
+                self.aliases[_normalize(alias)] = city_id
+        self.regions: Dict[str, Tuple[str, ...]] = {
+            _normalize(region): tuple(cities) for region, cities in gazetteer.get('regions', {}).items()
+        }
+        markers = gazetteer.get('markers', {})
+        self.markers: Dict[str, str] = {}
+        for kind in ('remote', 'hybrid'):
+            for marker in markers.get(kind, []):
+                self.markers[_normalize(marker)] = kind
+
+        terms = sorted(set(self.aliases) | set(self.markers), key=len, reverse=True)
+        self._pattern = re.compile(r'(?<![a-z0-9])(?:' + '|'.join(map(re.escape, terms)) + r')(?![a-z0-9])')
+        self._memo: Dict[str, ResolvedLocation] = {}
+
+    def resolve(self, location) -> ResolvedLocation:
+        """Cities and markers named in a job location"""
+        if not isinstance(location, str):
+            return ResolvedLocation((), False, False)
+        resolved = self._memo.get(location)
+        if resolved is None:
+            cities, kinds = [], set()
+            for match in self._pattern.finditer(_normalize(location)):
+                term = match.group(0)
+                if term in self.markers:
+                    kinds.add(self.markers[term])
+                elif self.aliases[term] not in cities:
+                    cities.append(self.aliases[term])
+            resolved = self._memo[location] = ResolvedLocation(tuple(cities), 'remote' in kinds, 'hybrid' in kinds)
+        return resolved
+
+    def location_id(self, location) -> Optional[str]:
+        """Canonical city id for a job location (see ResolvedLocation.location_id)"""
+        return self.resolve(location).location_id
+
+    def city(self, location) -> Optional[Dict]:
+        """Gazetteer entry of the location's city, or None"""
+        return self.cities.get(self.resolve(location).location_id)
+
+    def targets(self, locations: Union[str, Iterable[str], None]) -> LocationTargets:
+        """Compile wanted locations: a list, or one comma/slash/pipe-separated string such as "Bangalore, Mumbai, Delhi"
+
+        Region names ("Delhi NCR") expand to their cities and "Remote" matches
+        remote jobs. Names the gazetteer does not know match as substrings.
+        """
+        cities, literals, remote = set(), [], False
+        for name in split_locations(locations):
+            key = _normalize(name)
+            if key in self.regions:
+                cities.update(self.regions[key])
+            elif key in self.aliases:
+                cities.add(self.aliases[key])
+            elif self.markers.get(key) == 'remote':
+                remote = True
+            else:
+                logger.warning(f"Location '{name}' is not in the gazetteer; matching it as text")
+                literals.append(key)
+        return LocationTargets(frozenset(cities), remote, tuple(literals))
+
+    def matches(self, location, targets: LocationTargets) -> bool:
+        """Whether a job location is one of the targets (every location matches empty targets)"""
+        if targets.any:
+            return True
+        if not isinstance(location, str):
+            return False
+        resolved = self.resolve(location)
+        if targets.cities.intersection(resolved.cities) or (targets.remote and resolved.remote):
+            return True
+        if targets.literals:
+            text = _normalize(location)
+            return any(literal in text for literal in targets.literals)
+        return False
+
+    def mask(self, locations: 'pd.Series', targets: LocationTargets) -> 'np.ndarray':
+        """matches() over a column: each distinct value is checked once"""
+        codes, uniques = pd.factorize(locations, use_na_sentinel=True)
+        matched = np.fromiter((self.matches(value, targets) for value in uniques), dtype=bool, count=len(uniques))
+        # NaN / None get code -1 and match only empty targets
+        return np.append(matched, targets.any)[codes]
+
+    def location_ids(self, locations: Iterable) -> list:
+        """location_id() for each value"""
+        return [self.location_id(location) for location in locations]
+
+# Matcher shared by every component, rebuilt if LOCATION_GAZETTEER_FILE changes
+_default_matcher: Optional[LocationMatcher] = None
+
+def get_location_matcher() -> LocationMatcher:
+    """The shared location matcher, compiled on first use"""
+    global _default_matcher
+    if _default_matcher is None or _default_matcher.path != Config.LOCATION_GAZETTEER_FILE:
+        _default_matcher = LocationMatcher(Config.LOCATION_GAZETTEER_FILE)
+    return _default_matcher
+
+def configured_locations(config) -> Union[str, list]:
+    """The wanted locations: LOCATIONS if set, else LOCATION (which may list several)"""
+    return getattr(config, 'LOCATIONS', None) or config.LOCATION
@@ -0,0 +1,183 @@
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from config import Config, output_path
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "job_search"
+
+class MetricsRecorder:
+    """Timers and counters for one pipeline run
+
+    A run of search profiles passes their name(s) as profile: its Prometheus
+    series carry a profile label and go to their own textfile, so profiles
+    the scheduler runs concurrently do not overwrite each other's metrics.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, config: Optional[Config] = None,
+                 profile: Optional[str] = None):
+        self.config = config or Config()
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.profile = profile
+        self.started_at = datetime.now()
+        self.timers = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def _key(self, name: str, labels: Dict) -> Tuple:
+        """Hashable identity of a metric series"""
+        return (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Time a block and add it to the series for (name, labels)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record one duration"""
+        key = self._key(name, labels)
+        with self._lock:
+            series = self.timers.get(key)
+            if series is None:
+                series = self.timers[key] = {'count': 0, 'total': 0.0, 'min': seconds, 'max': seconds}
+            series['count'] += 1
+            series['total'] += seconds
+            series['min'] = min(series['min'], seconds)
+            series['max'] = max(series['max'], seconds)
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """Add to a counter"""
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def snapshot(self) -> Dict:
+        """All recorded series as plain data"""
+        with self._lock:
+            timers = [
+                {'name': name, 'labels': dict(labels), **series}
+                for (name, labels), series in self.timers.items()
+            ]
+            counters = [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in self.counters.items()
+            ]
+        return {
+            'run_id': self.run_id,
+            'profile': self.profile,
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'timers': sorted(timers, key=lambda t: t['total'], reverse=True),
+            'counters': counters
+        }
+
+    def slowest(self, name: str, limit: int = 5) -> List[Dict]:
+        """Series of one timer, slowest total first"""
+        return [t for t in self.snapshot()['timers'] if t['name'] == name][:limit]
+
+    def write_json(self, path: Optional[str] = None) -> str:
+        """Write the per-run metrics file"""
+        if path is None:
+            path = os.path.join(output_path(self.config, 'METRICS_DIR'), f"metrics_{self.run_id}.json")
+        self._write_atomic(path, json.dumps(self.snapshot(), indent=2))
+        return path
+
+    def write_prometheus(self, path: Optional[str] = None) -> str:
+        """Write a node_exporter textfile-collector file (replaced by the next run of the same profile)"""
+        if path is None:
+            path = output_path(self.config, 'METRICS_TEXTFILE')
+            if self.profile:
+                root, ext = os.path.splitext(path)
+                path = f"{root}_{self.profile}{ext}"
+        self._write_atomic(path, self.to_prometheus())
+        return path
+
+    def to_prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+
+        timers_by_name = {}
+        for series in snapshot['timers']:
+            timers_by_name.setdefault(series['name'], []).append(series)
+        for name, series_list in sorted(timers_by_name.items()):
+            metric = f"{METRIC_PREFIX}_{name}_seconds"
+            lines.append(f"# HELP {metric} Time spent in {name.replace('_', ' ')}")
+            lines.append(f"# TYPE {metric} summary")
+            for series in series_list:
+                labels = self._format_labels(series['labels'])
+                lines.append(f"{metric}_sum{labels} {series['total']:.6f}")
+                lines.append(f"{metric}_count{labels} {series['count']}")
+            lines.append(f"# TYPE {metric}_max gauge")
+            for series in series_list:
+                lines.append(f"{metric}_max{self._format_labels(series['labels'])} {series['max']:.6f}")
+
+        counters_by_name = {}
+        for series in snapshot['counters']:
+            counters_by_name.setdefault(series['name'], []).append(series)
+        for name, series_list in sorted(counters_by_name.items()):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            lines.append(f"# HELP {metric} Count of {name.replace('_', ' ')}")
+            lines.append(f"# TYPE {metric} counter")
+            for series in series_list:
+                lines.append(f"{metric}{self._format_labels(series['labels'])} {series['value']}")
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_last_run_timestamp_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_last_run_timestamp_seconds{self._format_labels({})} {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def _format_labels(self, labels: Dict) -> str:
+        """Render a label set plus the profile label, escaping values per the exposition format"""
+        if self.profile:
+            labels = {**labels, 'profile': self.profile}
+        if not labels:
+            return ""
+        parts = []
+        for key, value in sorted(labels.items()):
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            parts.append(f'{key}="{value}"')
+        return "{" + ",".join(parts) + "}"
+
+    def _write_atomic(self, path: str, content: str):
+        """Write via a temp file so collectors never read a partial file"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+# Recorder for the run in progress on each thread (the scheduler runs profiles
+# concurrently, one thread each); threads outside a run share the default one
+_default_recorder = MetricsRecorder()
+_local = threading.local()
+
+def start_run(run_id: Optional[str] = None, config: Optional[Config] = None,
+              profile: Optional[str] = None) -> MetricsRecorder:
+    """Begin a fresh set of metrics for a new pipeline run on this thread"""
+    _local.recorder = MetricsRecorder(run_id, config, profile)
+    return _local.recorder
+
+def get_recorder() -> MetricsRecorder:
+    """The recorder for this thread's current run"""
+    return getattr(_local, 'recorder', _default_recorder)
+
+def timer(name: str, **labels):
+    """Time a block in the current run"""
+    return get_recorder().timer(name, **labels)
+
+def increment(name: str, value: float = 1, **labels):
+    """Add to a counter in the current run"""
+    get_recorder().increment(name, value, **labels)
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Apollo.io API, for offline load and latency testing
+
+Serves organizations/search, mixed_companies/search and mixed_people/search
+from a deterministic dataset, with configurable latency, a token-bucket
+rate limit and injected 429 responses. Point the agent at it with:
+
+    APOLLO_BASE_URL=http://127.0.0.1:8765/v1 python job_search_agent.py once
+"""
+
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+from synthetic_jobs import COMPANY_NAMES, CONTACT_FIRST_NAMES, CONTACT_LAST_NAMES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDUSTRIES = ["information technology & services", "computer software", "internet", "financial services", "e-learning"]
+
+class MockApolloDataset:
+    """Deterministic organizations and people derived from a seed"""
+
+    def __init__(self, seed: int = 42, companies: Optional[List[str]] = None, people_per_title: int = 2):
+        self.seed = seed
+        self.people_per_title = people_per_title
+        self.organizations = {}
+        for name in companies or COMPANY_NAMES:
+            org_id = self._digest(name)[:24]
+            rng = self._rng(name)
+            self.organizations[name.lower()] = {
+                'id': org_id,
+                'name': name,
+                'website_url': f"http://www.{name.lower().replace(' ', '').replace(chr(39), '')}.com",
+                'primary_domain': f"{name.lower().replace(' ', '').replace(chr(39), '')}.com",
+                'industry': rng.choice(INDUSTRIES),
+                'estimated_num_employees': rng.choice([40, 250, 800, 4500, 60000]),
+                'short_description': f"{name} builds software products and services."
+            }
+        self.organizations_by_id = {org['id']: org for org in self.organizations.values()}
+
+    def _digest(self, *parts) -> str:
+        """Stable hash of the seed and parts"""
+        return hashlib.sha1("|".join([str(self.seed)] + [str(p) for p in parts]).encode()).hexdigest()
+
+    def _rng(self, *parts) -> random.Random:
+        """Random generator seeded by the dataset seed and parts"""
+        return random.Random(self._digest(*parts))
+
+    def find_organization(self, query: str) -> List[Dict]:
+        """Exact, then prefix match on organization name or domain"""
+        query = (query or "").strip().lower()
+        if not query:
+            return []
+        if query in self.organizations:
+            return [self.organizations[query]]
+        return [
+            org for key, org in self.organizations.items()
+            if key.startswith(query) or query.startswith(key) or org['primary_domain'] == query
+        ][:1]
+
+    def find_people(self, organization_id: str, title: str, per_page: int) -> List[Dict]:
+        """HR people at an organization holding a title"""
+        org = self.organizations_by_id.get(organization_id)
+        if not org:
+            return []
+        rng = self._rng(organization_id, title)
+        people = []
+        for index in range(min(self.people_per_title, per_page)):
+            first = rng.choice(CONTACT_FIRST_NAMES)
+            last = rng.choice(CONTACT_LAST_NAMES)
+            has_email = rng.random() < 0.8
+            people.append({
+                'id': self._digest(organization_id, title, index)[:24],
+                'first_name': first,
+                'last_name': last,
+                'title': title,
+                'email': f"{first.lower()}.{last.lower()}@{org['primary_domain']}" if has_email else None,
+                'phone_numbers': [{'sanitized_number': f"+919{rng.randint(100000000, 999999999)}"}] if rng.random() < 0.5 else [],
+                'linkedin_url': f"http://www.linkedin.com/in/{first.lower()}-{last.lower()}-{index}",
+                'organization': {'id': org['id'], 'name': org['name']}
+            })
+        return people
+
+class TokenBucket:
+    """Requests-per-minute limiter with burst up to the full minute's allowance"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.refill_per_second = per_minute / 60.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> float:
+        """Consume a token; returns 0 on success or seconds until one is available"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.refill_per_second
+
+class MockApolloServer:
+    """Threaded HTTP server wrapping the dataset and failure injection"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, latency_ms: float = 0,
+                 jitter_ms: float = 0, rate_limit_per_minute: int = 0, error_rate: float = 0,
+                 seed: int = 42):
+        self.dataset = MockApolloDataset(seed=seed)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(rate_limit_per_minute) if rate_limit_per_minute else None
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.stats = {'requests': {}, 'rate_limited': 0, 'injected_errors': 0}
+        self.stats_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Value for APOLLO_BASE_URL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockApolloServer":
+        """Serve in a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="mock-apollo", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, key: str, endpoint: Optional[str] = None):
+        """Increment a stats counter"""
+        with self.stats_lock:
+            if endpoint is None:
+                self.stats[key] += 1
+            else:
+                self.stats['requests'][endpoint] = self.stats['requests'].get(endpoint, 0) + 1
+
+    def respond(self, endpoint: str, params: Dict[str, List[str]]):
+        """Return (status, headers, body) for one API call"""
+        self._count('requests', endpoint)
+
+        if self.latency_ms or self.jitter_ms:
+            with self.rng_lock:
+                delay = self.latency_ms + self.rng.uniform(0, self.jitter_ms)
+            time.sleep(delay / 1000.0)
+
+        if self.bucket:
+            retry_after = self.bucket.take()
+            if retry_after:
+                self._count('rate_limited')
+                return 429, {'Retry-After': str(max(1, int(retry_after + 0.999)))}, {'error': 'rate limit exceeded'}
+
+        with self.rng_lock:
+            inject = self.error_rate and self.rng.random() < self.error_rate
+        if inject:
+            self._count('injected_errors')
+            return 429, {'Retry-After': '0'}, {'error': 'rate limit exceeded'}
+
+        def first(name, default=""):
+            return params.get(name, params.get(f"{name}[]", [default]))[0]
+
+        page = int(first('page', '1'))
+        per_page = int(first('per_page', '10'))
+
+        if endpoint == 'organizations/search':
+            organizations = self.dataset.find_organization(first('q_organization_name'))
+        elif endpoint == 'mixed_companies/search':
+            organizations = self.dataset.find_organization(first('q_organization_domains'))
+        elif endpoint == 'mixed_people/search':
+            people = self.dataset.find_people(first('q_organization_ids'), first('person_titles'), per_page)
+            return 200, {}, {
+                'people': people,
+                'pagination': {'page': page, 'per_page': per_page, 'total_entries': len(people)}
+            }
+        else:
+            return 404, {}, {'error': f"unknown endpoint {endpoint}"}
+
+        organizations = organizations[(page - 1) * per_page:page * per_page]
+        return 200, {}, {
+            'organizations': organizations,
+            'pagination': {'page': page, 'per_page': per_page, 'total_entries': len(organizations)}
+        }
+
+    def _handler_class(self):
+        """Request handler bound to this server"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; don't let Nagle stall the body
+            disable_nagle_algorithm = True
+
+            def _dispatch(self, body_params: Optional[Dict] = None):
+                parsed = urlparse(self.path)
+                if parsed.path == "/__stats":
+                    with server.stats_lock:
+                        self._send(200, {}, server.stats)
+                    return
+                params = parse_qs(parsed.query)
+                for key, value in (body_params or {}).items():
+                    params[key] = value if isinstance(value, list) else [str(value)]
+                endpoint = parsed.path[len("/v1/"):] if parsed.path.startswith("/v1/") else parsed.path.lstrip("/")
+                self._send(*server.respond(endpoint, params))
+
+            def do_GET(self):
+                self._dispatch()
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                self._dispatch(body)
+
+            def _send(self, status: int, headers: Dict, payload: Dict):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+def main():
+    """Run the mock Apollo API in the foreground"""
+    parser = argparse.ArgumentParser(description="Local mock of the Apollo.io API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=100, help="Base latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=50, help="Extra random latency per request")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per minute before 429 (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests answered with 429")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = MockApolloServer(args.host, args.port, args.latency_ms, args.jitter_ms,
+                              args.rate_limit, args.error_rate, args.seed)
+    print(f"Mock Apollo API on {server.base_url} (stats at /__stats). Press Ctrl+C to stop.")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Indeed and Glassdoor result pages, for end-to-end benchmarks
+
+Serves the fixture corpus (fixtures/html/) paginated the way each site
+paginates, with configurable latency, page count and injected 403s. Pages
+carry an ETag and answer a matching If-None-Match with 304. Point
+the HTTP scrapers at it with:
+
+    INDEED_BASE_URL=http://127.0.0.1:8766 GLASSDOOR_BASE_URL=http://127.0.0.1:8766 \
+    SCRAPE_DELAY_SCALE=0 python job_search_agent.py once
+"""
+
+import json
+import time
+import hashlib
+import random
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+from html_fixtures import load_fixture_pages
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+EMPTY_RESULTS_PAGE = "<!DOCTYPE html><html><head><title>No results</title></head><body><main><p>No jobs found</p></main></body></html>"
+
+class MockJobBoardServer:
+    """Threaded HTTP server for paginated Indeed (/jobs) and Glassdoor (/Job/jobs.htm) searches"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8766, latency_ms: float = 0,
+                 jitter_ms: float = 0, pages: int = 3, forbidden_rate: float = 0, seed: int = 42):
+        self.site_pages = {site: load_fixture_pages(site, 'search') for site in ('indeed', 'glassdoor')}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.pages = pages
+        self.forbidden_rate = forbidden_rate
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.stats = {'requests': {}, 'forbidden': 0, 'empty_pages': 0, 'not_modified': 0}
+        self.stats_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        """Value for INDEED_BASE_URL and GLASSDOOR_BASE_URL"""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockJobBoardServer":
+        """Serve in a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="mock-job-board", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _count(self, key: str, site: Optional[str] = None):
+        """Increment a stats counter"""
+        with self.stats_lock:
+            if site is None:
+                self.stats[key] += 1
+            else:
+                self.stats['requests'][site] = self.stats['requests'].get(site, 0) + 1
+
+    def page_html(self, site: str, page_index: int) -> str:
+        """Fixture page for a zero-based page index; fixtures repeat when pages exceeds the corpus"""
+        fixtures = self.site_pages[site]
+        if page_index >= self.pages or not fixtures:
+            self._count('empty_pages')
+            return EMPTY_RESULTS_PAGE
+        return fixtures[page_index % len(fixtures)]
+
+    def respond(self, path: str, params: Dict[str, List[str]]):
+        """Return (status, content type, body) for one request"""
+        if path == '/jobs':
+            site = 'indeed'
+            page_index = int(params.get('start', ['0'])[0]) // 10
+        elif path == '/Job/jobs.htm':
+            site = 'glassdoor'
+            page_index = int(params.get('p', ['1'])[0]) - 1
+        else:
+            return 404, 'text/html', "<html><body>Not found</body></html>"
+        self._count('requests', site)
+
+        if self.latency_ms or self.jitter_ms:
+            with self.rng_lock:
+                delay = self.latency_ms + self.rng.uniform(0, self.jitter_ms)
+            time.sleep(delay / 1000.0)
+
+        with self.rng_lock:
+            forbidden = self.forbidden_rate and self.rng.random() < self.forbidden_rate
+        if forbidden:
+            self._count('forbidden')
+            return 403, 'text/html', "<html><body>Access denied</body></html>"
+
+        return 200, 'text/html; charset=utf-8', self.page_html(site, page_index)
+
+    def _handler_class(self):
+        """Request handler bound to this server"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; don't let Nagle stall the body
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path == "/__stats":
+                    with server.stats_lock:
+                        self._send(200, 'application/json', json.dumps(server.stats))
+                    return
+                status, content_type, text = server.respond(parsed.path, parse_qs(parsed.query))
+                if status != 200:
+                    self._send(status, content_type, text)
+                    return
+                etag = '"%s"' % hashlib.sha1(text.encode('utf-8')).hexdigest()
+                if self.headers.get('If-None-Match') == etag:
+                    server._count('not_modified')
+                    self._send(304, content_type, '', {'ETag': etag})
+                    return
+                self._send(status, content_type, text, {'ETag': etag})
+
+            def _send(self, status: int, content_type: str, text: str, headers: Optional[Dict[str, str]] = None):
+                body = text.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+def main():
+    """Run the mock job board in the foreground"""
+    parser = argparse.ArgumentParser(description="Local mock of the Indeed and Glassdoor search pages")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency-ms", type=float, default=200, help="Base latency per page")
+    parser.add_argument("--jitter-ms", type=float, default=100, help="Extra random latency per page")
+    parser.add_argument("--pages", type=int, default=3, help="Result pages per search before results run out")
+    parser.add_argument("--forbidden-rate", type=float, default=0, help="Fraction of requests answered with 403")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    server = MockJobBoardServer(args.host, args.port, args.latency_ms, args.jitter_ms,
+                                args.pages, args.forbidden_rate, args.seed)
+    print(f"Mock job board on {server.base_url} (stats at /__stats). Press Ctrl+C to stop.")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
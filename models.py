@@ -0,0 +1,160 @@
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Slotted dataclasses need Python 3.10; older interpreters get regular ones
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Key orders seen so far; records with the same keys share one tuple
+_SHAPES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+# Typed field names per record class (a dict: ordered, with fast lookups)
+_FIELD_NAMES: Dict[type, Dict[str, None]] = {}
+
+def _shape(data: Dict) -> Tuple[str, ...]:
+    """Shared tuple of a dict's keys, in order"""
+    keys = tuple(data)
+    return _SHAPES.setdefault(keys, keys)
+
+def _intern(value: Any) -> Any:
+    """One string object per distinct value of an enum-like field"""
+    return sys.intern(value) if type(value) is str else value
+
+class _Record:
+    """Lossless conversion between a record class and the dicts the pipeline passes around
+
+    Keys the class has no field for are kept in extras, and the original
+    key order (including keys whose value was None) in key_order, so
+    to_dict(from_dict(d)) == d with the same key order.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def field_names(cls) -> Dict[str, None]:
+        """Names of the typed fields, in declaration order"""
+        names = _FIELD_NAMES.get(cls)
+        if names is None:
+            names = _FIELD_NAMES[cls] = dict.fromkeys(f.name for f in fields(cls) if f.name not in ('extras', 'key_order'))
+        return names
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "_Record":
+        """Record for a dict"""
+        names = cls.field_names()
+        values = {}
+        extras = None
+        for key, value in data.items():
+            if key in names:
+                values[key] = cls._field_from_dict(key, value)
+            else:
+                if extras is None:
+                    extras = {}
+                extras[key] = value
+        return cls(**values, extras=extras, key_order=_shape(data))
+
+    def to_dict(self) -> Dict:
+        """Dict with the keys and order the record was built from, plus anything set since"""
+        names = self.field_names()
+        extras = self.extras or {}
+        result = {}
+        for key in self.key_order:
+            if key in names:
+                result[key] = self._field_to_dict(key, getattr(self, key))
+            elif key in extras:
+                result[key] = extras[key]
+        # Fields set after construction (None means never set)
+        for name in names:
+            if name not in result:
+                value = getattr(self, name)
+                if value is not None:
+                    result[name] = self._field_to_dict(name, value)
+        for key, value in extras.items():
+            result.setdefault(key, value)
+        return result
+
+    @classmethod
+    def _field_from_dict(cls, key: str, value: Any) -> Any:
+        """Convert one dict value into its field value"""
+        return value
+
+    def _field_to_dict(self, key: str, value: Any) -> Any:
+        """Convert one field value back into its dict value"""
+        return value
+
+@dataclass(**_SLOTS)
+class Contact(_Record):
+    """An HR contact found through Apollo"""
+    name: Optional[str] = None
+    title: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    company: Optional[str] = None
+    contact_type: Optional[str] = None
+    extras: Optional[Dict[str, Any]] = None
+    key_order: Tuple[str, ...] = ()
+
+    @classmethod
+    def _field_from_dict(cls, key: str, value: Any) -> Any:
+        return _intern(value) if key == 'contact_type' else value
+
+@dataclass(**_SLOTS)
+class CompanyInfo(_Record):
+    """Apollo organization data attached to an enriched job"""
+    apollo_id: Optional[str] = None
+    website: Optional[str] = None
+    industry: Optional[str] = None
+    employee_count: Any = None
+    description: Optional[str] = None
+    extras: Optional[Dict[str, Any]] = None
+    key_order: Tuple[str, ...] = ()
+
+    @classmethod
+    def _field_from_dict(cls, key: str, value: Any) -> Any:
+        return _intern(value) if key == 'industry' else value
+
+@dataclass(**_SLOTS)
+class Job(_Record):
+    """A job posting as scraped, processed and enriched"""
+    title: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+    salary: Optional[str] = None
+    url: Optional[str] = None
+    posted_date: Optional[str] = None
+    description: Optional[str] = None
+    source: Optional[str] = None
+    experience_level: Optional[str] = None
+    job_id: Optional[str] = None
+    search_keyword: Optional[str] = None
+    relevance_score: Optional[float] = None
+    company_info: Optional[CompanyInfo] = None
+    hr_contacts: Optional[List[Contact]] = None
+    extras: Optional[Dict[str, Any]] = None
+    key_order: Tuple[str, ...] = ()
+
+    @classmethod
+    def _field_from_dict(cls, key: str, value: Any) -> Any:
+        if key in ('source', 'experience_level', 'search_keyword', 'location'):
+            return _intern(value)
+        if key == 'company_info' and isinstance(value, dict):
+            return CompanyInfo.from_dict(value)
+        if key == 'hr_contacts' and isinstance(value, list) and all(isinstance(c, dict) for c in value):
+            return [Contact.from_dict(contact) for contact in value]
+        return value
+
+    def _field_to_dict(self, key: str, value: Any) -> Any:
+        if key == 'company_info' and isinstance(value, CompanyInfo):
+            return value.to_dict()
+        if key == 'hr_contacts' and isinstance(value, list):
+            return [contact.to_dict() if isinstance(contact, Contact) else contact for contact in value]
+        return value
+
+def jobs_from_dicts(jobs: Iterable[Dict]) -> List[Job]:
+    """Job records for a list of job dicts"""
+    return [Job.from_dict(job) for job in jobs]
+
+def jobs_to_dicts(jobs: Iterable[Job]) -> List[Dict]:
+    """Job dicts for a list of job records"""
+    return [job.to_dict() for job in jobs]
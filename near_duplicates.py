@@ -0,0 +1,318 @@
+import re
+import logging
+import numpy as np
+from array import array
+from typing import Dict, List, Optional, Tuple
+from company_normalizer import company_key
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Title abbreviations expanded before comparing ("SDE-1" -> "software development engineer i")
+TITLE_SYNONYMS = {
+    'sde': 'software development engineer',
+    'sdet': 'software development engineer in test',
+    'swe': 'software engineer',
+    'se': 'software engineer',
+    'dev': 'developer',
+    'engg': 'engineer',
+    'eng': 'engineer',
+    'jr': 'junior',
+    'sr': 'senior',
+    'qa': 'quality assurance',
+    'fullstack': 'full stack',
+    'frontend': 'front end',
+    'backend': 'back end',
+    '1': 'i', '2': 'ii', '3': 'iii'
+}
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+# Description word n-grams; long descriptions are cut so one posting can't dominate the run time
+SHINGLE_SIZE = 3
+MAX_DESCRIPTION_WORDS = 200
+
+# MinHash permutations are multiply-shift hashes: the high 32 bits of
+# (a * x + b) mod 2**64 over 32-bit shingle hashes, with a odd
+SIGNATURE_BLOCK = 4096  # jobs shingled at a time, bounding memory on large corpora
+SIGNATURE_CHUNK = 1 << 15  # shingles hashed per numpy batch (a 16 MB buffer at 64 permutations)
+
+def title_tokens(title: Optional[str]) -> List[str]:
+    """Lowercase title words with abbreviations expanded"""
+    if not isinstance(title, str):
+        return []
+    words = []
+    for word in TOKEN_PATTERN.findall(title.lower()):
+        words.extend(TITLE_SYNONYMS.get(word, word).split())
+    return words
+
+def description_tokens(description: Optional[str]) -> List[str]:
+    """Lowercase description words, cut at MAX_DESCRIPTION_WORDS"""
+    if not isinstance(description, str):
+        return []
+    return TOKEN_PATTERN.findall(description.lower())[:MAX_DESCRIPTION_WORDS]
+
+def title_similarity(a: Optional[str], b: Optional[str]) -> float:
+    """Jaccard similarity of two titles' word sets"""
+    a, b = set(title_tokens(a)), set(title_tokens(b))
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+def description_shingles(description: Optional[str]) -> set:
+    """Description word triples"""
+    words = description_tokens(description)
+    return {tuple(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def containment(a: set, b: set) -> float:
+    """Share of the smaller set found in the larger, so a snippet of a description matches all of it"""
+    return len(a & b) / min(len(a), len(b)) if a and b else 0.0
+
+def _ngram_hashes(word_ids: np.ndarray, segments: np.ndarray, n: int, salt: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Hash of every n consecutive words within a segment, with the segment each starts in"""
+    count = len(word_ids) - n + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+    valid = segments[:count] == segments[n - 1:]
+    hashed = np.full(count, np.uint64(salt), dtype=np.uint64)
+    for offset in range(n):
+        hashed = hashed * np.uint64(0x100000001B3) ^ word_ids[offset:offset + count]
+    return hashed[valid], segments[:count][valid]
+
+class _UnionFind:
+    """Disjoint sets over job positions"""
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            # The earlier job stays the cluster root
+            self.parent[max(a, b)] = min(a, b)
+
+class NearDuplicateDetector:
+    """Finds the same posting across job boards with MinHash signatures and LSH banding
+
+    Candidates are jobs of the same canonical company sharing at least one
+    LSH band of their title or their description signatures, so the work
+    grows with the number of jobs rather than the number of pairs. Titles and
+    descriptions are then scored separately: full descriptions must have a
+    similar estimated Jaccard (or, when one is much shorter, be contained in
+    the other), and when one is missing or a board's snippet the titles alone
+    must agree closely.
+    """
+
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
+        self.num_perm = self.config.MINHASH_PERMUTATIONS
+        self.bands = self.config.LSH_BANDS
+        if self.num_perm % self.bands:
+            raise ValueError("MINHASH_PERMUTATIONS must be a multiple of LSH_BANDS")
+        self.threshold = self.config.NEAR_DUPLICATE_THRESHOLD
+        self.title_threshold = self.config.NEAR_DUPLICATE_TITLE_THRESHOLD
+        self.title_only_threshold = self.config.NEAR_DUPLICATE_TITLE_ONLY_THRESHOLD
+        self.min_description_words = self.config.NEAR_DUPLICATE_MIN_DESCRIPTION_WORDS
+        rng = np.random.RandomState(1)
+        self.a = rng.randint(0, np.iinfo(np.uint64).max, size=self.num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.randint(0, np.iinfo(np.uint64).max, size=self.num_perm, dtype=np.uint64)
+        # Keeps placeholder shingles of jobs with no text unique across blocks
+        self._empty_salt = 0
+
+    def shingle_hashes(self, jobs: List[Dict], vocabulary: Optional[Dict[str, int]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Hashed shingles of every job's title and description, grouped, and each group's offset into them
+
+        Job i's title shingles (words and word pairs) are group 2 * i and its
+        description shingles (word triples) group 2 * i + 1. They are hashed
+        from word ids with numpy rather than built as strings. Pass the same
+        vocabulary for every block of one corpus.
+        """
+        vocabulary = {} if vocabulary is None else vocabulary
+        ids = array('q')
+        lengths = []
+        for job in jobs:
+            for words in (title_tokens(job.get('title')), description_tokens(job.get('description'))):
+                ids.extend([vocabulary.setdefault(word, len(vocabulary)) for word in words])
+                lengths.append(len(words))
+        word_ids = np.frombuffer(ids, dtype=np.int64).astype(np.uint64)
+        # Every word is tagged with its group: 2 * job for titles, 2 * job + 1 for descriptions
+        segments = np.repeat(np.arange(2 * len(jobs), dtype=np.int64), lengths)
+        is_title = segments % 2 == 0
+
+        parts, owners = [], []
+        for ids, segs, n, salt in (
+            (word_ids[is_title], segments[is_title], 1, 1),
+            (word_ids[is_title], segments[is_title], 2, 2),
+            (word_ids[~is_title], segments[~is_title], SHINGLE_SIZE, 3)
+        ):
+            hashed, owner = _ngram_hashes(ids, segs, n, salt)
+            parts.append(hashed)
+            owners.append(owner)
+        # A title or description with nothing to compare gets a shingle of its own, so it matches nothing
+        empty = np.setdiff1d(np.arange(2 * len(jobs), dtype=np.int64), np.concatenate(owners))
+        parts.append((empty + np.int64(self._empty_salt)).astype(np.uint64) | np.uint64(1 << 63))
+        owners.append(empty)
+        self._empty_salt += 2 * len(jobs)
+
+        hashes = np.concatenate(parts)
+        owners = np.concatenate(owners)
+        order = np.argsort(owners, kind='stable')
+        hashes = hashes[order]
+        # Fold to 32 bits so the permutation products keep every input bit
+        hashes = (hashes ^ (hashes >> np.uint64(32))) & np.uint64(0xFFFFFFFF)
+        offsets = np.searchsorted(owners[order], np.arange(2 * len(jobs) + 1))
+        return hashes, offsets
+
+    def signatures(self, jobs: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """MinHash signatures of each job's title and description, and its description shingle count
+
+        Signatures have shape (jobs, 2, MINHASH_PERMUTATIONS), title first;
+        they are built SIGNATURE_BLOCK jobs at a time.
+        """
+        signatures = np.empty((len(jobs), 2, self.num_perm), dtype=np.uint64)
+        groups = signatures.reshape(2 * len(jobs), self.num_perm)
+        description_shingles = np.empty(len(jobs), dtype=np.int64)
+        vocabulary: Dict[str, int] = {}
+        for block_start in range(0, len(jobs), SIGNATURE_BLOCK):
+            block = jobs[block_start:block_start + SIGNATURE_BLOCK]
+            hashes, offsets = self.shingle_hashes(block, vocabulary)
+            # Jobs without a description count their placeholder, which is below any useful length
+            description_shingles[block_start:block_start + len(block)] = np.diff(offsets)[1::2]
+            first, count = 2 * block_start, 2 * len(block)
+            start = 0
+            while start < count:
+                # Whole groups per batch, about SIGNATURE_CHUNK shingles each
+                end = int(np.searchsorted(offsets, offsets[start] + SIGNATURE_CHUNK, side='right')) - 1
+                end = min(max(end, start + 1), count)
+                chunk = hashes[offsets[start]:offsets[end]]
+                permuted = np.multiply(self.a[:, None], chunk[None, :])
+                permuted += self.b[:, None]
+                permuted >>= np.uint64(32)
+                starts = offsets[start:end] - offsets[start]
+                groups[first + start:first + end] = np.minimum.reduceat(permuted, starts, axis=1).T
+                start = end
+        return signatures, description_shingles
+
+    def clusters(self, jobs: List[Dict]) -> List[List[int]]:
+        """Positions of jobs grouped by posting, each group in input order"""
+        union = _UnionFind(len(jobs))
+        companies = [company_key(job.get('company')) for job in jobs]
+
+        # Same title at the same company is always the same posting
+        exact = {}
+        for i, (job, company) in enumerate(zip(jobs, companies)):
+            title = job.get('title')
+            key = (title.strip().lower() if isinstance(title, str) else '', company)
+            union.union(exact.setdefault(key, i), i)
+
+        if self.config.NEAR_DUPLICATE_DETECTION and len(jobs) > 1:
+            self._merge_similar(jobs, companies, union)
+
+        groups: Dict[int, List[int]] = {}
+        for i in range(len(jobs)):
+            groups.setdefault(union.find(i), []).append(i)
+        return list(groups.values())
+
+    def _merge_similar(self, jobs: List[Dict], companies: List[str], union: _UnionFind):
+        """Union same-company jobs that collide in an LSH band and whose titles and descriptions agree"""
+        company_codes = np.unique(np.array(companies, dtype=object), return_inverse=True)[1].astype(np.uint64)
+        signatures, description_lengths = self.signatures(jobs)
+        description_lengths = description_lengths + (SHINGLE_SIZE - 1)
+        # Titles and descriptions are bucketed apart, so a missing or snippet description can't hide a match
+        pairs = np.unique(np.concatenate([
+            self._candidate_pairs(signatures[:, field], company_codes, len(jobs)) for field in (0, 1)
+        ]))
+        anchors, members = pairs // len(jobs), pairs % len(jobs)
+        # Band hashes mix in the company, but a collision could still pair two companies
+        same_company = company_codes[anchors] == company_codes[members]
+        anchors, members = anchors[same_company], members[same_company]
+        description_similarity = np.empty(len(anchors))
+        for start in range(0, len(anchors), SIGNATURE_CHUNK):
+            batch = slice(start, start + SIGNATURE_CHUNK)
+            description_similarity[batch] = (signatures[anchors[batch], 1] == signatures[members[batch], 1]).mean(axis=1)
+        shorter = np.minimum(description_lengths[anchors], description_lengths[members])
+        longer = np.maximum(description_lengths[anchors], description_lengths[members])
+        # A missing or snippet description says nothing, so the titles must match closely;
+        # a truncated copy is compared with the part of the full description it covers
+        title_only = shorter < self.min_description_words
+        truncated = ~title_only & (2 * shorter < longer)
+        described = ~title_only & ~truncated & (description_similarity >= self.threshold)
+        candidates = title_only | truncated | described
+
+        titles: Dict[int, set] = {}
+        for anchor, member, needs_title_only, needs_containment in zip(
+            anchors[candidates].tolist(), members[candidates].tolist(),
+            title_only[candidates].tolist(), truncated[candidates].tolist()
+        ):
+            for position in (anchor, member):
+                if position not in titles:
+                    titles[position] = set(title_tokens(jobs[position].get('title')))
+            a, b = titles[anchor], titles[member]
+            similarity = len(a & b) / len(a | b) if a or b else 0.0
+            # Shared boilerplate can make two roles at one company look alike; the titles must agree too
+            if similarity < (self.title_only_threshold if needs_title_only else self.title_threshold):
+                continue
+            if needs_containment and containment(description_shingles(jobs[anchor].get('description')),
+                                                 description_shingles(jobs[member].get('description'))) < self.threshold:
+                continue
+            union.union(anchor, member)
+
+    def _candidate_pairs(self, signatures: np.ndarray, company_codes: np.ndarray, count: int) -> np.ndarray:
+        """Jobs sharing an LSH band with their bucket's first job, as anchor * count + member"""
+        rows = self.num_perm // self.bands
+        # Hash each band's rows to one value; collisions only add candidates, which are verified after
+        mixers = (np.arange(rows, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)) | np.uint64(1)
+        banded = signatures.reshape(count, self.bands, rows)
+        band_hashes = (banded * mixers).sum(axis=2) ^ (company_codes[:, None] * np.uint64(0xC2B2AE3D27D4EB4F))
+
+        pairs = [np.zeros(0, dtype=np.int64)]
+        for band in range(self.bands):
+            keys = band_hashes[:, band]
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            new_bucket = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+            # Every bucket member is compared with the bucket's first job
+            bucket_first = order[np.maximum.accumulate(np.where(new_bucket, np.arange(len(order)), 0))]
+            paired = ~new_bucket
+            pairs.append(bucket_first[paired].astype(np.int64) * count + order[paired])
+        return np.concatenate(pairs)
+
+    def merge(self, jobs: List[Dict]) -> List[Dict]:
+        """One job per posting; merged jobs list every source and URL they were found under"""
+        merged_jobs = []
+        merged_count = 0
+        for cluster in self.clusters(jobs):
+            if len(cluster) == 1:
+                merged_jobs.append(jobs[cluster[0]])
+                continue
+            merged_count += len(cluster) - 1
+            merged_jobs.append(merge_cluster([jobs[i] for i in cluster]))
+        if merged_count:
+            logger.info(f"Merged {merged_count} duplicate postings into {len(merged_jobs)} jobs")
+        return merged_jobs
+
+def merge_cluster(cluster: List[Dict]) -> Dict:
+    """First job of a cluster, with blanks filled from the others and all sources and URLs kept"""
+    merged = dict(cluster[0])
+    for job in cluster[1:]:
+        for key, value in job.items():
+            if merged.get(key) in (None, '', [], {}) and value not in (None, '', [], {}):
+                merged[key] = value
+
+    sources, urls = [], []
+    for job in cluster:
+        for source in job.get('sources') or [job.get('source')]:
+            if source and source not in sources:
+                sources.append(source)
+        for url in job.get('source_urls') or [job.get('url')]:
+            if url and url not in urls:
+                urls.append(url)
+    merged['sources'] = sources
+    merged['source_urls'] = urls
+    return merged
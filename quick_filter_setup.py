@@ -244,8 +244,8 @@ def main():
         
         print(f"\n💾 Filters saved to: filters_{name.lower().replace(' ', '_')}.json")
         print("\nTo use these filters:")
-        print("1. Copy the values to your config.py file")
-        print("2. Or use the configure_filters.py tool to apply them")
+        print(f"1. Set CONFIG_PROFILE_FILE=filters_{name.lower().replace(' ', '_')}.json in your .env")
+        print(f"2. Or run them alongside others: python job_search_agent.py profiles filters_{name.lower().replace(' ', '_')}.json")
         
     else:
         print("Invalid choice.")
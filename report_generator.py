@@ -7,15 +7,18 @@ import pandas as pd
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils.dataframe import dataframe_to_rows
+from company_normalizer import get_company_index
+import metrics
 from config import Config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ReportGenerator:
-    def __init__(self):
-        self.config = Config()
-        self.output_dir = self.config.OUTPUT_DIR
+    def __init__(self, config: Optional[Config] = None, output_dir: Optional[str] = None):
+        self.config = config or Config()
+        self.output_dir = output_dir or self.config.OUTPUT_DIR
+        self.company_index = get_company_index()
         self._ensure_output_dir()
         
     def _ensure_output_dir(self):
@@ -29,18 +32,32 @@ class ReportGenerator:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Generate multiple report formats
-        json_report = self._generate_json_report(jobs, contacts_summary, timestamp)
-        excel_report = self._generate_excel_report(jobs, contacts_summary, timestamp)
-        html_report = self._generate_html_report(jobs, contacts_summary, timestamp)
+        with metrics.timer("report", format="json"):
+            json_report = self._generate_json_report(jobs, contacts_summary, timestamp)
+        with metrics.timer("report", format="excel"):
+            excel_report = self._generate_excel_report(jobs, contacts_summary, timestamp)
+        with metrics.timer("report", format="html"):
+            html_report = self._generate_html_report(jobs, contacts_summary, timestamp)
+        
+        if self.config.COLUMNAR_EXPORT_ENABLED:
+            with metrics.timer("report", format=self.config.COLUMNAR_FORMAT):
+                self._generate_columnar_export(jobs, timestamp)
         
         logger.info(f"Generated reports: {json_report}, {excel_report}, {html_report}")
         return excel_report  # Return Excel report as primary
     
+    def _ranking_note(self) -> Optional[str]:
+        """Say so when RANKING_MODE top_k cut the report down to the best jobs"""
+        if self.config.RANKING_MODE != "top_k":
+            return None
+        return f"Only the top {self.config.MAX_JOBS_PER_SEARCH} jobs by score are included (RANKING_MODE = top_k)"
+    
     def _generate_json_report(self, jobs: List[Dict], contacts_summary: Dict, timestamp: str) -> str:
         """Generate JSON report"""
         report_data = {
             'generated_at': datetime.now().isoformat(),
             'summary': contacts_summary,
+            'ranking': self._ranking_note(),
             'jobs': jobs,
             'statistics': self._calculate_statistics(jobs)
         }
@@ -53,6 +70,13 @@ class ReportGenerator:
         
         return filepath
     
+    def _generate_columnar_export(self, jobs: List[Dict], timestamp: str) -> Dict[str, str]:
+        """Append jobs and contacts to the partitioned columnar history"""
+        # pyarrow is only imported when the export is enabled
+        from columnar_exporter import ColumnarExporter
+        exporter = ColumnarExporter(self.config)
+        return exporter.export(jobs, run_id=timestamp)
+    
     def _generate_excel_report(self, jobs: List[Dict], contacts_summary: Dict, timestamp: str) -> str:
         """Generate Excel report with multiple sheets"""
         filename = f"job_report_{timestamp}.xlsx"
@@ -99,7 +123,14 @@ class ReportGenerator:
         
         ws[f'A{row}'] = "Experience Level:"
         ws[f'B{row}'] = self.config.EXPERIENCE_LEVEL
-        row += 2
+        row += 1
+        
+        ranking_note = self._ranking_note()
+        if ranking_note:
+            ws[f'A{row}'] = "Ranking:"
+            ws[f'B{row}'] = ranking_note
+            row += 1
+        row += 1
         
         # Key statistics
         ws[f'A{row}'] = "KEY STATISTICS"
@@ -187,7 +218,7 @@ class ReportGenerator:
             ws.cell(row=row_idx, column=9, value=job.get('url', ''))
             
             # Description preview (first 200 chars)
-            description = job.get('description', '')
+            description = job.get('description') or ''
             ws.cell(row=row_idx, column=10, value=description[:200] + '...' if len(description) > 200 else description)
         
         # Auto-adjust column widths
@@ -255,18 +286,21 @@ class ReportGenerator:
         """Create company analysis sheet"""
         ws = wb.create_sheet("Company Analysis")
         
-        # Group jobs by company
+        # Group jobs by canonical company, so "Infosys Ltd" and "INFOSYS" share a row
         company_data = {}
         for job in jobs:
             company = job.get('company', '')
-            if company not in company_data:
-                company_data[company] = {
+            key = self.company_index.canonical_id(company)
+            if key not in company_data:
+                company_data[key] = {
+                    'name': self.company_index.display_name(key, company),
                     'jobs': [],
                     'contacts': [],
-                    'company_info': job.get('company_info', {})
+                    'company_info': {}
                 }
-            company_data[company]['jobs'].append(job)
-            company_data[company]['contacts'].extend(job.get('hr_contacts', []))
+            company_data[key]['jobs'].append(job)
+            company_data[key]['contacts'].extend(job.get('hr_contacts') or [])
+            company_data[key]['company_info'] = company_data[key]['company_info'] or job.get('company_info') or {}
         
         # Headers
         headers = [
@@ -280,11 +314,11 @@ class ReportGenerator:
             cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
         
         # Data rows
-        for row_idx, (company, data) in enumerate(company_data.items(), 2):
+        for row_idx, data in enumerate(company_data.values(), 2):
             company_info = data['company_info']
             job_titles = [job.get('title', '') for job in data['jobs']]
             
-            ws.cell(row=row_idx, column=1, value=company)
+            ws.cell(row=row_idx, column=1, value=data['name'])
             ws.cell(row=row_idx, column=2, value=len(data['jobs']))
             ws.cell(row=row_idx, column=3, value=len(data['contacts']))
             ws.cell(row=row_idx, column=4, value=company_info.get('website', ''))
@@ -338,6 +372,7 @@ class ReportGenerator:
                 <h1>Job Search Report</h1>
                 <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
                 <p>Location: {self.config.LOCATION} | Experience Level: {self.config.EXPERIENCE_LEVEL}</p>
+                {f"<p>{self._ranking_note()}</p>" if self._ranking_note() else ""}
             </div>
             
             <div class="stats">
@@ -363,18 +398,23 @@ class ReportGenerator:
         """
         
         for job in jobs:
-            contacts = job.get('hr_contacts', [])
-            company_info = job.get('company_info', {})
+            contacts = job.get('hr_contacts') or []
+            company_info = job.get('company_info') or {}
+            # Postings merged across job boards link to every copy
+            sources = ', '.join(job.get('sources') or [job.get('source') or ''])
+            job_links = ' | '.join(
+                f'<a href="{url}" target="_blank">View Job</a>' for url in job.get('source_urls') or [job.get('url', '')]
+            )
             
             html_content += f"""
             <div class="job-card">
                 <h3>{job.get('title', '')} at {job.get('company', '')}</h3>
                 <p><strong>Location:</strong> {job.get('location', '')}</p>
-                <p><strong>Source:</strong> {job.get('source', '')}</p>
+                <p><strong>Source:</strong> {sources}</p>
                 <p><strong>Posted:</strong> {job.get('posted_date', '')}</p>
                 <p><strong>Relevance Score:</strong> {job.get('relevance_score', 0)}</p>
                 <p><strong>Company Website:</strong> <a href="{company_info.get('website', '')}" target="_blank">{company_info.get('website', '')}</a></p>
-                <p><strong>Job URL:</strong> <a href="{job.get('url', '')}" target="_blank">View Job</a></p>
+                <p><strong>Job URL:</strong> {job_links}</p>
                 
                 <h4>HR Contacts ({len(contacts)})</h4>
             """
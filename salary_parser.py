@@ -0,0 +1,271 @@
+import re
+import logging
+import numpy as np
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Currency used when salary text names none (the job boards searched are Indian)
+DEFAULT_CURRENCY = 'INR'
+
+CURRENCIES = {
+    '₹': 'INR', 'rs': 'INR', 'rs.': 'INR', 'inr': 'INR',
+    '$': 'USD', 'usd': 'USD',
+    '£': 'GBP', 'gbp': 'GBP',
+    '€': 'EUR', 'eur': 'EUR'
+}
+
+# Amount multipliers; lakh and crore amounts are Indian rupees per annum unless stated otherwise
+UNITS = {
+    'k': 1e3,
+    'l': 1e5, 'lpa': 1e5, 'lakh': 1e5, 'lakhs': 1e5, 'lac': 1e5, 'lacs': 1e5,
+    'cr': 1e7, 'crore': 1e7, 'crores': 1e7
+}
+INDIAN_UNITS = {'l', 'lpa', 'lakh', 'lakhs', 'lac', 'lacs', 'cr', 'crore', 'crores'}
+
+# Paid periods per year, for annualizing (a 40-hour, 5-day week)
+PERIOD_FACTORS = {'year': 1, 'month': 12, 'week': 52, 'day': 260, 'hour': 2080}
+
+# Letter codes only as whole words, so the "rs" of "years" is no currency
+CURRENCY_PATTERN = r'(?:₹|\$|£|€|(?<![a-z])(?:rs\.?|inr|usd|gbp|eur)(?![a-z]))'
+NUMBER_PATTERN = r'\d+(?:,\d+)*(?:\.\d+)?'
+UNIT_PATTERN = r'(?:lpa|lakhs?|lacs?|crores?|cr|k|l)(?![a-z])'
+PERIOD_PATTERNS = {
+    'year': r'per\s+annum|p\.?\s?a\.?(?![a-z])|(?:a|per|/)\s*(?:year|yr|annum)(?![a-z])|annually|yearly',
+    'month': r'(?:a|per|/)\s*(?:month|mo)(?![a-z])|monthly|p\.?\s?m\.?(?![a-z])',
+    'week': r'(?:a|per|/)\s*(?:week|wk)(?![a-z])|weekly',
+    'day': r'(?:a|per|/)\s*day(?![a-z])|daily',
+    'hour': r'(?:an|per|/)\s*(?:hour|hr)(?![a-z])|hourly'
+}
+PERIOD_PATTERN = '|'.join(f'(?P<{period}>{pattern})' for period, pattern in PERIOD_PATTERNS.items())
+
+# "3-5 LPA", "₹3,00,000 - ₹5,00,000 a year", "15k to 20k per month", "Rs. 500/hr", "$80,000".
+# Matches start at a digit, which the regex engine can skip to quickly; a
+# currency just before the amount is found by CURRENCY_BEFORE_PATTERN.
+SALARY_PATTERN = re.compile(
+    rf'(?<![\d,])(?<!\d\.)(?P<low>{NUMBER_PATTERN})\s*(?P<low_unit>{UNIT_PATTERN})?'
+    rf'(?:\s*(?:-|–|—|to)\s*(?P<high_currency>{CURRENCY_PATTERN})?\s*(?P<high>{NUMBER_PATTERN})\s*(?P<high_unit>{UNIT_PATTERN})?)?'
+    rf'\s*(?:{PERIOD_PATTERN})?'
+)
+CURRENCY_BEFORE_PATTERN = re.compile(rf'(?P<currency>{CURRENCY_PATTERN})\s*$')
+CURRENCY_LOOKBACK = 8
+
+# "Upto 8 LPA" caps the salary rather than stating it, so it starts at zero
+UP_TO_BEFORE_PATTERN = re.compile(r'(?<![a-z])(?:up\s*to|max(?:imum)?|below|under|less\s+than)\W*$')
+UP_TO_LOOKBACK = 16
+
+# A bare number ("3-5") is lakh per annum only when the salary field says nothing
+# but this around it; "2-4 years experience" or "Posted 3 days ago" are not pay
+BARE_SALARY_WORDS = {'salary', 'ctc', 'package', 'pay', 'compensation', 'stipend', 'expected', 'offered', 'fixed',
+                     'gross', 'annual', 'approx', 'approximately', 'range', 'negotiable', 'inr'}
+WORD_PATTERN = re.compile(r'[a-z]+')
+
+# A description can only hold a salary if it has one of these; plain substring
+# checks rule most descriptions out far faster than a regex scan would
+DESCRIPTION_MARKERS = ('₹', '$', '£', '€', 'lpa', 'lakh', 'lac', 'crore', 'inr', 'usd', 'gbp', 'eur')
+RUPEE_MARKER_PATTERN = re.compile(r'rs\.?\s*\d')
+# Scanning starts this far before the first marker, far enough back for "3,00,000 - 5,00,000 lakh"
+MARKER_WINDOW = 40
+
+class SalaryRange(NamedTuple):
+    """A salary as stated: amounts per period in one currency"""
+    min: float
+    max: float
+    currency: str
+    period: str
+
+    @property
+    def annual_min(self) -> float:
+        return self.min * PERIOD_FACTORS[self.period]
+
+    @property
+    def annual_max(self) -> float:
+        return self.max * PERIOD_FACTORS[self.period]
+
+class SalaryParser:
+    """Parses LPA, lakh, rupee, monthly and hourly salary text into SalaryRange values
+
+    Salary fields are parsed leniently: a bare "3-5" means 3-5 lakh per annum,
+    as Indian boards abbreviate it, when the field holds nothing else but
+    salary wording. "Upto 8 LPA" is a range from zero. In descriptions only amounts with a
+    currency or a lakh/crore unit count, so "0-2 years" is never a salary,
+    and scanning starts just before the first such marker. Each distinct
+    salary string is parsed once.
+    """
+
+    def __init__(self):
+        self._memo: Dict[str, Optional[SalaryRange]] = {}
+
+    def parse(self, text, strict: bool = False) -> Optional[SalaryRange]:
+        """First salary in the text, or None"""
+        if not isinstance(text, str) or not text:
+            return None
+        if strict:
+            return self._parse(text, strict=True)
+        if text not in self._memo:
+            self._memo[text] = self._parse(text, strict=False)
+        return self._memo[text]
+
+    def parse_job(self, job: Dict) -> Optional[SalaryRange]:
+        """Salary from the job's salary field, else from its description"""
+        return self.parse(job.get('salary')) or self.parse(job.get('description'), strict=True)
+
+    def parse_columns(self, salaries: Iterable, descriptions: Iterable) -> List[Optional[SalaryRange]]:
+        """parse_job over aligned salary and description values"""
+        return [self.parse(salary) or self.parse(description, strict=True)
+                for salary, description in zip(salaries, descriptions)]
+
+    def annotate(self, jobs: List[Dict]):
+        """Store each job's parsed salary as salary_min/salary_max (per annum), salary_currency and salary_period"""
+        for job in jobs:
+            job.update(salary_fields(self.parse_job(job)))
+
+    def _parse(self, text: str, strict: bool) -> Optional[SalaryRange]:
+        """Regex scan of one text"""
+        text = text.lower()
+        start = 0
+        if strict:
+            marker = self._first_marker(text)
+            if marker < 0:
+                return None
+            start = max(0, marker - MARKER_WINDOW)
+        for match in SALARY_PATTERN.finditer(text, start):
+            before = CURRENCY_BEFORE_PATTERN.search(text, max(0, match.start() - CURRENCY_LOOKBACK), match.start())
+            amount_start = before.start() if before else match.start()
+            up_to = UP_TO_BEFORE_PATTERN.search(text, max(0, amount_start - UP_TO_LOOKBACK), amount_start) is not None
+            bare = not strict and self._only_salary(text, match)
+            salary = self._from_match(match, before.group('currency') if before else None, strict, up_to, bare)
+            if salary is not None:
+                return salary
+        return None
+
+    def _only_salary(self, text: str, match: re.Match) -> bool:
+        """Whether every word of the text outside the match is salary wording"""
+        rest = f"{text[:match.start()]} {text[match.end():]}"
+        return all(word in BARE_SALARY_WORDS for word in WORD_PATTERN.findall(rest))
+
+    def _first_marker(self, text: str) -> int:
+        """Position of the first currency or lakh/crore marker in lowercase text, or -1"""
+        positions = [position for position in map(text.find, DESCRIPTION_MARKERS) if position >= 0]
+        rupees = RUPEE_MARKER_PATTERN.search(text)
+        if rupees:
+            positions.append(rupees.start())
+        return min(positions, default=-1)
+
+    def _from_match(self, match: re.Match, symbol: Optional[str], strict: bool, up_to: bool = False,
+                    bare: bool = False) -> Optional[SalaryRange]:
+        """SalaryRange for one regex match (and the currency before it), or None if it is not a salary"""
+        symbol = symbol or match.group('high_currency')
+        low_unit = match.group('low_unit') or match.group('high_unit')
+        high_unit = match.group('high_unit') or low_unit
+        period = next((name for name in PERIOD_FACTORS if match.group(name)), None)
+        if strict and not symbol and low_unit not in INDIAN_UNITS:
+            return None
+
+        low = self._amount(match.group('low'), low_unit)
+        high = self._amount(match.group('high'), high_unit) if match.group('high') else low
+        if not low or not high:
+            return None
+        if not symbol and not low_unit and high < 100:
+            if period or not bare:
+                return None  # "5 pm" is a time, "3 days ago" a date, not pay
+            # Bare "3-5" in a salary field: lakh per annum
+            low, high, low_unit = low * 1e5, high * 1e5, 'l'
+        if up_to and not match.group('high'):
+            low = 0.0
+        if low > high:
+            low, high = high, low
+
+        currency = CURRENCIES.get(symbol, DEFAULT_CURRENCY)
+        if period is None:
+            # Unstated: lakh/crore amounts are annual, smaller rupee amounts are monthly pay
+            monthly = currency == 'INR' and low_unit not in INDIAN_UNITS and high < 1e5
+            period = 'month' if monthly else 'year'
+        return SalaryRange(low, high, currency, period)
+
+    def _amount(self, number: str, unit: Optional[str]) -> float:
+        """Numeric amount of "3,00,000" or "4.5" with its unit applied"""
+        return float(number.replace(',', '')) * UNITS.get(unit, 1)
+
+SALARY_FIELDS = ['salary_min', 'salary_max', 'salary_currency', 'salary_period']
+
+def salary_fields(salary: Optional[SalaryRange]) -> Dict:
+    """The job fields stored for a parsed salary (all None when there is none)"""
+    if salary is None:
+        return dict.fromkeys(SALARY_FIELDS)
+    return {
+        'salary_min': salary.annual_min,
+        'salary_max': salary.annual_max,
+        'salary_currency': salary.currency,
+        'salary_period': salary.period
+    }
+
+def salary_overlaps(job: Dict, min_salary: Optional[float], max_salary: Optional[float],
+                    currency: str = DEFAULT_CURRENCY) -> Optional[bool]:
+    """Whether the job's stored annual salary range overlaps [min_salary, max_salary]; None if not comparable"""
+    if job.get('salary_min') is None or job.get('salary_currency') != currency:
+        return None
+    return ((min_salary is None or job['salary_max'] >= min_salary)
+            and (max_salary is None or job['salary_min'] <= max_salary))
+
+class SalaryIndex:
+    """Jobs ordered by annual salary for range queries and salary ranking
+
+    Built once from the salary_min/salary_max fields (parsed on the fly for
+    jobs without them); each query is then a binary search plus a vectorized
+    comparison over the precomputed columns.
+    """
+
+    def __init__(self, jobs: List[Dict], currency: str = DEFAULT_CURRENCY, parser: Optional[SalaryParser] = None):
+        self.jobs = jobs
+        self.currency = currency
+        parser = parser or SalaryParser()
+
+        positions, mins, maxs = [], [], []
+        for position, job in enumerate(jobs):
+            if 'salary_min' in job:
+                low, high, job_currency = job['salary_min'], job['salary_max'], job.get('salary_currency')
+            else:
+                salary = parser.parse_job(job)
+                low, high, job_currency = (salary.annual_min, salary.annual_max, salary.currency) if salary else (None, None, None)
+            if low is not None and job_currency == currency:
+                positions.append(position)
+                mins.append(low)
+                maxs.append(high)
+
+        # Sorted by salary_min, so "starts at or below max_salary" is a prefix
+        order = np.argsort(np.asarray(mins, dtype=np.float64), kind='stable')
+        self._positions = np.asarray(positions, dtype=np.int64)[order]
+        self._mins = np.asarray(mins, dtype=np.float64)[order]
+        self._maxs = np.asarray(maxs, dtype=np.float64)[order]
+        self.unknown = sorted(set(range(len(jobs))) - set(positions))
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def between(self, min_salary: Optional[float] = None, max_salary: Optional[float] = None,
+                include_unknown: bool = False) -> List[Dict]:
+        """Jobs whose salary range overlaps [min_salary, max_salary], in their original order"""
+        end = len(self._mins) if max_salary is None else int(np.searchsorted(self._mins, max_salary, side='right'))
+        positions = self._positions[:end]
+        if min_salary is not None:
+            positions = positions[self._maxs[:end] >= min_salary]
+        positions = positions.tolist()
+        if include_unknown:
+            positions.extend(self.unknown)
+        return [self.jobs[position] for position in sorted(positions)]
+
+    def ranked(self, descending: bool = True) -> List[Dict]:
+        """Jobs with a known salary by the top of their range (ties by the bottom), highest first"""
+        order = np.lexsort((self._mins, self._maxs))
+        if descending:
+            order = order[::-1]
+        return [self.jobs[position] for position in self._positions[order].tolist()]
+
+if __name__ == "__main__":
+    parser = SalaryParser()
+    for text in ["3-5 LPA", "₹3,00,000 - ₹5,00,000 a year", "₹25,000 - ₹40,000 a month", "₹500 an hour",
+                 "4 to 6 Lakhs per annum", "15k-20k per month", "$80,000 - $100,000", "Not disclosed"]:
+        salary = parser.parse(text)
+        print(f"{text!r:36} -> {salary}" + (f" ({salary.annual_min:,.0f}-{salary.annual_max:,.0f}/yr)" if salary else ""))
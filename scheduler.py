@@ -1,50 +1,117 @@
-import schedule
-import time
+import os
+import sys
 import logging
+import threading
+from functools import partial
+from cron_scheduler import JobScheduler, default_schedules
 from job_search_agent import JobSearchAgent
+from search_profiles import load_profiles
+from config_loader import load_config
+from config import CONFIG_FILES, reload_config
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def run_job_search():
+# Schedule name searching with config.py's own settings; any other
+# SEARCH_SCHEDULES name is a search profile (preset name or JSON settings file)
+DEFAULT_PROFILE = "default"
+
+def _search(agent: JobSearchAgent, profile: str):
+    """One run of a schedule entry: the plain search, or that profile's"""
+    if profile == DEFAULT_PROFILE:
+        return agent.run_job_search()
+    report_paths = agent.run_profiles(load_profiles([profile]))
+    return next(iter(report_paths.values()))
+
+def run_job_search(profile: str = DEFAULT_PROFILE):
     """Function to run job search"""
     agent = JobSearchAgent()
-    try:
-        report_path = agent.run_job_search()
+    report_path = _search(agent, profile)
+    logger.info(f"Job search completed successfully. Report: {report_path}")
+    return report_path
+
+class WarmAgent:
+    """Keeps one long-lived JobSearchAgent between runs, rebuilt only when config changes"""
+    
+    def __init__(self):
+        self.agent = None
+        self._signature = None
+        self._lock = threading.Lock()
+        self.builds = 0
+    
+    def _config_signature(self):
+        """Modification times of every config file that exists"""
+        return tuple(
+            (path, os.path.getmtime(path)) for path in CONFIG_FILES if os.path.exists(path)
+        )
+    
+    def get_agent(self) -> JobSearchAgent:
+        """Return the warm agent, rebuilding it if the configuration changed"""
+        signature = self._config_signature()
+        if self.agent is not None and signature == self._signature:
+            return self.agent
+        
+        base = None
+        if self.agent is not None:
+            logger.info("Configuration changed, rebuilding job search agent...")
+            self.agent.close()
+            base = reload_config()
+        
+        self.agent = JobSearchAgent(load_config(base=base))
+        self.agent.keep_warm = True
+        self._signature = signature
+        self.builds += 1
+        return self.agent
+    
+    def run_job_search(self, profile: str = DEFAULT_PROFILE):
+        """Run one search on the warm agent"""
+        # The scheduler already prevents overlapping runs per profile; this
+        # lock also serialises profiles sharing the single agent
+        with self._lock:
+            report_path = _search(self.get_agent(), profile)
         logger.info(f"Job search completed successfully. Report: {report_path}")
-    except Exception as e:
-        logger.error(f"Job search failed: {str(e)}")
+        return report_path
+    
+    def close(self):
+        """Shut down browsers and HTTP pools"""
+        if self.agent is not None:
+            self.agent.close()
+            self.agent = None
 
 def main():
     """Main scheduler function"""
     from config import Config
     config = Config()
     
-    logger.info("Starting Job Search Scheduler...")
-    
-    # Schedule based on configuration
-    if config.SEARCH_FREQUENCY.lower() == "daily":
-        schedule.every().day.at(config.SEARCH_TIME).do(run_job_search)
-        logger.info(f"Scheduled daily job search at {config.SEARCH_TIME}")
-    elif config.SEARCH_FREQUENCY.lower() == "weekly":
-        schedule.every().monday.at(config.SEARCH_TIME).do(run_job_search)
-        logger.info(f"Scheduled weekly job search on Mondays at {config.SEARCH_TIME}")
-    else:
-        logger.error(f"Unknown search frequency: {config.SEARCH_FREQUENCY}")
+    # "daemon" keeps one warm agent alive instead of rebuilding it every run
+    daemon = len(sys.argv) > 1 and sys.argv[1] == "daemon"
+    
+    logger.info(f"Starting Job Search Scheduler{' (daemon mode)' if daemon else ''}...")
+    
+    scheduler = JobScheduler()
+    warm_agent = WarmAgent() if daemon else None
+    job = warm_agent.run_job_search if daemon else run_job_search
+    
+    # One entry per search profile, each with one or more cron schedules
+    profile_schedules = config.SEARCH_SCHEDULES
+    try:
+        if not profile_schedules:
+            profile_schedules = {DEFAULT_PROFILE: default_schedules(config)}
+        # Fail at start, not at the first firing, on an unknown profile name
+        load_profiles([name for name in profile_schedules if name != DEFAULT_PROFILE])
+    except ValueError as e:
+        logger.error(str(e))
         return
     
-    # Run initial search
-    logger.info("Running initial job search...")
-    run_job_search()
+    for name, schedules in profile_schedules.items():
+        scheduler.add_profile(name, partial(job, name), schedules)
     
-    # Keep scheduler running
-    logger.info("Scheduler is running. Press Ctrl+C to stop.")
+    # Run initial search and keep scheduler running
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
-    except KeyboardInterrupt:
-        logger.info("Scheduler stopped by user")
+        scheduler.run_forever(run_on_start=True)
+    finally:
+        if warm_agent:
+            warm_agent.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,209 @@
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional
+from config import Config
+from config_loader import get_profile
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Score column written for each component; relevance_score is their sum
+COMPONENT_COLUMNS = {
+    'title': 'title_score',
+    'company_size': 'company_score',
+    'contacts': 'contact_score',
+    'source': 'source_score',
+    'recency': 'recency_score'
+}
+
+# Employee-count labels as Apollo and the job boards render them, by points
+COMPANY_SIZE_LABELS = [(3, ('1000+', '10000+')), (2, ('100+', '500+')), (1, ('10+', '50+'))]
+COMPANY_SIZE_THRESHOLDS = [(1000, 3), (100, 2), (10, 1)]
+
+# (max days old, points), checked in order
+RECENCY_TIERS = [(1, 3), (3, 2), (7, 1)]
+
+def load_scoring_model(config: Config) -> Dict:
+    """Weights, title keywords and preferred sources from config, overridden by SCORING_WEIGHTS_FILE"""
+    model = {
+        'weights': dict(config.SCORING_WEIGHTS),
+        'title_keywords': list(config.SCORING_TITLE_KEYWORDS),
+        'preferred_sources': list(config.SCORING_PREFERRED_SOURCES),
+        'max_contact_points': config.SCORING_MAX_CONTACT_POINTS
+    }
+
+    path = config.SCORING_WEIGHTS_FILE
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - set(model)
+        if unknown:
+            raise ValueError(f"Unknown scoring settings in {path}: {', '.join(sorted(unknown))}")
+        model['weights'].update(overrides.pop('weights', {}))
+        model.update(overrides)
+        logger.info(f"Loaded scoring weights from {path}")
+
+    unknown = set(model['weights']) - set(COMPONENT_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown scoring components: {', '.join(sorted(unknown))}")
+    return model
+
+class ScoringModel:
+    """Relevance scoring where every component is a column operation over the whole frame"""
+
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
+        model = get_profile(self.config).scoring
+        self.weights = {name: model['weights'].get(name, 0) for name in COMPONENT_COLUMNS}
+        self.title_keywords = [keyword.lower() for keyword in model['title_keywords']]
+        self.preferred_sources = list(model['preferred_sources'])
+        self.max_contact_points = model['max_contact_points']
+
+    def score(self, df: pd.DataFrame, now: Optional[datetime] = None) -> pd.DataFrame:
+        """Add one weighted column per component plus their total as relevance_score"""
+        now = now or datetime.now()
+        points = {
+            'title': self.title_points(df),
+            'company_size': self.company_size_points(df),
+            'contacts': self.contact_points(df),
+            'source': self.source_points(df),
+            'recency': self.recency_points(df, now)
+        }
+
+        total = np.zeros(len(df), dtype=np.int64 if self._integral_weights() else np.float64)
+        for name, column in COMPONENT_COLUMNS.items():
+            weighted = points[name] * self.weights[name]
+            weighted = weighted.astype(total.dtype)
+            df[column] = weighted
+            total += weighted
+        df['relevance_score'] = total
+        return df
+
+    def score_records(self, records: List[Dict], now: Optional[datetime] = None) -> List[Dict]:
+        """score() for plain dicts, for batches too small to be worth a DataFrame"""
+        now = now or datetime.now()
+        cast = int if self._integral_weights() else float
+        title_cache = {}
+        for record in records:
+            title = record.get('title')
+            title = '' if title is None or title != title else str(title).lower()
+            if title not in title_cache:
+                title_cache[title] = sum(keyword in title for keyword in self.title_keywords)
+            contacts = record.get('hr_contacts')
+            points = {
+                'title': title_cache[title],
+                'company_size': self._company_size_tier(self._employee_count_text(record.get('company_info'))),
+                'contacts': min(len(contacts), self.max_contact_points) if isinstance(contacts, list) else 0,
+                'source': int(record.get('source') in self.preferred_sources),
+                'recency': self._recency_tier(self._record_posted_at(record), now)
+            }
+            total = cast(0)
+            for name, column in COMPONENT_COLUMNS.items():
+                record[column] = cast(points[name] * self.weights[name])
+                total += record[column]
+            record['relevance_score'] = total
+        return records
+
+    def _integral_weights(self) -> bool:
+        """Whether scores can stay integers"""
+        return all(float(weight).is_integer() for weight in self.weights.values())
+
+    def _employee_count_text(self, company_info) -> str:
+        """Employee count of an enrichment record as text ('' when not enriched)"""
+        return str(company_info.get('employee_count', '')) if isinstance(company_info, dict) else ''
+
+    def _record_posted_at(self, record: Dict) -> Optional[datetime]:
+        """posted_at if the record has one, else a YYYY-MM-DD posted_date"""
+        if 'posted_at' in record:
+            return record['posted_at']
+        try:
+            return datetime.strptime(record.get('posted_date') or '', '%Y-%m-%d')
+        except (TypeError, ValueError):
+            return None
+
+    def _recency_tier(self, posted_at: Optional[datetime], now: datetime) -> int:
+        """Points for one posting time"""
+        if posted_at is None:
+            return 0
+        days_ago = (now - posted_at).days
+        for max_days, points in RECENCY_TIERS:
+            if days_ago <= max_days:
+                return points
+        return 0
+
+    def title_points(self, df: pd.DataFrame) -> np.ndarray:
+        """Number of high-value keywords in each title, computed once per distinct title"""
+        if 'title' not in df.columns or not self.title_keywords:
+            return np.zeros(len(df), dtype=np.int64)
+        codes, titles = pd.factorize(df['title'].fillna('').astype(str).str.lower())
+        lowered = pd.Series(titles, dtype=object)
+        counts = np.zeros(len(titles), dtype=np.int64)
+        for keyword in self.title_keywords:
+            counts += lowered.str.contains(keyword, regex=False).to_numpy(dtype=np.int64)
+        return self._take(counts, codes)
+
+    def company_size_points(self, df: pd.DataFrame) -> np.ndarray:
+        """Tiered points for the enriched employee count, computed once per distinct count"""
+        if 'company_info' not in df.columns:
+            return np.zeros(len(df), dtype=np.int64)
+        counts = [self._employee_count_text(info) for info in df['company_info']]
+        codes, uniques = pd.factorize(pd.Series(counts, dtype=object))
+        tiers = np.array([self._company_size_tier(value) for value in uniques], dtype=np.int64)
+        return self._take(tiers, codes)
+
+    def _company_size_tier(self, employee_count: str) -> int:
+        """Points for one employee count, either a label like '500+' or a plain number"""
+        try:
+            count = float(employee_count)
+        except ValueError:
+            count = None
+        if count is not None:
+            for threshold, points in COMPANY_SIZE_THRESHOLDS:
+                if count >= threshold:
+                    return points
+            return 0
+        for points, labels in COMPANY_SIZE_LABELS:
+            if any(label in employee_count for label in labels):
+                return points
+        return 0
+
+    def contact_points(self, df: pd.DataFrame) -> np.ndarray:
+        """Number of HR contacts, capped (jobs never enriched carry NaN)"""
+        if 'hr_contacts' not in df.columns:
+            return np.zeros(len(df), dtype=np.int64)
+        lengths = np.fromiter(
+            (len(contacts) if isinstance(contacts, list) else 0 for contacts in df['hr_contacts']),
+            dtype=np.int64, count=len(df)
+        )
+        return np.minimum(lengths, self.max_contact_points)
+
+    def source_points(self, df: pd.DataFrame) -> np.ndarray:
+        """One point for jobs from a preferred source"""
+        if 'source' not in df.columns:
+            return np.zeros(len(df), dtype=np.int64)
+        return df['source'].isin(self.preferred_sources).to_numpy(dtype=np.int64)
+
+    def recency_points(self, df: pd.DataFrame, now: datetime) -> np.ndarray:
+        """Tiered points by days since posting, against a single reference time"""
+        if 'posted_date' not in df.columns and 'posted_at' not in df.columns:
+            return np.zeros(len(df), dtype=np.int64)
+        if 'posted_at' in df.columns:
+            dates = df['posted_at']
+        else:
+            dates = pd.to_datetime(df['posted_date'], format='%Y-%m-%d', errors='coerce')
+        days_ago = (pd.Timestamp(now) - dates).dt.days.to_numpy(dtype=np.float64)
+        points = np.zeros(len(df), dtype=np.int64)
+        # Tiers are checked oldest-last, so fill from the widest window inwards
+        for max_days, tier_points in reversed(RECENCY_TIERS):
+            points[days_ago <= max_days] = tier_points
+        return points
+
+    def _take(self, values: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Expand per-unique values back to rows"""
+        if len(codes) == 0:
+            return np.zeros(0, dtype=values.dtype)
+        return values[codes]
@@ -0,0 +1,98 @@
+import os
+import re
+import copy
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+from location_matcher import get_location_matcher, configured_locations, split_locations
+from config_loader import get_profile, load_config, read_settings
+from config import Config
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# One board search: (keyword, location)
+SearchQuery = Tuple[str, str]
+
+def profile_config(overrides: Dict, base: Optional[Config] = None) -> Config:
+    """A copy of base (by default load_config()'s) with a preset's settings (LOCATION, JOB_KEYWORDS, ...) set on it"""
+    config = copy.copy(base) if base is not None else load_config()
+    for key, value in overrides.items():
+        setattr(config, key, value)
+    return config
+
+def search_locations(config) -> List[str]:
+    """Locations searched for a config: each city of LOCATIONS (or LOCATION) separately"""
+    return split_locations(configured_locations(config)) or [config.LOCATION]
+
+def search_queries(config) -> List[SearchQuery]:
+    """Every keyword in every searched location"""
+    return [(keyword, location) for keyword in config.JOB_KEYWORDS for location in search_locations(config)]
+
+def _slug(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+class SearchProfile:
+    """A named search (a preset's Config overrides) run over a shared scrape"""
+
+    def __init__(self, name: str, overrides: Optional[Dict] = None):
+        self.name = name
+        self.slug = _slug(name) or 'profile'
+        self.overrides = dict(overrides or {})
+        self.config = profile_config(self.overrides)
+        self.profile = get_profile(self.config)
+        self._keywords = {keyword.lower() for keyword in self.profile.keywords}
+
+    def queries(self) -> List[SearchQuery]:
+        return search_queries(self.config)
+
+    def selects(self, job: Dict) -> bool:
+        """Whether the job was found by one of this profile's keywords, or its title names one"""
+        keyword = job.get('search_keyword')
+        if isinstance(keyword, str) and keyword.lower() in self._keywords:
+            return True
+        title = job.get('title')
+        regex = self.profile.keyword_regex
+        return regex is not None and isinstance(title, str) and regex.search(title) is not None
+
+def unique_queries(profiles: Iterable[SearchProfile]) -> List[SearchQuery]:
+    """Every profile's queries with repeats removed, in first-seen order
+
+    Keywords compare case- and whitespace-insensitively and locations by
+    canonical city, so "Bengaluru" and "Bangalore" are one search.
+    """
+    matcher = get_location_matcher()
+    seen, queries = set(), []
+    for profile in profiles:
+        for keyword, location in profile.queries():
+            key = (' '.join(keyword.lower().split()), matcher.location_id(location) or location.strip().lower())
+            if key not in seen:
+                seen.add(key)
+                queries.append((keyword, location))
+    return queries
+
+def preset_profiles() -> Dict[str, Dict]:
+    """Settings of every bundled preset by name: quick_filter_setup presets, then config_examples not named the same"""
+    import quick_filter_setup
+    import config_examples
+    presets = {name: setup() for name, setup in quick_filter_setup.get_filter_presets().values()}
+    for name, value in vars(config_examples).items():
+        if name.isupper() and isinstance(value, dict):
+            presets.setdefault(name.replace('_', ' ').title(), value)
+    return presets
+
+def load_profiles(names: Iterable[str]) -> List[SearchProfile]:
+    """Profiles by preset name (case-insensitive), or from JSON settings files such as quick_filter_setup's filters_*.json"""
+    presets = {_slug(name): (name, settings) for name, settings in preset_profiles().items()}
+    profiles = []
+    for name in names:
+        if name.endswith('.json') and os.path.exists(name):
+            settings = read_settings(name)
+            stem = os.path.splitext(os.path.basename(name))[0]
+            profiles.append(SearchProfile(stem[len('filters_'):] if stem.startswith('filters_') else stem,
+                                          {**settings.overrides, **settings.extras}))
+        elif _slug(name) in presets:
+            profiles.append(SearchProfile(*presets[_slug(name)]))
+        else:
+            available = ', '.join(preset_name for preset_name, _ in presets.values())
+            raise ValueError(f"Unknown search profile '{name}' (choose a JSON file or one of: {available})")
+    return profiles
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Seeded synthetic job corpus for benchmarks and tests
+"""
+
+import json
+import random
+import hashlib
+import argparse
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+TITLE_ROLES = [
+    "Software Engineer", "Software Developer", "Python Developer", "Java Developer",
+    "Full Stack Developer", "Frontend Developer", "Backend Developer", "Web Developer",
+    "Data Analyst", "Business Analyst", "QA Engineer", "Test Engineer",
+    "DevOps Engineer", "Cloud Engineer", "Data Engineer", "Mobile Developer",
+    "Software Development Engineer", "Associate Software Engineer", "Programmer Analyst"
+]
+
+TITLE_PREFIXES = [
+    "", "", "", "Junior ", "Trainee ", "Graduate ", "Associate ", "Entry Level ",
+    "Senior ", "Lead ", "Principal "
+]
+
+TITLE_SUFFIXES = [
+    "", "", "", " - Fresher", " (Fresher)", " I", " 1", " - 0-1 years", " - Intern",
+    " - Bangalore", " (Remote)", " - 5+ years"
+]
+
+COMPANY_NAMES = [
+    "Infosys", "TCS", "Wipro", "Accenture", "Cognizant", "HCL Technologies", "Tech Mahindra",
+    "Flipkart", "Swiggy", "Zomato", "Razorpay", "Freshworks", "Zoho", "PhonePe", "Paytm",
+    "Myntra", "Ola", "CRED", "Meesho", "Groww", "Zerodha", "BYJU'S", "Unacademy", "Dunzo",
+    "Mindtree", "Mphasis", "L&T Infotech", "Capgemini", "IBM", "Oracle", "SAP Labs",
+    "Amazon", "Google", "Microsoft", "Intuit", "Adobe", "Cisco", "VMware", "Walmart Global Tech",
+    "Thoughtworks", "Nagarro", "Publicis Sapient", "Sigmoid", "Tiger Analytics", "Fractal Analytics"
+]
+
+# Variants the same employer appears under across job boards
+COMPANY_SUFFIXES = ["", "", "", " Ltd", " Limited", " Pvt Ltd", " Private Limited", " Inc", " India", " Technologies"]
+
+LOCATIONS = [
+    "Bangalore", "Bengaluru", "Bangalore, Karnataka", "Bengaluru, Karnataka, India",
+    "Bangalore Urban", "Bengaluru East", "Whitefield, Bangalore", "Electronic City, Bengaluru",
+    "Hybrid - Bangalore", "Remote", "Remote, India", "Mumbai", "Mumbai, Maharashtra",
+    "Delhi", "New Delhi", "Gurgaon", "Gurugram, Haryana", "Noida", "Hyderabad",
+    "Hyderabad, Telangana", "Pune", "Pune, Maharashtra", "Chennai", "Chennai, Tamil Nadu",
+    "Kolkata"
+]
+
+# Bias towards Bangalore, as real searches are location-filtered upstream
+LOCATION_WEIGHTS = [8, 8, 4, 4, 2, 1, 2, 2, 2, 3, 2, 3, 1, 2, 1, 1, 1, 1, 2, 1, 2, 1, 2, 1, 1]
+
+SOURCES = ["LinkedIn", "Indeed", "Glassdoor"]
+
+SKILLS = [
+    "Python", "Java", "SQL", "JavaScript", "React", "Node.js", "Django", "Flask", "Spring Boot",
+    "AWS", "Azure", "Docker", "Kubernetes", "Git", "Linux", "Excel", "Power BI", "Tableau",
+    "Selenium", "REST APIs", "HTML", "CSS", "C++", "Go", "Machine Learning"
+]
+
+EDUCATION = ["B.Tech", "B.E", "B.Sc", "MCA", "M.Tech", "any graduate degree"]
+
+WORK_MODES = ["hybrid", "remote", "work from home", "work from office", "onsite"]
+
+EXPERIENCE_PHRASES = [
+    "freshers welcome", "0-1 years of experience", "0-2 years experience", "entry level role",
+    "1-2 years of experience", "graduate trainee program", "internship with PPO",
+    "3-5 years experience", "5+ years of experience"
+]
+
+JOB_TYPE_PHRASES = ["full-time", "full time permanent", "contract", "part-time", "freelance"]
+
+CONTACT_FIRST_NAMES = ["Priya", "Rahul", "Ananya", "Arjun", "Sneha", "Vikram", "Divya", "Karthik", "Meera", "Rohan"]
+CONTACT_LAST_NAMES = ["Sharma", "Iyer", "Reddy", "Nair", "Gupta", "Rao", "Menon", "Patel", "Singh", "Kulkarni"]
+CONTACT_TITLES = ["HR Manager", "Talent Acquisition Specialist", "Recruiter", "HR Business Partner", "People Operations Lead"]
+
+EMPLOYEE_COUNTS = ["1-10", "10+", "50+", "100+", "100-500", "500+", "500-1000", "1000+", "10000+", 45, 250, 1200, 35000]
+
+class SyntheticJobGenerator:
+    """Generates realistic scraped (and optionally enriched) job records from a seed"""
+
+    def __init__(self, seed: int = 42, now: Optional[datetime] = None, enriched_ratio: float = 0.4):
+        self.seed = seed
+        self.now = now or datetime(2024, 1, 15, 9, 0, 0)
+        self.enriched_ratio = enriched_ratio
+
+    def generate(self, count: int) -> Iterator[Dict]:
+        """Yield jobs one at a time, so million-row corpora never sit in memory twice"""
+        rng = random.Random(self.seed)
+        for index in range(count):
+            yield self._make_job(rng, index)
+
+    def generate_list(self, count: int) -> List[Dict]:
+        """Generate a list of jobs"""
+        return list(self.generate(count))
+
+    def _make_job(self, rng: random.Random, index: int) -> Dict:
+        """Build one job"""
+        source = rng.choice(SOURCES)
+        base_company = rng.choice(COMPANY_NAMES)
+        company = base_company + rng.choice(COMPANY_SUFFIXES)
+        if rng.random() < 0.1:
+            company = company.upper()
+        role = rng.choice(TITLE_ROLES)
+        title = f"{rng.choice(TITLE_PREFIXES)}{role}{rng.choice(TITLE_SUFFIXES)}"
+        location = rng.choices(LOCATIONS, weights=LOCATION_WEIGHTS)[0]
+
+        job = {
+            'title': title,
+            'company': company,
+            'location': location,
+            'salary': self._make_salary(rng),
+            'url': f"https://www.{source.lower()}.com/jobs/view/{self.seed}-{index}",
+            'posted_date': self._make_posted_date(rng, source),
+            'description': self._make_description(rng, role, base_company),
+            'source': source,
+            'experience_level': rng.choice(["fresher", "fresher", "entry-level"]),
+            'search_keyword': role.lower()
+        }
+        if source == "Indeed":
+            job['job_id'] = f"{rng.getrandbits(64):016x}"
+
+        if rng.random() < self.enriched_ratio:
+            job['company_info'] = {
+                'apollo_id': hashlib.md5(base_company.encode()).hexdigest()[:24],
+                'website': f"https://www.{base_company.lower().replace(' ', '').replace(chr(39), '')}.com",
+                'industry': rng.choice(["Information Technology", "Computer Software", "Internet", "Financial Services", "E-Learning"]),
+                'employee_count': rng.choice(EMPLOYEE_COUNTS),
+                'description': f"{base_company} is a technology company."
+            }
+            job['hr_contacts'] = [self._make_contact(rng, base_company) for _ in range(rng.randint(0, 4))]
+
+        return job
+
+    def _make_posted_date(self, rng: random.Random, source: str) -> str:
+        """Posted dates in the formats each source actually uses"""
+        roll = rng.random()
+        days = rng.randint(0, 45)
+        if source == "LinkedIn":
+            # LinkedIn's <time datetime=...> attribute
+            if roll < 0.8:
+                return (self.now - timedelta(days=days)).strftime('%Y-%m-%d')
+            return (self.now - timedelta(days=days, hours=rng.randint(0, 23))).isoformat()
+        if roll < 0.05:
+            return ""
+        if roll < 0.15:
+            return rng.choice(["Just posted", "Today", "Posted today"])
+        if roll < 0.25:
+            return f"{rng.randint(1, 23)} hours ago"
+        if roll < 0.35:
+            return "30+ days ago"
+        if roll < 0.45:
+            return f"{rng.randint(1, 4)} week{'s' if rng.random() < 0.7 else ''} ago"
+        if source == "Indeed":
+            return rng.choice([f"Posted {days} days ago", f"Active {days} days ago", f"{days} days ago"])
+        return f"{max(days, 1)}d"
+
+    def _make_salary(self, rng: random.Random) -> str:
+        """Salary text as Indian job boards render it"""
+        roll = rng.random()
+        if roll < 0.5:
+            return ""
+        low = rng.randint(2, 10)
+        high = low + rng.randint(1, 5)
+        if roll < 0.65:
+            return f"{low}-{high} LPA"
+        if roll < 0.75:
+            return f"₹{low},00,000 - ₹{high},00,000 a year"
+        if roll < 0.85:
+            return f"₹{low * 5},000 - ₹{high * 5},000 a month"
+        if roll < 0.92:
+            return f"{low} to {high} Lakhs per annum"
+        return f"₹{rng.randint(200, 900)} an hour"
+
+    def _make_description(self, rng: random.Random, role: str, company: str) -> str:
+        """Free-text description mentioning skills, education, work mode and experience"""
+        skills = ", ".join(rng.sample(SKILLS, rng.randint(2, 6)))
+        sentences = [
+            f"{company} is hiring a {role} to join our engineering team.",
+            f"We are looking for {rng.choice(EXPERIENCE_PHRASES)} candidates.",
+            f"Required skills: {skills}.",
+            f"Education: {rng.choice(EDUCATION)}.",
+            f"This is a {rng.choice(JOB_TYPE_PHRASES)} position with {rng.choice(WORK_MODES)} work.",
+            "You will design, build and test features, collaborate with product teams, and learn from experienced mentors.",
+        ]
+        if rng.random() < 0.3:
+            sentences.append(f"Compensation: {rng.randint(3, 8)}-{rng.randint(9, 14)} LPA.")
+        rng.shuffle(sentences)
+        return "  ".join(sentences)
+
+    def _make_contact(self, rng: random.Random, company: str) -> Dict:
+        """An Apollo-style HR contact"""
+        first = rng.choice(CONTACT_FIRST_NAMES)
+        last = rng.choice(CONTACT_LAST_NAMES)
+        domain = company.lower().replace(' ', '').replace("'", '')
+        return {
+            'name': f"{first} {last}",
+            'title': rng.choice(CONTACT_TITLES),
+            'email': f"{first.lower()}.{last.lower()}@{domain}.com",
+            'phone': f"+91-9{rng.randint(100000000, 999999999)}",
+            'linkedin_url': f"https://linkedin.com/in/{first.lower()}-{last.lower()}-{rng.randint(1000, 9999)}",
+            'company': company,
+            'contact_type': 'HR Contact'
+        }
+
+def main():
+    """Write a synthetic corpus as JSON lines"""
+    parser = argparse.ArgumentParser(description="Generate a synthetic job corpus")
+    parser.add_argument("count", type=int, help="Number of jobs to generate")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="synthetic_jobs.jsonl")
+    args = parser.parse_args()
+
+    generator = SyntheticJobGenerator(seed=args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for job in generator.generate(args.count):
+            f.write(json.dumps(job, ensure_ascii=False) + "\n")
+
+    print(f"Wrote {args.count} jobs to {args.output}")
+
+if __name__ == "__main__":
+    main()